@@ -0,0 +1,63 @@
+"""Add attendance rollup tables and backfill them
+
+Revision ID: 002_attendance_rollups
+Revises: 001_initial
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '002_attendance_rollups'
+down_revision = '001_initial'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # per-day, per-department counts
+    op.create_table(
+        'attendance_daily_summary',
+        sa.Column('date', sa.Date(), nullable=False),
+        sa.Column('department', sa.String(length=100), nullable=False),
+        sa.Column('present', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('absent', sa.Integer(), server_default='0', nullable=False),
+        sa.PrimaryKeyConstraint('date', 'department'),
+    )
+
+    # per-employee running totals
+    op.create_table(
+        'employee_attendance_totals',
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('total_present', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_absent', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('employee_id'),
+    )
+
+    # backfill from existing attendance
+    op.execute(
+        """
+        INSERT INTO attendance_daily_summary (date, department, present, absent)
+        SELECT a.date, e.department,
+               SUM(CASE WHEN a.status = 'Present' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN a.status = 'Absent' THEN 1 ELSE 0 END)
+        FROM attendance a JOIN employees e ON e.id = a.employee_id
+        GROUP BY a.date, e.department
+        """
+    )
+    op.execute(
+        """
+        INSERT INTO employee_attendance_totals (employee_id, total_present, total_absent)
+        SELECT employee_id,
+               SUM(CASE WHEN status = 'Present' THEN 1 ELSE 0 END),
+               SUM(CASE WHEN status = 'Absent' THEN 1 ELSE 0 END)
+        FROM attendance
+        GROUP BY employee_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('employee_attendance_totals')
+    op.drop_table('attendance_daily_summary')
@@ -0,0 +1,39 @@
+"""Tune indexes to the real query shapes
+
+Adds composite indexes for the hot attendance filters and the newest-first
+employee listing, and drops the redundant single-column indexes on primary keys.
+
+Revision ID: 003_query_indexes
+Revises: 002_attendance_rollups
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+
+revision = '003_query_indexes'
+down_revision = '002_attendance_rollups'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # attendance: date (+status) filters and per-employee status counts
+    op.create_index('ix_attendance_date_status', 'attendance', ['date', 'status'], unique=False)
+    op.create_index(
+        'ix_attendance_employee_status_date', 'attendance', ['employee_id', 'status', 'date'], unique=False
+    )
+
+    # employees: ORDER BY created_at DESC, id DESC (keyset pagination)
+    op.create_index('ix_employees_created_at_id', 'employees', ['created_at', 'id'], unique=False)
+
+    # primary keys are already indexed
+    op.drop_index('ix_attendance_id', table_name='attendance')
+    op.drop_index('ix_employees_id', table_name='employees')
+
+
+def downgrade() -> None:
+    op.create_index('ix_employees_id', 'employees', ['id'], unique=False)
+    op.create_index('ix_attendance_id', 'attendance', ['id'], unique=False)
+    op.drop_index('ix_employees_created_at_id', table_name='employees')
+    op.drop_index('ix_attendance_employee_status_date', table_name='attendance')
+    op.drop_index('ix_attendance_date_status', table_name='attendance')
@@ -0,0 +1,68 @@
+"""Move per-employee attendance totals onto the employees table
+
+Adds employees.total_present / total_absent, backfills them from attendance in
+ranges of employee ids (each range commits on its own, so no single statement
+locks the whole table), then drops employee_attendance_totals.
+
+Revision ID: 004_employee_attendance_totals
+Revises: 003_query_indexes
+Create Date: 2026-10-18
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+revision = '004_employee_attendance_totals'
+down_revision = '003_query_indexes'
+branch_labels = None
+depends_on = None
+
+BACKFILL_CHUNK_SIZE = 5000
+
+BACKFILL = sa.text(
+    """
+    UPDATE employees SET
+        total_present = (SELECT COUNT(*) FROM attendance a
+                         WHERE a.employee_id = employees.id AND a.status = 'Present'),
+        total_absent = (SELECT COUNT(*) FROM attendance a
+                        WHERE a.employee_id = employees.id AND a.status = 'Absent')
+    WHERE employees.id BETWEEN :lo AND :hi
+    """
+)
+
+
+def upgrade() -> None:
+    with op.batch_alter_table('employees') as batch:
+        batch.add_column(sa.Column('total_present', sa.Integer(), server_default='0', nullable=False))
+        batch.add_column(sa.Column('total_absent', sa.Integer(), server_default='0', nullable=False))
+
+    # backfill in id ranges; the counts use ix_attendance_employee_status_date
+    bind = op.get_bind()
+    max_id = bind.execute(sa.text("SELECT MAX(id) FROM employees")).scalar() or 0
+    with op.get_context().autocommit_block():
+        for lo in range(1, max_id + 1, BACKFILL_CHUNK_SIZE):
+            bind.execute(BACKFILL, {"lo": lo, "hi": lo + BACKFILL_CHUNK_SIZE - 1})
+
+    op.drop_table('employee_attendance_totals')
+
+
+def downgrade() -> None:
+    op.create_table(
+        'employee_attendance_totals',
+        sa.Column('employee_id', sa.Integer(), nullable=False),
+        sa.Column('total_present', sa.Integer(), server_default='0', nullable=False),
+        sa.Column('total_absent', sa.Integer(), server_default='0', nullable=False),
+        sa.ForeignKeyConstraint(['employee_id'], ['employees.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('employee_id'),
+    )
+    op.execute(
+        """
+        INSERT INTO employee_attendance_totals (employee_id, total_present, total_absent)
+        SELECT id, total_present, total_absent
+        FROM employees
+        WHERE total_present > 0 OR total_absent > 0
+        """
+    )
+    with op.batch_alter_table('employees') as batch:
+        batch.drop_column('total_absent')
+        batch.drop_column('total_present')
@@ -1,15 +1,50 @@
 """
 CRUD operations: reusable database interaction functions.
-All functions receive a SQLAlchemy Session and return ORM objects or raise HTTPExceptions.
+All functions receive a SQLAlchemy Session and return ORM objects (or lightweight
+column-projected rows on read-heavy paths) or raise HTTPExceptions.
 """
 import datetime as dt
-from typing import Optional
+from collections import defaultdict
+from typing import Iterable, Iterator, NamedTuple, Optional
 
+from sqlalchemy.engine import Row
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_
+from sqlalchemy import func, and_, or_, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from pydantic import ValidationError
 from fastapi import HTTPException, status
 
-from app import models, schemas
+from app import models, rollups, schemas
+from app.database import off_loop
+from app.utils.cache import employee_cache, response_cache
+from app.utils.events import dashboard_events
+from app.utils.replicas import note_write
+from app.utils.versions import data_versions
+
+
+# ═══════════════════════════ Query helpers ═══════════════════════════════ #
+
+IN_CHUNK_SIZE = 1000  # Max bound values per IN (...) clause; keeps SQLite under its variable limit
+
+
+def _chunked(values: list, size: int = IN_CHUNK_SIZE) -> Iterator[list]:
+    """Yield successive `size`-sized slices of values."""
+    for start in range(0, len(values), size):
+        yield values[start:start + size]
+
+
+def _data_changed(tables: tuple[str, ...], cache_namespaces: tuple[str, ...]) -> None:
+    """Post-commit bookkeeping for write paths: bump table versions (ETags) and drop stale cached responses."""
+    data_versions.bump(*tables)
+    response_cache.invalidate(*cache_namespaces)
+    note_write()
+
+
+def _keyset_before(sort_column, id_column, after: tuple):
+    """Predicate selecting rows strictly after `after` in (sort_column DESC, id DESC) order."""
+    sort_value, row_id = after
+    return or_(sort_column < sort_value, and_(sort_column == sort_value, id_column < row_id))
 
 
 # ═══════════════════════════ Employee CRUD ═══════════════════════════════ #
@@ -29,9 +64,91 @@ def get_employee_by_email(db: Session, email: str) -> Optional[models.Employee]:
     return db.query(models.Employee).filter(models.Employee.email == email).first()
 
 
-def get_all_employees(db: Session) -> list[models.Employee]:
-    """Return all employees ordered by creation date descending."""
-    return db.query(models.Employee).order_by(models.Employee.created_at.desc()).all()
+class EmployeeRef(NamedTuple):
+    """The employee columns attendance paths need; the value type of employee_cache."""
+    id: int
+    employee_id: str
+    full_name: str
+    department: str
+
+
+EMPLOYEE_REF_COLUMNS = (
+    models.Employee.id,
+    models.Employee.employee_id,
+    models.Employee.full_name,
+    models.Employee.department,
+)
+
+
+def resolve_employee(db: Session, employee_id: str) -> Optional[EmployeeRef]:
+    """Resolve one string employee_id through employee_cache; None if no such employee."""
+    return resolve_employees(db, [employee_id]).get(employee_id)
+
+
+def resolve_employees(db: Session, employee_ids: Iterable[str]) -> dict[str, EmployeeRef]:
+    """
+    Resolve many string employee_ids through employee_cache.
+    Misses are fetched with chunked IN queries and cached; unknown IDs are
+    left out of the returned {employee_id: EmployeeRef} mapping.
+    """
+    found, missing = {}, []
+    for employee_id in dict.fromkeys(employee_ids):
+        ref = employee_cache.get("employee", {"employee_id": employee_id})
+        if ref is None:
+            missing.append(employee_id)
+        else:
+            found[employee_id] = ref
+    if not missing:
+        return found
+
+    generation = employee_cache.generation("employee")
+    for chunk in _chunked(missing):
+        for row in db.query(*EMPLOYEE_REF_COLUMNS).filter(models.Employee.employee_id.in_(chunk)).all():
+            ref = EmployeeRef(*row)
+            found[ref.employee_id] = ref
+            employee_cache.set("employee", {"employee_id": ref.employee_id}, ref, generation)
+    return found
+
+
+def warm_employee_cache(db: Session) -> int:
+    """Load the newest employees into employee_cache, up to its capacity; returns how many."""
+    if not employee_cache.enabled:
+        return 0
+    generation = employee_cache.generation("employee")
+    rows = (
+        db.query(*EMPLOYEE_REF_COLUMNS)
+        .order_by(models.Employee.created_at.desc(), models.Employee.id.desc())
+        .limit(employee_cache.max_entries)
+        .all()
+    )
+    # Oldest first, so the newest employees end up most recently used
+    for row in reversed(rows):
+        employee_cache.set("employee", {"employee_id": row.employee_id}, EmployeeRef(*row), generation)
+    return len(rows)
+
+
+def get_all_employees(
+    db: Session,
+    limit: Optional[int] = None,
+    after: Optional[tuple[dt.datetime, int]] = None,
+) -> list[models.Employee]:
+    """
+    Return employees ordered by creation date descending (newest first).
+    Pass `limit` and the (created_at, id) keyset of the previous page's last row
+    as `after` to fetch one page at a time.
+    """
+    query = db.query(models.Employee)
+    if after:
+        query = query.filter(_keyset_before(models.Employee.created_at, models.Employee.id, after))
+    query = query.order_by(models.Employee.created_at.desc(), models.Employee.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
+
+def count_employees(db: Session) -> int:
+    """Count all employees."""
+    return db.query(func.count(models.Employee.id)).scalar() or 0
 
 
 def create_employee(db: Session, payload: schemas.EmployeeCreate) -> models.Employee:
@@ -60,7 +177,20 @@ def create_employee(db: Session, payload: schemas.EmployeeCreate) -> models.Empl
         department=payload.department,
     )
     db.add(employee)
-    db.commit()
+    with dashboard_events.writing():
+        db.commit()
+        _data_changed(("employees",), ("employees", "dashboard"))
+        employee_cache.discard("employee", {"employee_id": payload.employee_id})
+        dashboard_events.publish(
+            "employee_created",
+            {
+                "employee_id": payload.employee_id,
+                "full_name": payload.full_name,
+                "department": payload.department,
+                "total_present": 0,
+                "total_absent": 0,
+            },
+        )
     db.refresh(employee)
     return employee
 
@@ -69,7 +199,7 @@ def delete_employee(db: Session, employee_id: str) -> models.Employee:
     """
     Delete an employee by their string employee_id.
     Raises 404 if not found.
-    Cascade delete will remove related attendance records automatically.
+    The employee's attendance records are deleted in the same transaction.
     """
     employee = get_employee_by_employee_id(db, employee_id)
     if not employee:
@@ -77,155 +207,797 @@ def delete_employee(db: Session, employee_id: str) -> models.Employee:
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found.",
         )
+    removed = rollups.remove_employee(db, employee)
+    # Set-based cascade; the ON DELETE CASCADE FK is not enforced everywhere (SQLite)
+    db.query(models.Attendance).filter(models.Attendance.employee_id == employee.id).delete(
+        synchronize_session=False
+    )
     db.delete(employee)
-    db.commit()
+    with dashboard_events.writing():
+        db.commit()
+        _data_changed(("employees", "attendance", "attendance_history"), ("employees", "dashboard"))
+        employee_cache.discard("employee", {"employee_id": employee_id})
+        present_today, absent_today = removed.get(dt.date.today(), (0, 0))
+        dashboard_events.publish(
+            "employee_deleted",
+            {"employee_id": employee_id, "today": {"present": -present_today, "absent": -absent_today}},
+        )
     return employee
 
 
+def build_employee_responses(db: Session, employees: list[models.Employee]) -> list[schemas.EmployeeResponse]:
+    """
+    Convert Employee ORM objects into EmployeeResponse schemas.
+    Present days come from the denormalized employees.total_present column, so
+    this issues no queries. The values were validated on the way into the
+    database, so the schemas are constructed without re-validation, off the
+    event loop.
+    """
+    return off_loop(_employee_responses, employees)
+
+
+def _employee_responses(employees: list[models.Employee]) -> list[schemas.EmployeeResponse]:
+    return [
+        schemas.EmployeeResponse.model_construct(
+            id=emp.id,
+            employee_id=emp.employee_id,
+            full_name=emp.full_name,
+            email=emp.email,
+            department=emp.department,
+            created_at=emp.created_at,
+            total_present_days=emp.total_present,
+        )
+        for emp in employees
+    ]
+
+
+IMPORT_BATCH_SIZE = 1000
+
+
+def import_employees(db: Session, rows: Iterable[dict]) -> schemas.EmployeeImportResponse:
+    """
+    Validate and insert many employees in one transaction.
+    Rows are checked against schemas.EmployeeCreate, against earlier rows in the
+    same file (set lookups) and against the database (chunked IN queries), then
+    inserted in batched executemany calls. Invalid rows are reported, not fatal.
+    Reading and validating each batch is CPU-bound and runs off the event loop.
+    Raises 409 if a concurrent writer inserts a clashing employee before commit.
+    """
+    errors: list[schemas.EmployeeImportError] = []
+    seen_ids: set[str] = set()
+    seen_emails: set[str] = set()
+    numbered = enumerate(rows, start=1)
+    total_rows = imported = 0
+
+    # The clash checks read before writing, so a concurrent import or create can
+    # still trip a unique index on any batch INSERT or on the commit
+    try:
+        while True:
+            batch, last_row = off_loop(_validate_import_batch, numbered, seen_ids, seen_emails, errors)
+            total_rows = last_row or total_rows
+            if batch:
+                imported += _insert_import_batch(db, batch, errors)
+            if len(batch) < IMPORT_BATCH_SIZE:
+                break
+        with dashboard_events.writing():
+            db.commit()
+            if imported:
+                _data_changed(("employees",), ("employees", "dashboard"))
+                dashboard_events.resync()  # Could be thousands of rows: streams reload the snapshot
+    except IntegrityError:
+        db.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Employees were created concurrently with clashing IDs or emails. Please retry the import.",
+        )
+
+    errors.sort(key=lambda err: err.row)
+    return schemas.EmployeeImportResponse.model_construct(
+        total_rows=total_rows, imported=imported, failed=len(errors), errors=errors
+    )
+
+
+def _validate_import_batch(
+    numbered: Iterator[tuple[int, object]],
+    seen_ids: set[str],
+    seen_emails: set[str],
+    errors: list[schemas.EmployeeImportError],
+) -> tuple[list[tuple[int, schemas.EmployeeCreate]], int]:
+    """
+    Read (row_number, raw) pairs until IMPORT_BATCH_SIZE rows are accepted or
+    the file ends. Invalid rows and repeats of earlier rows go to `errors`.
+    Returns (accepted rows, number of the last row read or 0 if none was).
+    """
+    batch: list[tuple[int, schemas.EmployeeCreate]] = []
+    row_number = 0
+    for row_number, raw in numbered:
+        raw_id = raw.get("employee_id") if isinstance(raw, dict) else None
+        try:
+            payload = schemas.EmployeeCreate.model_validate(raw)
+        except ValidationError as exc:
+            detail = "; ".join(
+                f"{'.'.join(str(part) for part in err['loc']) or 'row'}: {err['msg']}" for err in exc.errors()
+            )
+            errors.append(schemas.EmployeeImportError(row=row_number, employee_id=raw_id, detail=detail))
+            continue
+
+        if payload.employee_id in seen_ids:
+            detail = f"Duplicate employee ID '{payload.employee_id}' earlier in the file."
+        elif payload.email in seen_emails:
+            detail = f"Duplicate email '{payload.email}' earlier in the file."
+        else:
+            seen_ids.add(payload.employee_id)
+            seen_emails.add(payload.email)
+            batch.append((row_number, payload))
+            if len(batch) >= IMPORT_BATCH_SIZE:
+                break
+            continue
+        errors.append(schemas.EmployeeImportError(row=row_number, employee_id=payload.employee_id, detail=detail))
+    return batch, row_number
+
+
+def _insert_import_batch(
+    db: Session,
+    batch: list[tuple[int, schemas.EmployeeCreate]],
+    errors: list[schemas.EmployeeImportError],
+) -> int:
+    """Drop rows clashing with existing employees, insert the rest; returns rows inserted."""
+    existing_ids = _existing_values(db, models.Employee.employee_id, [p.employee_id for _, p in batch])
+    existing_emails = _existing_values(db, models.Employee.email, [p.email for _, p in batch])
+
+    new_rows = []
+    for row_number, payload in batch:
+        if payload.employee_id in existing_ids:
+            detail = f"Employee with ID '{payload.employee_id}' already exists."
+        elif payload.email in existing_emails:
+            detail = f"Employee with email '{payload.email}' already exists."
+        else:
+            new_rows.append(payload.model_dump())
+            continue
+        errors.append(schemas.EmployeeImportError(row=row_number, employee_id=payload.employee_id, detail=detail))
+
+    if new_rows:
+        db.execute(insert(models.Employee), new_rows)
+    return len(new_rows)
+
+
+def _existing_values(db: Session, column, values: list[str]) -> set[str]:
+    """Return which of `values` already exist in `column`, using chunked IN queries."""
+    found = set()
+    for chunk in _chunked(values):
+        found.update(value for (value,) in db.query(column).filter(column.in_(chunk)).all())
+    return found
+
+
 # ═══════════════════════════ Attendance CRUD ═════════════════════════════ #
 
+# Exactly the columns schemas.AttendanceResponse needs, labelled to match its fields.
+ATTENDANCE_COLUMNS = (
+    models.Attendance.id,
+    models.Attendance.employee_id,
+    models.Employee.employee_id.label("employee_string_id"),
+    models.Employee.full_name.label("employee_name"),
+    models.Attendance.date,
+    models.Attendance.status,
+)
+
+
+def _attendance_rows(db: Session):
+    """Base query projecting ATTENDANCE_COLUMNS with a single join to employees."""
+    return db.query(*ATTENDANCE_COLUMNS).join(
+        models.Employee, models.Attendance.employee_id == models.Employee.id
+    )
+
+
 def get_attendance_by_employee(
-    db: Session, employee_pk: int, date_filter: Optional[dt.date] = None
-) -> list[models.Attendance]:
-    """Fetch all attendance records for an employee, optionally filtered by date."""
-    query = db.query(models.Attendance).filter(models.Attendance.employee_id == employee_pk)
+    db: Session,
+    employee_pk: int,
+    date_filter: Optional[dt.date] = None,
+    limit: Optional[int] = None,
+    after: Optional[tuple[dt.date, int]] = None,
+) -> list[Row]:
+    """Fetch attendance rows for an employee, optionally filtered by date, newest first."""
+    query = _attendance_rows(db).filter(models.Attendance.employee_id == employee_pk)
     if date_filter:
         query = query.filter(models.Attendance.date == date_filter)
-    return query.order_by(models.Attendance.date.desc()).all()
+    return _attendance_page(query, limit, after)
+
+
+def get_attendance_by_date(
+    db: Session,
+    filter_date: dt.date,
+    limit: Optional[int] = None,
+    after: Optional[tuple[dt.date, int]] = None,
+) -> list[Row]:
+    """Fetch attendance rows for a given date."""
+    query = _attendance_rows(db).filter(models.Attendance.date == filter_date)
+    return _attendance_page(query, limit, after)
+
+
+def get_all_attendance(
+    db: Session,
+    limit: Optional[int] = None,
+    after: Optional[tuple[dt.date, int]] = None,
+) -> list[Row]:
+    """Fetch attendance rows, newest date first."""
+    return _attendance_page(_attendance_rows(db), limit, after)
+
+
+def stream_attendance(
+    db: Session,
+    date_from: Optional[dt.date] = None,
+    date_to: Optional[dt.date] = None,
+    department: Optional[str] = None,
+    batch_size: int = 1000,
+) -> Iterator[Row]:
+    """
+    Iterate attendance rows (oldest first) from a server-side cursor.
+    Rows are fetched `batch_size` at a time, so memory stays flat regardless of table size.
+    """
+    query = _attendance_rows(db)
+    if date_from:
+        query = query.filter(models.Attendance.date >= date_from)
+    if date_to:
+        query = query.filter(models.Attendance.date <= date_to)
+    if department:
+        query = query.filter(models.Employee.department == department)
+    query = query.order_by(models.Attendance.date, models.Attendance.id)
+    yield from query.execution_options(yield_per=batch_size)
+
+
+def count_attendance(db: Session, filter_date: Optional[dt.date] = None, employee_pk: Optional[int] = None) -> int:
+    """
+    Count attendance records, optionally restricted to a date and/or an employee.
+    Read from the rollups (employees.total_present/total_absent, or
+    attendance_daily_summary), so the cost does not grow with the attendance
+    table. Only an employee on one date, at most one row through
+    uq_employee_date, is counted on attendance itself.
+    """
+    if employee_pk is not None and filter_date:
+        return (
+            db.query(func.count(models.Attendance.id))
+            .filter(models.Attendance.employee_id == employee_pk, models.Attendance.date == filter_date)
+            .scalar()
+            or 0
+        )
+    if employee_pk is not None:
+        return (
+            db.query(models.Employee.total_present + models.Employee.total_absent)
+            .filter(models.Employee.id == employee_pk)
+            .scalar()
+            or 0
+        )
+    summary_table = models.AttendanceDailySummary
+    query = db.query(func.sum(summary_table.present + summary_table.absent))
+    if filter_date:
+        query = query.filter(summary_table.date == filter_date)
+    return int(query.scalar() or 0)  # SUM() is DECIMAL on MySQL
+
+
+def _attendance_page(query, limit: Optional[int], after: Optional[tuple[dt.date, int]]) -> list[Row]:
+    """Apply (date, id) keyset ordering and an optional page window to an attendance query."""
+    if after:
+        query = query.filter(_keyset_before(models.Attendance.date, models.Attendance.id, after))
+    query = query.order_by(models.Attendance.date.desc(), models.Attendance.id.desc())
+    if limit is not None:
+        query = query.limit(limit)
+    return query.all()
+
 
+ATTENDANCE_MODES = ("insert", "upsert", "skip")
 
-def get_attendance_by_date(db: Session, filter_date: dt.date) -> list[models.Attendance]:
-    """Fetch all attendance records for a given date."""
+
+def _insert_attendance(db: Session, row: dict, ignore_conflict: bool) -> Optional[int]:
+    """
+    INSERT one attendance row as a single statement and return its id.
+    With ignore_conflict an existing (employee, date) row is left untouched and
+    None is returned; otherwise uq_employee_date raises IntegrityError.
+    """
+    table = models.Attendance.__table__
+    dialect = db.get_bind().dialect
+    if not ignore_conflict:
+        stmt = insert(table)
+    elif dialect.name in ("sqlite", "postgresql"):
+        stmt = (sqlite.insert if dialect.name == "sqlite" else postgresql.insert)(table)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["employee_id", "date"])
+    elif dialect.name == "mysql":
+        # ON DUPLICATE KEY UPDATE cannot tell "inserted" from "unchanged" under
+        # CLIENT_FOUND_ROWS; an ignored row reports rowcount 0
+        stmt = insert(table).prefix_with("IGNORE")
+    else:
+        # Portable fallback: a savepoint turns the unique violation into a skip
+        try:
+            with db.begin_nested():
+                return db.execute(insert(table).values(row)).inserted_primary_key[0]
+        except IntegrityError:
+            return None
+
+    stmt = stmt.values(row)
+    if dialect.insert_returning:
+        return db.execute(stmt.returning(table.c.id)).scalar_one_or_none()
+    result = db.execute(stmt)
+    return result.inserted_primary_key[0] if result.rowcount else None
+
+
+def _attendance_on(db: Session, employee_pk: int, attendance_date: dt.date) -> Optional[Row]:
+    """(id, status) of an employee's record on a date, if any."""
     return (
-        db.query(models.Attendance)
-        .filter(models.Attendance.date == filter_date)
-        .order_by(models.Attendance.date.desc())
-        .all()
+        db.query(models.Attendance.id, models.Attendance.status)
+        .filter(models.Attendance.employee_id == employee_pk, models.Attendance.date == attendance_date)
+        .first()
     )
 
 
-def get_all_attendance(db: Session) -> list[models.Attendance]:
-    """Fetch all attendance records."""
-    return db.query(models.Attendance).order_by(models.Attendance.date.desc()).all()
+def _employee_gone(employee_id: str) -> HTTPException:
+    """The employee was deleted after it was resolved (possibly from employee_cache by another worker)."""
+    employee_cache.discard("employee", {"employee_id": employee_id})
+    return HTTPException(
+        status_code=status.HTTP_404_NOT_FOUND,
+        detail=f"Employee with ID '{employee_id}' not found.",
+    )
+
 
+AttendanceChange = tuple[str, dt.date, str, int]  # (employee_id, date, status, +1 added / -1 removed)
 
-def mark_attendance(db: Session, payload: schemas.AttendanceCreate) -> models.Attendance:
+
+def _mark_one(
+    db: Session, employee: EmployeeRef, payload: schemas.AttendanceCreate, mode: str
+) -> tuple[schemas.AttendanceResponse, bool, list[AttendanceChange]]:
+    """
+    Apply one attendance mark inside the caller's transaction, without committing.
+    A conflicting row never raises: the INSERT skips it and `mode` decides what
+    follows. A 404/409 HTTPException is raised before anything was written, so
+    the transaction stays usable for further marks (see mark_attendance_batch).
+    Returns (record, created, changes for _attendance_marked).
     """
-    Mark attendance for an employee.
+    row = {"employee_id": employee.id, "date": payload.attendance_date, "status": payload.status}
+    record_id = _insert_attendance(db, row, ignore_conflict=True)
+    if record_id is not None:
+        rollups.apply_attendance(db, [(employee.id, employee.department, payload.attendance_date, payload.status)])
+        changes = [(employee.employee_id, payload.attendance_date, payload.status, 1)]
+        record_status, created = payload.status, True
+    else:
+        previous_status = None
+        if mode == "upsert":
+            # Status is two-valued, so a row this UPDATE changes held the other one
+            changed = (
+                db.query(models.Attendance)
+                .filter(
+                    models.Attendance.employee_id == employee.id,
+                    models.Attendance.date == payload.attendance_date,
+                    models.Attendance.status != payload.status,
+                )
+                .update({"status": payload.status}, synchronize_session=False)
+            )
+            if changed:
+                previous_status = "Absent" if payload.status == "Present" else "Present"
+        existing = _attendance_on(db, employee.id, payload.attendance_date)
+        if existing is None:
+            raise _employee_gone(payload.employee_id)
+        if mode == "insert":
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Attendance for employee '{payload.employee_id}' on {payload.attendance_date} already marked as '{existing.status}'.",
+            )
+        record_id, record_status = existing
+        created, changes = False, []
+        if previous_status:
+            rollups.apply_attendance(db, [(employee.id, employee.department, payload.attendance_date, record_status)])
+            rollups.apply_attendance(
+                db, [(employee.id, employee.department, payload.attendance_date, previous_status)], sign=-1
+            )
+            changes = [
+                (employee.employee_id, payload.attendance_date, record_status, 1),
+                (employee.employee_id, payload.attendance_date, previous_status, -1),
+            ]
+
+    response = schemas.AttendanceResponse(
+        id=record_id,
+        employee_id=employee.id,
+        employee_string_id=employee.employee_id,
+        employee_name=employee.full_name,
+        date=payload.attendance_date,
+        status=record_status,
+    )
+    return response, created, changes
+
+
+def mark_attendance(
+    db: Session, payload: schemas.AttendanceCreate, mode: str = "insert"
+) -> tuple[schemas.AttendanceResponse, bool]:
+    """
+    Mark attendance for an employee with a single INSERT and no pre-read.
+    `mode` decides what happens when the employee already has a record for the date:
+    - insert: raise 409
+    - skip:   keep the existing record and return it
+    - upsert: overwrite its status and return it
+    Returns (record, created). Concurrent submissions for the same key resolve
+    through uq_employee_date, so exactly one of them creates the record.
     Raises 404 if employee not found.
-    Raises 409 if attendance already marked for that date.
     """
     # Resolve employee by string employee_id
-    employee = get_employee_by_employee_id(db, payload.employee_id)
+    employee = resolve_employee(db, payload.employee_id)
     if not employee:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{payload.employee_id}' not found.",
         )
 
-    # Check for duplicate attendance
-    existing = (
-        db.query(models.Attendance)
-        .filter(
-            and_(
-                models.Attendance.employee_id == employee.id,
-                models.Attendance.date == payload.attendance_date,
+    try:
+        response, created, changes = _mark_one(db, employee, payload, mode)
+    except HTTPException:
+        db.rollback()
+        raise
+    except IntegrityError:  # Foreign key: the employee was deleted after it was resolved
+        db.rollback()
+        raise _employee_gone(payload.employee_id)
+    with dashboard_events.writing():
+        db.commit()
+        if changes:
+            _attendance_marked(changes)
+    return response, created
+
+
+def mark_attendance_batch(
+    db: Session, items: list[tuple[schemas.AttendanceCreate, str]]
+) -> list[object]:
+    """
+    Group commit for mark_attendance: apply many (payload, mode) marks in one
+    transaction with one commit. Returns one outcome per item, in order: the
+    (record, created) mark_attendance would return, or the HTTPException it
+    would raise, had the items run one after another. Employees are resolved
+    with one batched lookup.
+    If the transaction fails on a constraint (an employee deleted mid-batch),
+    it is rolled back and every item is retried through mark_attendance alone.
+    """
+    refs = resolve_employees(db, (payload.employee_id for payload, _ in items))
+    outcomes: list[object] = []
+    changes: list[AttendanceChange] = []
+    try:
+        for payload, mode in items:
+            employee = refs.get(payload.employee_id)
+            if employee is None:
+                outcomes.append(
+                    HTTPException(
+                        status_code=status.HTTP_404_NOT_FOUND,
+                        detail=f"Employee with ID '{payload.employee_id}' not found.",
+                    )
+                )
+                continue
+            try:
+                response, created, item_changes = _mark_one(db, employee, payload, mode)
+            except HTTPException as exc:
+                outcomes.append(exc)
+                continue
+            outcomes.append((response, created))
+            changes.extend(item_changes)
+        with dashboard_events.writing():
+            db.commit()
+            if changes:
+                _attendance_marked(changes)
+    except IntegrityError:
+        db.rollback()
+        return [_outcome_of(mark_attendance, db, payload, mode) for payload, mode in items]
+    return outcomes
+
+
+def _outcome_of(fn, *args) -> object:
+    """fn(*args), or the HTTPException it raised."""
+    try:
+        return fn(*args)
+    except HTTPException as exc:
+        return exc
+
+
+def bulk_mark_attendance(
+    db: Session, items: list[schemas.AttendanceCreate]
+) -> schemas.AttendanceBulkResponse:
+    """
+    Mark attendance for many employees using set-based checks:
+    one batch resolve of every employee_id (through employee_cache), a lookup of
+    exactly the requested (employee, date) pairs that are already marked (a row
+    value IN per chunk), then a single multi-row INSERT plus the rollup upserts
+    in one transaction.
+    Raises 404 if an employee was deleted after it was resolved (see
+    _bulk_conflict) and 409 if a concurrent writer trips uq_employee_date before commit.
+    """
+    refs = resolve_employees(db, (item.employee_id for item in items))
+    pk_by_employee_id = {employee_id: ref.id for employee_id, ref in refs.items()}
+    department_by_pk = {ref.id: ref.department for ref in refs.values()}
+    employee_id_by_pk = {ref.id: employee_id for employee_id, ref in refs.items()}
+
+    # Probe exactly the requested (employee, date) pairs; each pair binds two values
+    wanted = list({
+        (pk_by_employee_id[item.employee_id], item.attendance_date)
+        for item in items
+        if item.employee_id in pk_by_employee_id
+    })
+    taken = set()
+    for chunk in _chunked(wanted, IN_CHUNK_SIZE // 2):
+        taken.update(
+            db.query(models.Attendance.employee_id, models.Attendance.date)
+            .filter(tuple_(models.Attendance.employee_id, models.Attendance.date).in_(chunk))
+            .all()
+        )
+
+    results, new_rows = off_loop(_classify_bulk_items, items, pk_by_employee_id, taken)
+
+    if new_rows:
+        try:
+            db.execute(insert(models.Attendance), new_rows)
+            rollups.apply_attendance(
+                db,
+                ((r["employee_id"], department_by_pk[r["employee_id"]], r["date"], r["status"]) for r in new_rows),
             )
+            with dashboard_events.writing():
+                db.commit()
+                _attendance_marked(
+                    (employee_id_by_pk[r["employee_id"]], r["date"], r["status"], 1) for r in new_rows
+                )
+        except IntegrityError:
+            db.rollback()
+            raise _bulk_conflict(db, refs)
+
+    return schemas.AttendanceBulkResponse.model_construct(
+        created=len(new_rows),
+        duplicates=sum(r.result == "duplicate" for r in results),
+        unknown_employees=sum(r.result == "unknown_employee" for r in results),
+        results=results,
+    )
+
+
+def _bulk_conflict(db: Session, refs: dict[str, EmployeeRef]) -> HTTPException:
+    """
+    What a failed bulk INSERT means. A foreign key failure comes from refs that
+    employee_cache still held for employees another worker deleted: drop them
+    all from the cache, re-resolve, and report the missing ones as 404. Only
+    when every employee still exists did a concurrent mark take a row (409).
+    """
+    for employee_id in refs:
+        employee_cache.discard("employee", {"employee_id": employee_id})
+    current = resolve_employees(db, refs)
+    gone = sorted(employee_id for employee_id in refs if employee_id not in current)
+    if gone:
+        return HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Employees not found: {', '.join(gone)}. Please retry without them.",
         )
-        .first()
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail="Attendance was marked concurrently for one or more of these employees. Please retry.",
     )
-    if existing:
-        raise HTTPException(
-            status_code=status.HTTP_409_CONFLICT,
-            detail=f"Attendance for employee '{payload.employee_id}' on {payload.attendance_date} already marked as '{existing.status}'.",
+
+
+def _classify_bulk_items(
+    items: list[schemas.AttendanceCreate], pk_by_employee_id: dict[str, int], taken: set
+) -> tuple[list[schemas.AttendanceBulkItemResult], list[dict]]:
+    """
+    Per-item outcome of a bulk mark, plus the rows to insert.
+    `taken` holds the (employee_pk, date) pairs already marked and grows as rows
+    are accepted, so repeats within the same request count as duplicates.
+    """
+    results, new_rows = [], []
+    for index, item in enumerate(items):
+        employee_pk = pk_by_employee_id.get(item.employee_id)
+        key = (employee_pk, item.attendance_date)
+        if employee_pk is None:
+            outcome = "unknown_employee"
+        elif key in taken:
+            outcome = "duplicate"
+        else:
+            outcome = "created"
+            taken.add(key)
+            new_rows.append({"employee_id": employee_pk, "date": item.attendance_date, "status": item.status})
+        results.append(
+            schemas.AttendanceBulkItemResult.model_construct(
+                index=index, employee_id=item.employee_id, date=item.attendance_date, result=outcome
+            )
         )
+    return results, new_rows
 
-    record = models.Attendance(
-        employee_id=employee.id,
-        date=payload.attendance_date,
-        status=payload.status,
-    )
-    db.add(record)
-    db.commit()
-    db.refresh(record)
-    return record
 
+STREAM_DELTA_MAX_EMPLOYEES = 500  # Larger attendance changes make dashboard streams resync instead
 
-def get_present_days_count(db: Session, employee_pk: int) -> int:
-    """Count total 'Present' days for an employee."""
-    return (
-        db.query(func.count(models.Attendance.id))
-        .filter(
-            and_(
-                models.Attendance.employee_id == employee_pk,
-                models.Attendance.status == "Present",
+
+def _attendance_marked(changes: Iterable[AttendanceChange]) -> None:
+    """
+    Post-commit bookkeeping for attendance changes, given as
+    (employee_id, date, status, +1 added / -1 removed).
+    Employee lists only show Present counts, and attendance_history only moves
+    when a past date changes, which is what keys the closed-range stats memo.
+    Dashboard streams get one delta event for the whole change, or a resync when
+    it touches more than STREAM_DELTA_MAX_EMPLOYEES employees.
+    """
+    changes = list(changes)
+    today = dt.date.today()
+    tables = ("attendance", "attendance_history") if any(d < today for _, d, _, _ in changes) else ("attendance",)
+    if any(s == "Present" for _, _, s, _ in changes):
+        _data_changed(tables, ("dashboard", "employees"))
+    else:
+        _data_changed(tables, ("dashboard",))
+
+    if not dashboard_events.subscribers:
+        return
+    today_delta = {"present": 0, "absent": 0}
+    employees: dict[str, dict[str, int]] = defaultdict(lambda: {"present": 0, "absent": 0})
+    for employee_id, date, record_status, sign in changes:
+        key = "present" if record_status == "Present" else "absent"
+        employees[employee_id][key] += sign
+        if date == today:
+            today_delta[key] += sign
+    if len(employees) > STREAM_DELTA_MAX_EMPLOYEES:
+        dashboard_events.resync()
+    else:
+        dashboard_events.publish("attendance", {"today": today_delta, "employees": employees})
+
+
+# ═══════════════════════════ Attendance Stats ════════════════════════════ #
+
+def _attendance_rate(present: int, absent: int) -> Optional[float]:
+    """present / (present + absent) rounded to 4 places, or None when there are no records."""
+    total = present + absent
+    return round(present / total, 4) if total else None
+
+
+def get_employee_attendance_stats(
+    db: Session, date_from: dt.date, date_to: dt.date, department: Optional[str] = None
+) -> list[schemas.EmployeeAttendanceStats]:
+    """
+    Per-employee attendance rate over [date_from, date_to], ordered by employee_id.
+    Each employee's present/absent counts are correlated COUNT subqueries that
+    seek ix_attendance_employee_status_date and never touch table rows; a
+    GROUP BY over the whole range has to fetch and sort every record instead.
+    """
+    att = models.Attendance
+
+    def status_count(status_value: str):
+        return (
+            select(func.count())
+            .where(
+                att.employee_id == models.Employee.id,
+                att.status == status_value,
+                att.date.between(date_from, date_to),
             )
+            .correlate(models.Employee)
+            .scalar_subquery()
         )
-        .scalar()
-        or 0
+
+    query = (
+        db.query(
+            models.Employee.employee_id,
+            models.Employee.full_name,
+            models.Employee.department,
+            status_count("Present").label("present"),
+            status_count("Absent").label("absent"),
+        )
+        .order_by(models.Employee.employee_id)
     )
+    if department:
+        query = query.filter(models.Employee.department == department)
+
+    return [
+        schemas.EmployeeAttendanceStats.model_construct(
+            employee_id=row.employee_id,
+            full_name=row.full_name,
+            department=row.department,
+            present=row.present,
+            absent=row.absent,
+            attendance_rate=_attendance_rate(row.present, row.absent),
+        )
+        for row in query.all()
+    ]
+
+
+def get_department_attendance_stats(
+    db: Session, date_from: dt.date, date_to: dt.date, department: Optional[str] = None
+) -> list[schemas.DepartmentAttendanceStats]:
+    """
+    Per-department attendance rate over [date_from, date_to], read from
+    attendance_daily_summary: cost is O(days x departments), not O(records).
+    """
+    summary_table = models.AttendanceDailySummary
+    present, absent = func.sum(summary_table.present), func.sum(summary_table.absent)
+    query = (
+        db.query(summary_table.department, present.label("present"), absent.label("absent"))
+        .filter(summary_table.date.between(date_from, date_to))
+        .group_by(summary_table.department)
+        .having(present + absent > 0)  # Departments emptied by deletes keep zeroed rollup rows
+        .order_by(summary_table.department)
+    )
+    if department:
+        query = query.filter(summary_table.department == department)
+
+    return [
+        schemas.DepartmentAttendanceStats.model_construct(
+            department=row.department,
+            present=int(row.present),  # SUM() is DECIMAL on MySQL
+            absent=int(row.absent),
+            attendance_rate=_attendance_rate(int(row.present), int(row.absent)),
+        )
+        for row in query.all()
+    ]
+
+
+def get_daily_attendance_stats(
+    db: Session, date_from: dt.date, date_to: dt.date, department: Optional[str] = None
+) -> list[schemas.DailyAttendanceStats]:
+    """
+    Daily attendance rate over [date_from, date_to], read from attendance_daily_summary.
+    Returns one entry per calendar day; days without records are zero-filled.
+    """
+    summary_table = models.AttendanceDailySummary
+    query = (
+        db.query(
+            summary_table.date,
+            func.sum(summary_table.present).label("present"),
+            func.sum(summary_table.absent).label("absent"),
+        )
+        .filter(summary_table.date.between(date_from, date_to))
+        .group_by(summary_table.date)
+    )
+    if department:
+        query = query.filter(summary_table.department == department)
+    by_date = {row.date: (int(row.present), int(row.absent)) for row in query.all()}  # SUM() is DECIMAL on MySQL
+
+    series = []
+    for offset in range((date_to - date_from).days + 1):
+        day = date_from + dt.timedelta(days=offset)
+        present, absent = by_date.get(day, (0, 0))
+        series.append(
+            schemas.DailyAttendanceStats.model_construct(
+                date=day, present=present, absent=absent, attendance_rate=_attendance_rate(present, absent)
+            )
+        )
+    return series
 
 
 # ═══════════════════════════ Dashboard CRUD ═════════════════════════════ #
 
 def get_dashboard_data(db: Session) -> schemas.DashboardResponse:
-    """Aggregate dashboard statistics."""
+    """
+    Aggregate dashboard statistics from the attendance rollups.
+    Today's counts come from one attendance_daily_summary lookup and per-employee
+    totals from the employees.total_present / total_absent columns, so cost is
+    O(employees) regardless of how much attendance history exists.
+    """
     today = dt.date.today()
+    summary_table = models.AttendanceDailySummary
 
-    total_employees = db.query(func.count(models.Employee.id)).scalar() or 0
-
-    today_present = (
-        db.query(func.count(models.Attendance.id))
-        .filter(
-            and_(
-                models.Attendance.date == today,
-                models.Attendance.status == "Present",
-            )
+    present_today, absent_today = (
+        db.query(
+            func.coalesce(func.sum(summary_table.present), 0),
+            func.coalesce(func.sum(summary_table.absent), 0),
         )
-        .scalar()
-        or 0
+        .filter(summary_table.date == today)
+        .one()
     )
 
-    today_absent = (
-        db.query(func.count(models.Attendance.id))
-        .filter(
-            and_(
-                models.Attendance.date == today,
-                models.Attendance.status == "Absent",
-            )
+    rows = (
+        db.query(
+            models.Employee.employee_id,
+            models.Employee.full_name,
+            models.Employee.department,
+            models.Employee.total_present,
+            models.Employee.total_absent,
         )
-        .scalar()
-        or 0
+        .order_by(models.Employee.created_at.desc(), models.Employee.id.desc())
+        .all()
     )
 
-    employees = get_all_employees(db)
-    summary = []
-    for emp in employees:
-        present_count = get_present_days_count(db, emp.id)
-        absent_count = (
-            db.query(func.count(models.Attendance.id))
-            .filter(
-                and_(
-                    models.Attendance.employee_id == emp.id,
-                    models.Attendance.status == "Absent",
-                )
-            )
-            .scalar()
-            or 0
-        )
-        summary.append(
-            schemas.DashboardEmployeeSummary(
-                employee_id=emp.employee_id,
-                full_name=emp.full_name,
-                department=emp.department,
-                total_present=present_count,
-                total_absent=absent_count,
-            )
+    summary = [
+        schemas.DashboardEmployeeSummary.model_construct(
+            employee_id=row.employee_id,
+            full_name=row.full_name,
+            department=row.department,
+            total_present=row.total_present,
+            total_absent=row.total_absent,
         )
+        for row in rows
+    ]
 
     return schemas.DashboardResponse(
-        total_employees=total_employees,
-        total_present_today=today_present,
-        total_absent_today=today_absent,
+        total_employees=len(rows),
+        total_present_today=present_today,
+        total_absent_today=absent_today,
         employees_summary=summary,
     )
@@ -1,32 +1,279 @@
 """
 Database session management and engine setup.
 """
-from sqlalchemy import create_engine
+from typing import Union
+
+from fastapi import Response
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import make_url
+from sqlalchemy.exc import DBAPIError
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import StaticPool
+from sqlalchemy.util.concurrency import await_, in_greenlet
+from starlette.concurrency import run_in_threadpool
 
 from app.core.config import settings
+from app.utils import replicas
+from app.utils.replicas import ReplicaPool
+
+# Pools each worker opens against one database server: sync, plus async with DB_ASYNC
+ENGINES_PER_SERVER = 2 if settings.DB_ASYNC else 1
+
+
+def pool_budget(
+    pool_size: int, max_overflow: int, max_connections: int, workers: int, engines: int
+) -> tuple[int, int]:
+    """
+    (pool_size, max_overflow) for one engine so that `workers` processes with
+    `engines` pools each stay within max_connections on one server.
+    Persistent connections are kept first; overflow gets what is left.
+    max_connections <= 0 means no cap.
+    """
+    if max_connections <= 0:
+        return pool_size, max_overflow
+    budget = max(1, max_connections // (max(workers, 1) * engines))
+    size = min(pool_size, budget)
+    return size, min(max_overflow, budget - size)
+
+
+def pool_options() -> dict:
+    """QueuePool arguments from Settings, sized to this worker's connection budget."""
+    pool_size, max_overflow = pool_budget(
+        settings.DB_POOL_SIZE,
+        settings.DB_MAX_OVERFLOW,
+        settings.DB_MAX_CONNECTIONS,
+        settings.WEB_CONCURRENCY,
+        ENGINES_PER_SERVER,
+    )
+    return dict(
+        pool_pre_ping=settings.DB_POOL_PRE_PING,  # Round trip per checkout; off = invalidate on error
+        pool_size=pool_size,                      # Persistent connections
+        max_overflow=max_overflow,                # Burst connections beyond pool_size
+        pool_timeout=settings.DB_POOL_TIMEOUT,    # Seconds to wait for a free connection
+        pool_recycle=settings.DB_POOL_RECYCLE,    # Replace connections older than this
+    )
 
-engine = create_engine(
-    settings.DATABASE_URL,
-    pool_pre_ping=True,        # Verify connections before using
-    pool_size=10,              # Pool connection count
-    max_overflow=20,           # Extra connections beyond pool_size
-    pool_recycle=3600,         # Recycle connections after 1 hour
-)
+
+def engine_options(url: str) -> dict:
+    """
+    Engine keyword arguments for a database URL.
+    In-memory SQLite only exists inside one connection, so it gets a single
+    StaticPool connection shared across threads instead of pool_options().
+    """
+    parsed = make_url(url)
+    if parsed.get_backend_name() == "sqlite" and parsed.database in (None, "", ":memory:"):
+        return dict(poolclass=StaticPool, connect_args={"check_same_thread": False})
+    return pool_options()
+
+
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
 
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# Async engine/session, only created when DB_ASYNC is enabled
+async_engine = (
+    create_async_engine(settings.async_database_url, **engine_options(settings.async_database_url))
+    if settings.DB_ASYNC
+    else None
+)
+AsyncSessionLocal = (
+    async_sessionmaker(bind=async_engine, autoflush=False) if async_engine is not None else None
+)
+
+
+
+def _replica_pool(engines: list, sync_engine_of=lambda engine: engine) -> ReplicaPool:
+    """ReplicaPool over `engines`; a disconnect on any of them takes it out of rotation."""
+    pool = ReplicaPool(engines, retry_seconds=settings.REPLICA_RETRY_SECONDS)
+    for replica in engines:
+        def on_error(context, replica=replica):
+            if context.is_disconnect:
+                pool.mark_down(replica)
+        event.listen(sync_engine_of(replica), "handle_error", on_error)
+    return pool
+
+
+# Read replicas (DATABASE_REPLICA_URLS); empty when not configured
+read_replicas = _replica_pool(
+    [create_engine(url, **engine_options(url)) for url in settings.replica_urls_list]
+)
+async_read_replicas = (
+    _replica_pool(
+        [
+            create_async_engine(settings.to_async_url(url), **engine_options(settings.to_async_url(url)))
+            for url in settings.replica_urls_list
+        ],
+        sync_engine_of=lambda engine: engine.sync_engine,
+    )
+    if settings.DB_ASYNC
+    else None
+)
+
 Base = declarative_base()
 
+# What get_db yields, depending on DB_ASYNC
+DbSession = Union[Session, AsyncSession]
+
 
-def get_db():
+def get_sync_db():
     """
     Dependency injection: yield a database session and close it after use.
-    Usage: db: Session = Depends(get_db)
+    Usage: db: Session = Depends(get_sync_db)
     """
     db = SessionLocal()
     try:
         yield db
     finally:
         db.close()
+
+
+async def get_async_db():
+    """
+    Dependency injection: yield an AsyncSession and close it after use.
+    Usage: db: AsyncSession = Depends(get_async_db)
+    """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+# The request-scoped session dependency used by the routers
+get_db = get_async_db if settings.DB_ASYNC else get_sync_db
+
+
+def open_read_session() -> tuple[Session, bool]:
+    """
+    Open a sync session for a read-only request: the next healthy replica
+    (checked out eagerly, so a dead one fails over here), or the primary when
+    no replica is configured or healthy, or the client just wrote.
+    Returns (session, on_replica).
+    """
+    if not replicas.prefers_primary():
+        for replica in read_replicas.candidates():
+            db = SessionLocal(bind=replica, info={"read_only": True})
+            try:
+                db.connection()
+            except DBAPIError:
+                db.close()
+                read_replicas.mark_down(replica)
+                continue
+            return db, True
+    return SessionLocal(info={"read_only": True}), False
+
+
+def _replica_read_started(response: Response) -> None:
+    """Replica reads shortly after a local write may lag it: serve them uncached and untagged."""
+    if replicas.recently_written(settings.READ_YOUR_WRITES_SECONDS):
+        replicas.flag_lagging_read()
+        del response.headers["ETag"]
+
+
+async def get_sync_read_db(response: Response):
+    """
+    Dependency injection for read-only routes: yield a replica (or primary)
+    session, see open_read_session. Async so the lagging-read flag it sets
+    is visible to the endpoint.
+    """
+    if read_replicas.engines:
+        db, on_replica = await run_in_threadpool(open_read_session)
+    else:
+        db, on_replica = SessionLocal(info={"read_only": True}), False
+    if on_replica:
+        _replica_read_started(response)
+    try:
+        yield db
+    finally:
+        await run_in_threadpool(db.close)
+
+
+async def get_async_read_db(response: Response):
+    """get_sync_read_db for DB_ASYNC: yield an AsyncSession on a replica or the primary."""
+    if not replicas.prefers_primary():
+        for replica in async_read_replicas.candidates():
+            db = AsyncSessionLocal(bind=replica, info={"read_only": True})
+            try:
+                await db.connection()
+            except DBAPIError:
+                await db.close()
+                async_read_replicas.mark_down(replica)
+                continue
+            _replica_read_started(response)
+            try:
+                yield db
+            finally:
+                await db.close()
+            return
+    async with AsyncSessionLocal(info={"read_only": True}) as db:
+        yield db
+
+
+# The session dependency for read-only routes; same as get_db without replicas
+get_read_db = get_async_read_db if settings.DB_ASYNC else get_sync_read_db
+
+
+async def run_db(db: DbSession, fn, *args, **kwargs):
+    """
+    Await a sync crud function against either session flavour.
+    AsyncSession runs it through run_sync on the async driver (no thread, so
+    fn runs on the event loop; CPU-heavy parts go through off_loop);
+    a sync Session runs it on the threadpool so the event loop never blocks.
+    Usage: employee = await run_db(db, crud.create_employee, payload)
+
+    On a read-only session (get_read_db), a call that fails because its
+    connection turned out dead is retried once, on the next healthy replica
+    or the primary (see _rebind_read_session). The pool has already thrown
+    that connection away, which is what makes DB_POOL_PRE_PING=false safe
+    for reads.
+    """
+    try:
+        return await _call_db(db, fn, *args, **kwargs)
+    except DBAPIError as exc:
+        if not (exc.connection_invalidated and db.info.get("read_only")):
+            raise
+    if isinstance(db, AsyncSession):
+        await db.rollback()
+    else:
+        await run_in_threadpool(db.rollback)
+    _rebind_read_session(db)
+    return await _call_db(db, fn, *args, **kwargs)
+
+
+def _rebind_read_session(db: DbSession) -> None:
+    """
+    Move a read-only session whose replica connection died to the next healthy
+    replica, or the primary, and take the dead one out of rotation. A session
+    already on the primary stays there (the client may be inside its
+    read-your-writes window) and just gets a fresh connection.
+    """
+    if isinstance(db, AsyncSession):
+        replicas_by_bind = {r.sync_engine: r for r in async_read_replicas.engines} if async_read_replicas else {}
+        dead = replicas_by_bind.get(db.sync_session.bind)
+        if dead is not None:
+            async_read_replicas.mark_down(dead)
+            target = next((r for r in async_read_replicas.candidates() if r is not dead), async_engine)
+            db.sync_session.bind = target.sync_engine
+    elif db.bind in read_replicas.engines:
+        dead = db.bind
+        read_replicas.mark_down(dead)
+        db.bind = next((r for r in read_replicas.candidates() if r is not dead), engine)
+
+
+async def _call_db(db: DbSession, fn, *args, **kwargs):
+    if isinstance(db, AsyncSession):
+        return await db.run_sync(fn, *args, **kwargs)
+    return await run_in_threadpool(fn, db, *args, **kwargs)
+
+
+def off_loop(fn, *args, **kwargs):
+    """
+    Call CPU-bound, database-free fn from crud code without holding the event loop.
+    Under AsyncSession.run_sync crud runs on the loop thread, inside a greenlet:
+    the greenlet is parked while fn runs on the threadpool, so other requests
+    keep being served. Elsewhere (a sync Session, already on the threadpool)
+    fn is just called.
+    Usage: batch = off_loop(_validate_import_batch, numbered_rows, ...)
+    """
+    if in_greenlet():
+        return await_(run_in_threadpool(fn, *args, **kwargs))
+    return fn(*args, **kwargs)
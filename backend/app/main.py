@@ -3,12 +3,17 @@ FastAPI application entry point.
 """
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 
 from app.core.config import settings
-from app.database import engine, Base
+from app.database import engine, async_engine, async_read_replicas, read_replicas, Base
 from app.routers import employees, attendance
 from app import crud
 from app.database import SessionLocal
+from app.utils.compression import CompressionMiddleware
+from app.utils.metrics import MetricsMiddleware, instrument_engine, render_metrics
+from app.utils.replicas import PRIMARY_HEADER, ReadYourWritesMiddleware
+from app.utils.responses import ORJSONResponse
 from contextlib import asynccontextmanager
 
 
@@ -17,11 +22,23 @@ from contextlib import asynccontextmanager
 async def lifespan(app: FastAPI):
     # Create tables on startup (safe fallback — alembic is preferred)
     Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        crud.warm_employee_cache(db)
+    finally:
+        db.close()
     yield
+    if attendance.attendance_writes is not None:
+        await attendance.attendance_writes.close()  # Commit marks still queued
+    if async_engine is not None:
+        await async_engine.dispose()
+    for replica in async_read_replicas.engines if async_read_replicas else []:
+        await replica.dispose()
 
 
 app = FastAPI(
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
     title=settings.APP_NAME,
     version=settings.APP_VERSION,
     description=(
@@ -43,35 +60,187 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[PRIMARY_HEADER],  # Read by the SPA to keep its reads on the primary after a write
 )
 
 
+# ─────────────────────────── Read replicas ───────────────────────── #
+# Clients that just wrote read from the primary for READ_YOUR_WRITES_SECONDS.
+if read_replicas.engines:
+    app.add_middleware(ReadYourWritesMiddleware, window_seconds=settings.READ_YOUR_WRITES_SECONDS)
+
+
+# ─────────────────────────── Compression ─────────────────────────── #
+# Inside the metrics layer, so request latency includes compression time.
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MINIMUM_SIZE,
+        encodings=settings.compression_encodings_list,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
+
+# ───────────────────────────── Metrics ───────────────────────────── #
+# Added after CORS so it is the outermost layer and times the whole request.
+if settings.METRICS_ENABLED:
+    instrument_engine(engine, "sync")
+    if async_engine is not None:
+        instrument_engine(async_engine.sync_engine, "async")
+    for n, replica in enumerate(read_replicas.engines):
+        instrument_engine(replica, f"replica{n}")
+    for n, replica in enumerate(async_read_replicas.engines if async_read_replicas else []):
+        instrument_engine(replica.sync_engine, f"async_replica{n}")
+    app.add_middleware(MetricsMiddleware, debug_headers=settings.METRICS_DEBUG_HEADERS)
+
+
 # ──────────────────────────── Routers ────────────────────────────── #
 app.include_router(employees.router)
 app.include_router(attendance.router)
 
 
 # ──────────────────────── Dashboard Endpoint ─────────────────────── #
-from fastapi import Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
+import asyncio
+import datetime as dt
+import random
+from fastapi import Depends, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
+from app.database import AsyncSessionLocal, DbSession, get_read_db, run_db
+from app.utils.cache import response_cache
+from app.utils.events import RESYNC, dashboard_events, sse_frame
+from app.utils.responses import trusted_json
+from app.utils.versions import conditional_get
 from app import schemas
 
 
+def _today() -> dt.date:
+    """The dashboard's present/absent-today counts change at midnight without any write."""
+    return dt.date.today()
+
+
 @app.get(
     "/dashboard",
     response_model=schemas.DashboardResponse,
     tags=["Dashboard"],
     summary="Get dashboard summary statistics",
+    dependencies=[Depends(conditional_get("employees", "attendance", key=_today))],
 )
-def get_dashboard(db: Session = Depends(get_db)):
+async def get_dashboard(response: Response, db: DbSession = Depends(get_read_db)):
     """
     Returns high-level HR statistics:
     - Total employees
     - Total present / absent today
     - Per-employee attendance summary (total present & absent days)
     """
-    return crud.get_dashboard_data(db)
+    cache_params = {"date": _today()}
+    cached = response_cache.get("dashboard", cache_params)
+    if cached is not None:
+        return trusted_json(cached, response)
+
+    generation = response_cache.generation("dashboard")
+    result = await run_db(db, crud.get_dashboard_data)
+    response_cache.set("dashboard", cache_params, result, generation)
+    return trusted_json(result, response)
+
+
+# Pause before re-reading a snapshot that a concurrent write overlapped
+SNAPSHOT_RETRY_SECONDS = 0.01
+
+
+async def _dashboard_snapshot() -> tuple[int, bytes]:
+    """
+    The full dashboard as a `snapshot` event, through the response cache, and
+    the id of the last event it already reflects (also its SSE id). It is read
+    while no write sits between its commit and its publish, and read again if
+    an event was sent meanwhile, so every delta is either in the snapshot or
+    has a larger id. Always read from the primary: the deltas that follow come
+    from commits on the primary, so a lagging replica snapshot would never
+    catch up.
+    """
+    while True:
+        version = dashboard_events.version()
+        if version is not None:
+            data = await _dashboard_data()
+            if dashboard_events.version() == version:
+                return version, sse_frame("snapshot", data, version)
+        await asyncio.sleep(SNAPSHOT_RETRY_SECONDS)
+
+
+async def _dashboard_data() -> schemas.DashboardResponse:
+    cache_params = {"date": _today()}
+    cached = response_cache.get("dashboard", cache_params)
+    if cached is None:
+        generation = response_cache.generation("dashboard")
+        if settings.DB_ASYNC:
+            async with AsyncSessionLocal(info={"read_only": True}) as db:
+                cached = await run_db(db, crud.get_dashboard_data)
+        else:
+            db = SessionLocal(info={"read_only": True})
+            try:
+                cached = await run_db(db, crud.get_dashboard_data)
+            finally:
+                await run_in_threadpool(db.close)
+        response_cache.set("dashboard", cache_params, cached, generation)
+    return cached
+
+
+async def _dashboard_events():
+    """
+    Snapshot first, then forward the broadcaster's deltas until the stream's
+    lifetime runs out, skipping those the latest snapshot already reflects.
+    Idle streams get a comment line every heartbeat.
+    """
+    lifetime = settings.DASHBOARD_STREAM_MAX_SECONDS * random.uniform(0.9, 1.1)  # Spread reconnects out
+    deadline = asyncio.get_running_loop().time() + lifetime
+    cursor = dashboard_events.subscribe()  # Before the snapshot, so no delta committed after it is lost
+    try:
+        version, snapshot = await _dashboard_snapshot()
+        yield b"retry: 1000\n" + snapshot
+        day = _today()
+        while (remaining := deadline - asyncio.get_running_loop().time()) > 0:
+            timeout = min(settings.DASHBOARD_STREAM_HEARTBEAT_SECONDS, remaining)
+            events, cursor = await dashboard_events.wait(cursor, timeout)
+            frames = None if events is None else [frame for event_id, frame in events if event_id > version]
+            if frames is None or RESYNC in frames or _today() != day:
+                day = _today()
+                version, snapshot = await _dashboard_snapshot()
+                yield snapshot
+            elif frames:
+                yield b"".join(frames)
+            elif not events:
+                yield b": heartbeat\n\n"
+    finally:
+        dashboard_events.unsubscribe()
+
+
+@app.get(
+    "/dashboard/stream",
+    tags=["Dashboard"],
+    summary="Stream dashboard updates as server-sent events",
+    response_class=StreamingResponse,
+    responses={200: {"content": {"text/event-stream": {}}, "description": "SSE stream"}},
+)
+async def stream_dashboard():
+    """
+    Server-sent events replacing /dashboard polling:
+    - `snapshot`: the full DashboardResponse; sent first, and again after a
+      bulk change, when the stream fell behind, or when the day rolls over
+    - `attendance`: increments for today's totals and for each changed employee,
+      `{"today": {"present", "absent"}, "employees": {employee_id: {"present", "absent"}}}`
+    - `employee_created`: the new employee's summary row
+    - `employee_deleted`: `{"employee_id", "today": {"present", "absent"}}` (increments)
+
+    Every event has an SSE id; deltas with an id not above the last snapshot's
+    are already in it. Deltas cover writes committed by this worker. The stream closes after about
+    DASHBOARD_STREAM_MAX_SECONDS and EventSource reconnects to a fresh snapshot.
+    """
+    return StreamingResponse(
+        _dashboard_events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 # ────────────────────────── Health Check ─────────────────────────── #
@@ -81,6 +250,19 @@ def health_check():
     return {"status": "ok", "service": settings.APP_NAME, "version": settings.APP_VERSION}
 
 
+@app.get("/cache/stats", tags=["System"], summary="Response cache statistics")
+def cache_stats():
+    """Returns hit/miss counters and occupancy of the in-process response cache."""
+    return response_cache.stats()
+
+
+if settings.METRICS_ENABLED:
+    @app.get("/metrics", tags=["System"], summary="Prometheus metrics", response_class=PlainTextResponse)
+    def metrics():
+        """Request latency, SQL statement counts/time and connection pool state in Prometheus text format."""
+        return PlainTextResponse(render_metrics(), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+
 @app.get("/", tags=["System"], summary="Root redirect info")
 def root():
     return {
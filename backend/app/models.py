@@ -11,32 +11,55 @@ from sqlalchemy import (
     Enum,
     DateTime,
     ForeignKey,
+    Index,
     UniqueConstraint,
 )
+from sqlalchemy.dialects import sqlite
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
 from app.database import Base
 
+# SQLite stores CURRENT_TIMESTAMP without fractional seconds; bind parameters must
+# use the same text format or equality comparisons (keyset cursors) never match.
+TimestampType = DateTime(timezone=True).with_variant(
+    sqlite.DATETIME(
+        storage_format="%(year)04d-%(month)02d-%(day)02d %(hour)02d:%(minute)02d:%(second)02d"
+    ),
+    "sqlite",
+)
+
 
 class Employee(Base):
     """Represents an employee record."""
 
     __tablename__ = "employees"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     employee_id = Column(String(50), unique=True, nullable=False, index=True)
     full_name = Column(String(150), nullable=False)
     email = Column(String(255), unique=True, nullable=False)
     department = Column(String(100), nullable=False)
-    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(TimestampType, server_default=func.now(), nullable=False)
+
+    # All-time attendance totals, denormalized and kept exact by app.rollups
+    total_present = Column(Integer, nullable=False, default=0, server_default="0")
+    total_absent = Column(Integer, nullable=False, default=0, server_default="0")
+
+    # Newest-first listing and keyset pagination on (created_at, id)
+    __table_args__ = (
+        Index("ix_employees_created_at_id", "created_at", "id"),
+    )
 
-    # Relationship: cascade delete attendance records when employee is deleted
+    # Relationship: cascade delete attendance records when employee is deleted.
+    # passive_deletes: crud.delete_employee removes them with one DELETE instead
+    # of the ORM loading and deleting every record.
     attendance_records = relationship(
         "Attendance",
         back_populates="employee",
         cascade="all, delete-orphan",
         lazy="dynamic",
+        passive_deletes=True,
     )
 
     def __repr__(self) -> str:
@@ -48,7 +71,7 @@ class Attendance(Base):
 
     __tablename__ = "attendance"
 
-    id = Column(Integer, primary_key=True, index=True)
+    id = Column(Integer, primary_key=True)
     employee_id = Column(
         Integer,
         ForeignKey("employees.id", ondelete="CASCADE"),
@@ -59,8 +82,11 @@ class Attendance(Base):
     status = Column(Enum("Present", "Absent", name="attendance_status"), nullable=False)
 
     # Enforce: one record per employee per date
+    # Indexes cover the hot filters: date (+status) and employee (+status, date)
     __table_args__ = (
         UniqueConstraint("employee_id", "date", name="uq_employee_date"),
+        Index("ix_attendance_date_status", "date", "status"),
+        Index("ix_attendance_employee_status_date", "employee_id", "status", "date"),
     )
 
     # Relationship back to employee
@@ -68,3 +94,17 @@ class Attendance(Base):
 
     def __repr__(self) -> str:
         return f"<Attendance employee_id={self.employee_id} date={self.date} status={self.status}>"
+
+
+class AttendanceDailySummary(Base):
+    """Pre-aggregated attendance counts per date and department, maintained by app.rollups."""
+
+    __tablename__ = "attendance_daily_summary"
+
+    date = Column(Date, primary_key=True)
+    department = Column(String(100), primary_key=True)
+    present = Column(Integer, nullable=False, default=0, server_default="0")
+    absent = Column(Integer, nullable=False, default=0, server_default="0")
+
+    def __repr__(self) -> str:
+        return f"<AttendanceDailySummary date={self.date} department={self.department} present={self.present} absent={self.absent}>"
@@ -0,0 +1,246 @@
+"""
+Incrementally maintained attendance rollups.
+
+attendance_daily_summary holds present/absent counts per (date, department) and
+the employees.total_present / total_absent columns hold each employee's
+all-time totals. crud keeps both exact by calling apply_attendance /
+remove_employee inside the same transaction as the attendance write or employee
+delete, so dashboard and employee-list reads never scan the attendance table.
+
+Backfill or repair from the raw attendance table with:
+    python -m app.rollups rebuild
+Check the employee totals for drift (and fix it with --repair) with:
+    python -m app.rollups reconcile [--repair]
+"""
+import argparse
+import datetime as dt
+from collections import defaultdict
+from typing import Iterable
+
+from sqlalchemy import Table, bindparam, case, delete, func, insert, select, update
+from sqlalchemy.dialects import mysql, postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app import models
+from app.database import SessionLocal
+
+# (employee_pk, department, date, status) of one attendance row
+AttendanceFact = tuple[int, str, dt.date, str]
+
+_summary = models.AttendanceDailySummary.__table__
+_employees = models.Employee.__table__
+
+RECONCILE_CHUNK_SIZE = 5000
+
+# One executemany for every employee whose totals move
+_increment_totals = (
+    update(_employees)
+    .where(_employees.c.id == bindparam("pk"))
+    .values(
+        total_present=_employees.c.total_present + bindparam("d_present"),
+        total_absent=_employees.c.total_absent + bindparam("d_absent"),
+    )
+)
+
+
+def _upsert_increment(db: Session, table: Table, keys: list[str], rows: list[dict]) -> None:
+    """
+    Add each row's counter values onto the row with the same key, inserting it if missing.
+    Uses a single native upsert statement on MySQL, SQLite and PostgreSQL.
+    """
+    if not rows:
+        return
+    counters = [name for name in rows[0] if name not in keys]
+    dialect = db.get_bind().dialect.name
+
+    if dialect == "mysql":
+        stmt = mysql.insert(table)
+        stmt = stmt.on_duplicate_key_update({c: table.c[c] + stmt.inserted[c] for c in counters})
+    elif dialect in ("sqlite", "postgresql"):
+        stmt = (sqlite.insert if dialect == "sqlite" else postgresql.insert)(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=keys, set_={c: table.c[c] + stmt.excluded[c] for c in counters}
+        )
+    else:
+        # Portable fallback: UPDATE, then INSERT the keys that did not exist yet
+        for row in rows:
+            where = [table.c[k] == row[k] for k in keys]
+            values = {c: table.c[c] + row[c] for c in counters}
+            if db.execute(update(table).where(*where).values(values)).rowcount == 0:
+                db.execute(insert(table).values(row))
+        return
+    db.execute(stmt, rows)
+
+
+def apply_attendance(db: Session, facts: Iterable[AttendanceFact], sign: int = 1) -> None:
+    """
+    Fold attendance rows into both rollups; sign=-1 subtracts them.
+    Must run in the same transaction as the attendance change it mirrors.
+    """
+    daily: dict[tuple[dt.date, str], list[int]] = defaultdict(lambda: [0, 0])
+    totals: dict[int, list[int]] = defaultdict(lambda: [0, 0])
+    for employee_pk, department, date, status in facts:
+        slot = 0 if status == "Present" else 1
+        daily[(date, department)][slot] += sign
+        totals[employee_pk][slot] += sign
+
+    _upsert_increment(
+        db,
+        _summary,
+        ["date", "department"],
+        [{"date": d, "department": dept, "present": p, "absent": a} for (d, dept), (p, a) in daily.items()],
+    )
+    if totals:
+        db.execute(
+            _increment_totals,
+            [{"pk": pk, "d_present": p, "d_absent": a} for pk, (p, a) in totals.items()],
+        )
+
+
+def remove_employee(db: Session, employee: models.Employee) -> dict[dt.date, tuple[int, int]]:
+    """
+    Subtract an employee's attendance from the daily summary; their totals go with the row.
+    Call before deleting the employee, in the same transaction.
+    Returns the (present, absent) counts removed per date.
+    """
+    counts = (
+        db.query(models.Attendance.date, models.Attendance.status, func.count(models.Attendance.id))
+        .filter(models.Attendance.employee_id == employee.id)
+        .group_by(models.Attendance.date, models.Attendance.status)
+        .all()
+    )
+    daily: dict[dt.date, list[int]] = defaultdict(lambda: [0, 0])
+    for date, status, count in counts:
+        daily[date][0 if status == "Present" else 1] -= count
+    _upsert_increment(
+        db,
+        _summary,
+        ["date", "department"],
+        [{"date": d, "department": employee.department, "present": p, "absent": a} for d, (p, a) in daily.items()],
+    )
+    return {d: (-p, -a) for d, (p, a) in daily.items()}
+
+
+def _attendance_counts(lo: int, hi: int):
+    """Per-employee (pk, present, absent) counts from attendance for employee pks in [lo, hi]."""
+    present = func.sum(case((models.Attendance.status == "Present", 1), else_=0))
+    absent = func.sum(case((models.Attendance.status == "Absent", 1), else_=0))
+    return (
+        select(models.Attendance.employee_id, present, absent)
+        .where(models.Attendance.employee_id.between(lo, hi))
+        .group_by(models.Attendance.employee_id)
+    )
+
+
+def reconcile(db: Session, repair: bool = False, chunk_size: int = RECONCILE_CHUNK_SIZE) -> list[dict]:
+    """
+    Compare employees.total_present / total_absent with COUNTs over attendance,
+    one range of employee pks at a time, and return every drifted employee as
+    {"pk", "employee_id", "stored": (present, absent), "actual": (present, absent)}.
+
+    With repair=True each drifted row is overwritten with the counted values and
+    every chunk commits on its own. The overwrite only applies while the row still
+    holds the values read in the same chunk, so totals moved by a concurrent
+    attendance write are left alone (and show up again on the next run if still wrong).
+    """
+    drift: list[dict] = []
+    last_pk = 0
+    while True:
+        employees = db.execute(
+            select(_employees.c.id, _employees.c.employee_id, _employees.c.total_present, _employees.c.total_absent)
+            .where(_employees.c.id > last_pk)
+            .order_by(_employees.c.id)
+            .limit(chunk_size)
+        ).all()
+        if not employees:
+            break
+        lo, hi = employees[0].id, employees[-1].id
+        actual = {pk: (p, a) for pk, p, a in db.execute(_attendance_counts(lo, hi))}
+
+        chunk = []
+        for emp in employees:
+            counted = actual.get(emp.id, (0, 0))
+            if (emp.total_present, emp.total_absent) != counted:
+                chunk.append(
+                    {
+                        "pk": emp.id,
+                        "employee_id": emp.employee_id,
+                        "stored": (emp.total_present, emp.total_absent),
+                        "actual": counted,
+                    }
+                )
+        if repair and chunk:
+            db.execute(
+                update(_employees)
+                .where(
+                    _employees.c.id == bindparam("pk"),
+                    _employees.c.total_present == bindparam("old_present"),
+                    _employees.c.total_absent == bindparam("old_absent"),
+                )
+                .values(total_present=bindparam("new_present"), total_absent=bindparam("new_absent")),
+                [
+                    {
+                        "pk": d["pk"],
+                        "old_present": d["stored"][0],
+                        "old_absent": d["stored"][1],
+                        "new_present": d["actual"][0],
+                        "new_absent": d["actual"][1],
+                    }
+                    for d in chunk
+                ],
+            )
+        db.commit()  # Ends the chunk's read snapshot (and applies its repairs)
+        drift.extend(chunk)
+        last_pk = hi
+    return drift
+
+
+def rebuild(db: Session) -> None:
+    """Recompute the daily summary and the employee totals from the attendance table. Commits."""
+    present = func.sum(case((models.Attendance.status == "Present", 1), else_=0))
+    absent = func.sum(case((models.Attendance.status == "Absent", 1), else_=0))
+
+    db.execute(delete(_summary))
+    db.execute(
+        insert(_summary).from_select(
+            ["date", "department", "present", "absent"],
+            select(models.Attendance.date, models.Employee.department, present, absent)
+            .join(models.Employee, models.Attendance.employee_id == models.Employee.id)
+            .group_by(models.Attendance.date, models.Employee.department),
+        )
+    )
+    db.commit()
+    reconcile(db, repair=True)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m app.rollups", description="Maintain attendance rollups.")
+    parser.add_argument(
+        "command",
+        choices=["rebuild", "reconcile"],
+        help="rebuild: recompute rollups from raw attendance; reconcile: report employee totals that drifted",
+    )
+    parser.add_argument("--repair", action="store_true", help="reconcile: overwrite drifted totals with the counts")
+    parser.add_argument("--chunk-size", type=int, default=RECONCILE_CHUNK_SIZE, help="reconcile: employees per chunk")
+    args = parser.parse_args()
+
+    db = SessionLocal()
+    try:
+        if args.command == "rebuild":
+            rebuild(db)
+            print("Attendance rollups rebuilt.")
+            return
+        drift = reconcile(db, repair=args.repair, chunk_size=args.chunk_size)
+    finally:
+        db.close()
+
+    for d in drift:
+        print(f"{d['employee_id']}: stored present/absent {d['stored']}, counted {d['actual']}")
+    action = "repaired" if args.repair else "found"
+    print(f"Employee attendance totals: {len(drift)} drifted row(s) {action}.")
+    if drift and not args.repair:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,95 +1,372 @@
 """
 Attendance router: handles all /attendance endpoints.
 """
+import csv
+import io
 from datetime import date as date_type
-from typing import Optional
-
-from fastapi import APIRouter, Depends, Query, status
-from sqlalchemy.orm import Session
+from typing import Callable, Iterator, Literal, Optional
 
+import orjson
+from fastapi import APIRouter, Depends, HTTPException, Query, Response, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from app import crud, schemas
-from app.database import get_db
+from app.core.config import settings
+from app.database import AsyncSessionLocal, DbSession, SessionLocal, get_db, get_read_db, open_read_session, run_db
+from app.utils.cache import stats_cache
+from app.utils.group_commit import GroupCommitter
+from app.utils.pagination import decode_cursor, page_limit, paginate
+from app.utils.responses import trusted_json
+from app.utils.versions import conditional_get, data_versions
 
 router = APIRouter(prefix="/attendance", tags=["Attendance"])
 
+PageLimit = Depends(page_limit)
+PageCursor = Query(None, description="Opaque cursor from a previous page's next_cursor")
+
+
+EXPORT_FIELDS = list(schemas.AttendanceResponse.model_fields)
+EXPORT_CHUNK_ROWS = 1000
+
+StatsFrom = Query(..., description="Start date, inclusive (YYYY-MM-DD)")
+StatsTo = Query(..., description="End date, inclusive (YYYY-MM-DD)")
+StatsDepartment = Query(None, description="Only include this department")
+
+
+def _attendance_record(row) -> dict:
+    """Helper: a projected attendance row (crud.ATTENDANCE_COLUMNS) as an AttendanceResponse-shaped dict."""
+    return row._asdict()
+
+
+def _export_chunks(
+    fmt: str,
+    date_from: Optional[date_type],
+    date_to: Optional[date_type],
+    department: Optional[str],
+) -> Iterator[str]:
+    """
+    Helper: yield the export body in chunks of EXPORT_CHUNK_ROWS rows.
+    Opens its own (replica when configured) session because the request-scoped
+    one may be closed before the response body is streamed.
+    """
+    buffer = io.StringIO()
+    writer = csv.writer(buffer) if fmt == "csv" else None
+    if writer:
+        writer.writerow(EXPORT_FIELDS)
 
-def _build_attendance_response(record, db: Session) -> schemas.AttendanceResponse:
-    """Helper: convert an Attendance ORM object into an AttendanceResponse schema."""
-    return schemas.AttendanceResponse(
-        id=record.id,
-        employee_id=record.employee_id,
-        employee_string_id=record.employee.employee_id,
-        employee_name=record.employee.full_name,
-        date=record.date,
-        status=record.status,
+    db, _ = open_read_session()
+    try:
+        for count, row in enumerate(crud.stream_attendance(db, date_from, date_to, department), start=1):
+            record = _attendance_record(row)
+            if writer:
+                writer.writerow([record[field] for field in EXPORT_FIELDS])
+            else:
+                buffer.write(orjson.dumps(record).decode() + "\n")
+            if count % EXPORT_CHUNK_ROWS == 0:
+                yield buffer.getvalue()
+                buffer.seek(0)
+                buffer.truncate()
+    finally:
+        db.close()
+    yield buffer.getvalue()
+
+
+async def _flush_attendance(items: list[tuple[schemas.AttendanceCreate, str]]) -> list:
+    """GroupCommitter flush: one session and one transaction for the whole batch."""
+    if settings.DB_ASYNC:
+        async with AsyncSessionLocal() as db:
+            return await run_db(db, crud.mark_attendance_batch, items)
+    db = SessionLocal()
+    try:
+        return await run_db(db, crud.mark_attendance_batch, items)
+    finally:
+        await run_in_threadpool(db.close)
+
+
+# POST /attendance/ writes go through this when ATTENDANCE_GROUP_COMMIT is on
+attendance_writes = (
+    GroupCommitter(
+        _flush_attendance,
+        max_batch=settings.ATTENDANCE_GROUP_COMMIT_MAX_BATCH,
+        max_delay=settings.ATTENDANCE_GROUP_COMMIT_MAX_DELAY_MS / 1000,
     )
+    if settings.ATTENDANCE_GROUP_COMMIT
+    else None
+)
 
 
 @router.post(
     "/",
     response_model=schemas.AttendanceResponse,
     status_code=status.HTTP_201_CREATED,
+    responses={200: {"model": schemas.AttendanceResponse, "description": "Existing record (mode=skip/upsert)"}},
     summary="Mark attendance for an employee",
 )
-def mark_attendance(payload: schemas.AttendanceCreate, db: Session = Depends(get_db)):
+async def mark_attendance(
+    payload: schemas.AttendanceCreate,
+    response: Response,
+    mode: Literal["insert", "upsert", "skip"] = Query(
+        "insert", description="What to do when the employee already has a record for the date"
+    ),
+    db: DbSession = Depends(get_db),
+):
     """
     Mark attendance for an employee on a specific date.
     - **employee_id**: The string employee ID (e.g. 'EMP001')
     - **date**: Date in YYYY-MM-DD format
     - **status**: 'Present' or 'Absent'
-    - Returns 409 if attendance already marked for this employee on this date
+    - **mode**: 'insert' returns 409 if attendance is already marked for this date;
+      'skip' returns the existing record unchanged and 'upsert' overwrites its status, both with 200
+    - Safe to retry: concurrent submissions for the same employee and date create one record
+    - With ATTENDANCE_GROUP_COMMIT, the write is committed together with other
+      concurrent marks; the response is the same as without it
     """
-    record = crud.mark_attendance(db, payload)
-    # Refresh to load the relationship
-    db.refresh(record)
-    return _build_attendance_response(record, db)
+    if attendance_writes is not None:
+        record, created = await attendance_writes.submit((payload, mode))
+    else:
+        record, created = await run_db(db, crud.mark_attendance, payload, mode)
+    if not created:
+        response.status_code = status.HTTP_200_OK
+    return record
+
+
+@router.post(
+    "/bulk",
+    response_model=schemas.AttendanceBulkResponse,
+    status_code=status.HTTP_201_CREATED,
+    responses={200: {"model": schemas.AttendanceBulkResponse, "description": "Nothing was created"}},
+    summary="Mark attendance for many employees at once",
+)
+async def bulk_mark_attendance(
+    payload: schemas.AttendanceBulkCreate, response: Response, db: DbSession = Depends(get_db)
+):
+    """
+    Mark attendance for up to 50,000 employee/date pairs in a single transaction.
+    - Each item has the same shape as POST /attendance/
+    - Returns a per-item result: 'created', 'duplicate' or 'unknown_employee'
+    - 201 when at least one record was created, 200 when every item was a duplicate or unknown
+    - Returns 409 if a concurrent request marked the same employee/date first; retry is safe
+    - Returns 404 if an employee was deleted while the request ran; retry without it
+    """
+    result = await run_db(db, crud.bulk_mark_attendance, payload.records)
+    status_code = status.HTTP_201_CREATED if result.created else status.HTTP_200_OK
+    # Up to 50,000 per-item results: encode them off the event loop
+    return await run_in_threadpool(trusted_json, result, response, status_code)
 
 
 @router.get(
     "/",
     response_model=schemas.AttendanceListResponse,
+    dependencies=[Depends(conditional_get("attendance", "employees"))],
     summary="Get all attendance records, optionally filtered by date",
 )
-def get_all_attendance(
+async def get_all_attendance(
+    response: Response,
     date: Optional[date_type] = Query(None, description="Filter by date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    limit: int = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    db: DbSession = Depends(get_read_db),
 ):
     """
-    Retrieve all attendance records.
+    Retrieve attendance records, newest date first.
     - Optionally filter by **date** query parameter (YYYY-MM-DD)
+    - Results are paginated; follow **next_cursor** until it is null
+    - **total** is only included on the first page
     """
+    after = decode_cursor(cursor, date_type.fromisoformat) if cursor else None
     if date:
-        records = crud.get_attendance_by_date(db, date)
+        records = await run_db(db, crud.get_attendance_by_date, date, limit=limit + 1, after=after)
     else:
-        records = crud.get_all_attendance(db)
+        records = await run_db(db, crud.get_all_attendance, limit=limit + 1, after=after)
 
-    response_list = [_build_attendance_response(r, db) for r in records]
-    return schemas.AttendanceListResponse(total=len(response_list), records=response_list)
+    page, next_cursor = paginate(records, limit, key=lambda r: (r.date, r.id))
+    total = await run_db(db, crud.count_attendance, filter_date=date) if cursor is None else None
+    return trusted_json(
+        {"total": total, "records": [_attendance_record(r) for r in page], "next_cursor": next_cursor}, response
+    )
+
+
+@router.get(
+    "/export",
+    response_class=StreamingResponse,
+    summary="Stream attendance history as NDJSON or CSV",
+)
+def export_attendance(
+    fmt: Literal["ndjson", "csv"] = Query("ndjson", alias="format", description="Output format"),
+    date_from: Optional[date_type] = Query(None, description="Start date, inclusive (YYYY-MM-DD)"),
+    date_to: Optional[date_type] = Query(None, description="End date, inclusive (YYYY-MM-DD)"),
+    department: Optional[str] = Query(None, description="Only include employees of this department"),
+):
+    """
+    Stream the attendance history, oldest first, without buffering it in memory.
+    - **format**: 'ndjson' (one JSON object per line) or 'csv'
+    - Optionally restrict by **date_from** / **date_to** and **department**
+    - Columns match the attendance list response records
+    """
+    if date_from and date_to and date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be on or before date_to.",
+        )
+
+    media_type = "text/csv" if fmt == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        _export_chunks(fmt, date_from, date_to, department),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="attendance.{fmt}"'},
+    )
+
+
+async def _range_stats(
+    db: DbSession,
+    fetch: Callable,
+    date_from: date_type,
+    date_to: date_type,
+    department: Optional[str],
+    tables: tuple[str, ...],
+) -> list:
+    """
+    Helper: validate the range and run a crud stats function.
+    Ranges ending before today are memoized in stats_cache under the current
+    versions of `tables`, so a later write to past attendance through this
+    worker bypasses stale entries; other workers' writes wait out the TTL.
+    """
+    if date_from > date_to:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="date_from must be on or before date_to.",
+        )
+    if (date_to - date_from).days >= settings.STATS_MAX_RANGE_DAYS:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Date range may span at most {settings.STATS_MAX_RANGE_DAYS} days.",
+        )
+    if date_to >= date_type.today():
+        return await run_db(db, fetch, date_from, date_to, department)
+
+    namespace = fetch.__name__
+    params = {"date_from": date_from, "date_to": date_to, "department": department}
+    params.update((table, data_versions.get(table)) for table in tables)
+    cached = stats_cache.get(namespace, params)
+    if cached is not None:
+        return cached
+    generation = stats_cache.generation(namespace)
+    result = await run_db(db, fetch, date_from, date_to, department)
+    stats_cache.set(namespace, params, result, generation)
+    return result
+
+
+@router.get(
+    "/stats/employees",
+    response_model=schemas.EmployeeStatsResponse,
+    dependencies=[Depends(conditional_get("attendance", "employees"))],
+    summary="Attendance rate per employee over a date range",
+)
+async def get_employee_stats(
+    response: Response,
+    date_from: date_type = StatsFrom,
+    date_to: date_type = StatsTo,
+    department: Optional[str] = StatsDepartment,
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Present / absent counts and attendance rate for every employee between
+    **date_from** and **date_to** (inclusive), optionally for one **department**.
+    - Employees without records in the range report zero counts and a null rate
+    """
+    employees = await _range_stats(
+        db, crud.get_employee_attendance_stats, date_from, date_to, department,
+        tables=("attendance_history", "employees"),
+    )
+    return trusted_json({"date_from": date_from, "date_to": date_to, "employees": employees}, response)
+
+
+@router.get(
+    "/stats/departments",
+    response_model=schemas.DepartmentStatsResponse,
+    dependencies=[Depends(conditional_get("attendance", "employees"))],
+    summary="Attendance rate per department over a date range",
+)
+async def get_department_stats(
+    response: Response,
+    date_from: date_type = StatsFrom,
+    date_to: date_type = StatsTo,
+    department: Optional[str] = StatsDepartment,
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Present / absent counts and attendance rate per department between
+    **date_from** and **date_to** (inclusive).
+    """
+    departments = await _range_stats(
+        db, crud.get_department_attendance_stats, date_from, date_to, department,
+        tables=("attendance_history",),
+    )
+    return trusted_json({"date_from": date_from, "date_to": date_to, "departments": departments}, response)
+
+
+@router.get(
+    "/stats/daily",
+    response_model=schemas.DailyStatsResponse,
+    dependencies=[Depends(conditional_get("attendance", "employees"))],
+    summary="Daily attendance rate over a date range",
+)
+async def get_daily_stats(
+    response: Response,
+    date_from: date_type = StatsFrom,
+    date_to: date_type = StatsTo,
+    department: Optional[str] = StatsDepartment,
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Daily present / absent counts and attendance rate between **date_from** and
+    **date_to** (inclusive), optionally for one **department**.
+    - Every calendar day in the range is present; days without records are zero-filled
+    """
+    days = await _range_stats(
+        db, crud.get_daily_attendance_stats, date_from, date_to, department,
+        tables=("attendance_history",),
+    )
+    return trusted_json({"date_from": date_from, "date_to": date_to, "days": days}, response)
 
 
 @router.get(
     "/{employee_id}",
     response_model=schemas.AttendanceListResponse,
+    dependencies=[Depends(conditional_get("attendance", "employees"))],
     summary="Get attendance records for a specific employee",
 )
-def get_employee_attendance(
+async def get_employee_attendance(
     employee_id: str,
+    response: Response,
     date: Optional[date_type] = Query(None, description="Filter by date (YYYY-MM-DD)"),
-    db: Session = Depends(get_db),
+    limit: int = PageLimit,
+    cursor: Optional[str] = PageCursor,
+    db: DbSession = Depends(get_read_db),
 ):
     """
     Retrieve attendance records for a specific employee.
     - **employee_id**: The string employee ID (e.g. 'EMP001')
     - Optionally filter by **date** query parameter
+    - Results are paginated; follow **next_cursor** until it is null
     """
-    employee = crud.get_employee_by_employee_id(db, employee_id)
+    employee = await run_db(db, crud.resolve_employee, employee_id)
     if not employee:
-        from fastapi import HTTPException
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail=f"Employee with ID '{employee_id}' not found.",
         )
 
-    records = crud.get_attendance_by_employee(db, employee.id, date_filter=date)
-    response_list = [_build_attendance_response(r, db) for r in records]
-    return schemas.AttendanceListResponse(total=len(response_list), records=response_list)
+    after = decode_cursor(cursor, date_type.fromisoformat) if cursor else None
+    records = await run_db(
+        db, crud.get_attendance_by_employee, employee.id, date_filter=date, limit=limit + 1, after=after
+    )
+    page, next_cursor = paginate(records, limit, key=lambda r: (r.date, r.id))
+    total = (
+        await run_db(db, crud.count_attendance, filter_date=date, employee_pk=employee.id)
+        if cursor is None
+        else None
+    )
+    return trusted_json(
+        {"total": total, "records": [_attendance_record(r) for r in page], "next_cursor": next_cursor}, response
+    )
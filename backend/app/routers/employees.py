@@ -1,51 +1,121 @@
 """
 Employee router: handles all /employees endpoints.
 """
-from fastapi import APIRouter, Depends, status
-from sqlalchemy.orm import Session
+import csv
+import datetime as dt
+import io
+import json
+from typing import Iterator, Optional
 
+from fastapi import APIRouter, Depends, File, HTTPException, Query, Response, UploadFile, status
+from fastapi.concurrency import run_in_threadpool
 from app import crud, schemas
-from app.database import get_db
+from app.database import DbSession, get_db, get_read_db, run_db
+from app.utils.cache import response_cache
+from app.utils.pagination import decode_cursor, page_limit, paginate
+from app.utils.responses import trusted_json
+from app.utils.versions import conditional_get
 
 router = APIRouter(prefix="/employees", tags=["Employees"])
 
 
+def _read_import_rows(upload: UploadFile) -> Iterator[dict]:
+    """
+    Helper: iterate the rows of an uploaded CSV, JSON array or NDJSON file.
+    CSV and NDJSON are read incrementally; a JSON array is parsed in one go.
+    """
+    name = (upload.filename or "").lower()
+    if name.endswith(".csv") or upload.content_type == "text/csv":
+        yield from csv.DictReader(io.TextIOWrapper(upload.file, encoding="utf-8-sig"))
+    elif name.endswith((".ndjson", ".jsonl")):
+        for line in io.TextIOWrapper(upload.file, encoding="utf-8"):
+            if line.strip():
+                yield json.loads(line)
+    elif name.endswith(".json") or upload.content_type == "application/json":
+        data = json.load(upload.file)
+        if not isinstance(data, list):
+            raise ValueError("JSON import must be an array of employee objects.")
+        yield from data
+    else:
+        raise ValueError("Unsupported file type. Upload a .csv, .json or .ndjson file.")
+
+
 @router.post(
     "/",
     response_model=schemas.EmployeeResponse,
     status_code=status.HTTP_201_CREATED,
     summary="Add a new employee",
 )
-def create_employee(payload: schemas.EmployeeCreate, db: Session = Depends(get_db)):
+async def create_employee(payload: schemas.EmployeeCreate, db: DbSession = Depends(get_db)):
     """
     Create a new employee record.
     - **employee_id**: Must be unique across all employees
     - **email**: Must be a valid email and unique
     - **full_name** and **department** are required
     """
-    employee = crud.create_employee(db, payload)
-    present_days = crud.get_present_days_count(db, employee.id)
-    result = schemas.EmployeeResponse.from_orm(employee)
-    result.total_present_days = present_days
-    return result
+    employee = await run_db(db, crud.create_employee, payload)
+    responses = await run_db(db, crud.build_employee_responses, [employee])
+    return responses[0]
+
+
+@router.post(
+    "/import",
+    response_model=schemas.EmployeeImportResponse,
+    status_code=status.HTTP_201_CREATED,
+    summary="Bulk import employees from a CSV or JSON file",
+)
+async def import_employees(response: Response, file: UploadFile = File(...), db: DbSession = Depends(get_db)):
+    """
+    Import many employees in a single transaction.
+    - **file**: .csv with an employee_id,full_name,email,department header,
+      a .json array of objects, or .ndjson with one object per line
+    - Invalid or duplicate rows are skipped and listed in **errors**; valid rows are imported
+    """
+    try:
+        result = await run_db(db, crud.import_employees, _read_import_rows(file))
+    except (ValueError, UnicodeDecodeError) as exc:
+        # Nothing was committed; closing the session discards the partial batches
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Could not read import file: {exc}",
+        )
+    # The error list can be as long as the file: encode it off the event loop
+    return await run_in_threadpool(trusted_json, result, response, status.HTTP_201_CREATED)
 
 
 @router.get(
     "/",
     response_model=schemas.EmployeeListResponse,
+    dependencies=[Depends(conditional_get("employees", "attendance"))],
     summary="Get all employees",
 )
-def list_employees(db: Session = Depends(get_db)):
-    """Retrieve a list of all employees with their total present day counts."""
-    employees = crud.get_all_employees(db)
-    response_list = []
-    for emp in employees:
-        present_days = crud.get_present_days_count(db, emp.id)
-        emp_resp = schemas.EmployeeResponse.from_orm(emp)
-        emp_resp.total_present_days = present_days
-        response_list.append(emp_resp)
+async def list_employees(
+    response: Response,
+    limit: int = Depends(page_limit),
+    cursor: Optional[str] = Query(None, description="Opaque cursor from a previous page's next_cursor"),
+    db: DbSession = Depends(get_read_db),
+):
+    """
+    Retrieve employees (newest first) with their total present day counts.
+    - Results are paginated; follow **next_cursor** until it is null
+    - **total** is only included on the first page
+    """
+    cache_params = {"limit": limit, "cursor": cursor}
+    cached = response_cache.get("employees", cache_params)
+    if cached is not None:
+        return trusted_json(cached, response)
 
-    return schemas.EmployeeListResponse(total=len(response_list), employees=response_list)
+    generation = response_cache.generation("employees")
+    after = decode_cursor(cursor, dt.datetime.fromisoformat) if cursor else None
+    employees = await run_db(db, crud.get_all_employees, limit=limit + 1, after=after)
+    page, next_cursor = paginate(employees, limit, key=lambda emp: (emp.created_at, emp.id))
+    response_list = await run_db(db, crud.build_employee_responses, page)
+    total = await run_db(db, crud.count_employees) if cursor is None else None
+    result = schemas.EmployeeListResponse.model_construct(
+        total=total, employees=response_list, next_cursor=next_cursor
+    )
+    response_cache.set("employees", cache_params, result, generation)
+    return trusted_json(result, response)
 
 
 @router.delete(
@@ -53,12 +123,10 @@ def list_employees(db: Session = Depends(get_db)):
     response_model=schemas.EmployeeResponse,
     summary="Delete an employee",
 )
-def delete_employee(employee_id: str, db: Session = Depends(get_db)):
+async def delete_employee(employee_id: str, db: DbSession = Depends(get_db)):
     """
     Delete an employee by their string employee_id.
     This also cascades and removes all related attendance records.
     """
-    employee = crud.delete_employee(db, employee_id)
-    result = schemas.EmployeeResponse.from_orm(employee)
-    result.total_present_days = 0
-    return result
+    employee = await run_db(db, crud.delete_employee, employee_id)
+    return schemas.EmployeeResponse.model_validate(employee)  # total_present_days defaults to 0
@@ -32,8 +32,23 @@ class EmployeeResponse(EmployeeBase):
 
 class EmployeeListResponse(BaseModel):
     """Schema for paginated employee list."""
-    total: int
+    total: Optional[int] = None     # Only computed for the first page
     employees: list[EmployeeResponse]
+    next_cursor: Optional[str] = None
+
+
+class EmployeeImportError(BaseModel):
+    row: int                      # 1-based data row number in the uploaded file
+    employee_id: Optional[str] = None
+    detail: str
+
+
+class EmployeeImportResponse(BaseModel):
+    """Schema for the result of a bulk employee import."""
+    total_rows: int
+    imported: int
+    failed: int
+    errors: list[EmployeeImportError]
 
 
 # ─────────────────────────── Attendance Schemas ──────────────────────────── #
@@ -65,8 +80,68 @@ class AttendanceResponse(BaseModel):
 
 
 class AttendanceListResponse(BaseModel):
-    total: int
+    total: Optional[int] = None     # Only computed for the first page
     records: list[AttendanceResponse]
+    next_cursor: Optional[str] = None
+
+
+class AttendanceBulkCreate(BaseModel):
+    """Schema for marking attendance for many employees in one request."""
+    records: list[AttendanceCreate] = Field(..., min_length=1, max_length=50_000)
+
+
+class AttendanceBulkItemResult(BaseModel):
+    index: int                    # Position of the item in the request
+    employee_id: str
+    date: dt.date
+    result: Literal["created", "duplicate", "unknown_employee"]
+
+
+class AttendanceBulkResponse(BaseModel):
+    created: int
+    duplicates: int
+    unknown_employees: int
+    results: list[AttendanceBulkItemResult]
+
+
+# ───────────────────────── Attendance Stats Schemas ─────────────────────── #
+
+class AttendanceRate(BaseModel):
+    present: int
+    absent: int
+    attendance_rate: Optional[float] = None     # present / (present + absent); None without records
+
+
+class EmployeeAttendanceStats(AttendanceRate):
+    employee_id: str
+    full_name: str
+    department: str
+
+
+class DepartmentAttendanceStats(AttendanceRate):
+    department: str
+
+
+class DailyAttendanceStats(AttendanceRate):
+    date: dt.date
+
+
+class EmployeeStatsResponse(BaseModel):
+    date_from: dt.date
+    date_to: dt.date
+    employees: list[EmployeeAttendanceStats]
+
+
+class DepartmentStatsResponse(BaseModel):
+    date_from: dt.date
+    date_to: dt.date
+    departments: list[DepartmentAttendanceStats]
+
+
+class DailyStatsResponse(BaseModel):
+    date_from: dt.date
+    date_to: dt.date
+    days: list[DailyAttendanceStats]    # One entry per calendar day, zero-filled
 
 
 # ─────────────────────────── Dashboard Schemas ──────────────────────────── #
@@ -0,0 +1,136 @@
+"""
+In-process response cache with TTL expiry, LRU eviction and namespace invalidation.
+
+Entries are precomputed response objects keyed by (namespace, query params).
+Write paths in crud invalidate whole namespaces (e.g. "dashboard") after commit.
+Each namespace carries a generation counter so a response computed before an
+invalidation can never be stored after it.
+
+employee_cache maps employee_id strings to (pk, full_name, department) for the
+attendance hot paths (see crud.resolve_employee). Misses are never cached.
+create_employee / delete_employee discard their key.
+
+stats_cache memoizes /attendance/stats results for past date ranges. Those
+entries are never invalidated; callers put the relevant data versions in the
+key instead, so a write to past attendance simply makes old keys unreachable.
+The versions only count this process's writes, so with several workers the
+TTL (STATS_CACHE_TTL_SECONDS) is what bounds staleness.
+"""
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+from app.core.config import settings
+from app.utils.replicas import lagging_read
+
+CacheKey = tuple[str, tuple]
+
+
+class ResponseCache:
+    """Thread-safe TTL + LRU cache of precomputed response objects."""
+
+    def __init__(self, max_entries: int, ttl_seconds: float, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.enabled = enabled
+        self._entries: OrderedDict[CacheKey, tuple[float, Any]] = OrderedDict()
+        self._generations: dict[str, int] = {}
+        self._lock = threading.Lock()
+        self.hits = self.misses = self.evictions = self.invalidations = 0
+
+    @staticmethod
+    def _key(namespace: str, params: dict[str, Hashable]) -> CacheKey:
+        return namespace, tuple(sorted(params.items()))
+
+    def get(self, namespace: str, params: dict[str, Hashable]) -> Optional[Any]:
+        """Return the cached value, or None on a miss or expired entry."""
+        if not self.enabled:
+            return None
+        key = self._key(namespace, params)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[0] < time.monotonic():
+                if entry is not None:
+                    del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry[1]
+
+    def generation(self, namespace: str) -> int:
+        """Current generation of a namespace; read it before computing a value to cache."""
+        with self._lock:
+            return self._generations.get(namespace, 0)
+
+    def set(self, namespace: str, params: dict[str, Hashable], value: Any, generation: int) -> None:
+        """
+        Store a value computed while the namespace was at `generation`.
+        Dropped silently if the namespace was invalidated in the meantime, or if
+        it was read from a replica that may lag a recent write.
+        """
+        if not self.enabled or lagging_read():
+            return
+        key = self._key(namespace, params)
+        with self._lock:
+            if self._generations.get(namespace, 0) != generation:
+                return
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, *namespaces: str) -> None:
+        """Drop every entry in the given namespaces."""
+        with self._lock:
+            for namespace in namespaces:
+                self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            stale = [key for key in self._entries if key[0] in namespaces]
+            for key in stale:
+                del self._entries[key]
+            self.invalidations += len(stale)
+
+    def discard(self, namespace: str, params: dict[str, Hashable]) -> None:
+        """Drop one entry; values computed before the call can no longer be stored."""
+        key = self._key(namespace, params)
+        with self._lock:
+            self._generations[namespace] = self._generations.get(namespace, 0) + 1
+            if self._entries.pop(key, None) is not None:
+                self.invalidations += 1
+
+    def stats(self) -> dict[str, Any]:
+        """Return hit/miss counters and current occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+response_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
+
+stats_cache = ResponseCache(
+    max_entries=settings.CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.STATS_CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
+
+employee_cache = ResponseCache(
+    max_entries=settings.EMPLOYEE_CACHE_MAX_ENTRIES,
+    ttl_seconds=settings.EMPLOYEE_CACHE_TTL_SECONDS,
+    enabled=settings.CACHE_ENABLED,
+)
@@ -0,0 +1,220 @@
+"""
+Response compression (brotli / gzip) negotiated from Accept-Encoding.
+
+- Complete bodies smaller than minimum_size are sent as-is.
+- Streamed bodies (StreamingResponse, e.g. /attendance/export) are compressed
+  chunk by chunk with a sync flush after each chunk. Nothing is buffered, and
+  each chunk reaches the client as soon as the app yields it.
+- Responses that already carry Content-Encoding or whose media type is excluded
+  (text/event-stream by default) are never touched.
+- A compressed response gets Vary: Accept-Encoding. Its ETag is weakened
+  (W/"..."), because the bytes differ from the identity representation.
+  304s sent to clients that negotiated a coding carry the same weak tag.
+  conditional_get compares weakly, so either form revalidates.
+
+Brotli needs the `brotli` package (or `brotlicffi`). Without it only gzip is
+offered.
+"""
+import zlib
+from typing import Optional, Protocol
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - depends on the environment
+    try:
+        import brotlicffi as brotli
+    except ImportError:
+        brotli = None
+
+
+class Compressor(Protocol):
+    def compress(self, data: bytes) -> bytes: ...
+    def flush(self) -> bytes: ...
+    def finish(self) -> bytes: ...
+
+
+class _Gzip:
+    def __init__(self, level: int):
+        # wbits 16 + MAX_WBITS writes the gzip header and trailer
+        self._zlib = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._zlib.compress(data)
+
+    def flush(self) -> bytes:
+        return self._zlib.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._zlib.flush(zlib.Z_FINISH)
+
+
+class _Brotli:
+    def __init__(self, quality: int):
+        self._brotli = brotli.Compressor(quality=quality)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._brotli.process(data)
+
+    def flush(self) -> bytes:
+        return self._brotli.flush()
+
+    def finish(self) -> bytes:
+        return self._brotli.finish()
+
+
+def available_encodings() -> tuple[str, ...]:
+    """Content codings this process can produce."""
+    return ("br", "gzip") if brotli is not None else ("gzip",)
+
+
+def make_compressor(encoding: str, level: int) -> Compressor:
+    """Streaming compressor for `encoding` ("br" quality 0-11 or "gzip" level 1-9)."""
+    if encoding == "br":
+        return _Brotli(level)
+    if encoding == "gzip":
+        return _Gzip(level)
+    raise ValueError(f"Unsupported content coding: {encoding}")
+
+
+def negotiate(accept_encoding: str, offered: tuple[str, ...]) -> Optional[str]:
+    """
+    Pick a coding from `offered` (in server preference order) for an
+    Accept-Encoding header value. Highest q wins; ties go to the server's
+    order. q=0 refuses a coding, and `*` stands for any coding not listed.
+    """
+    qualities: dict[str, float] = {}
+    for item in accept_encoding.lower().split(","):
+        coding, _, params = item.strip().partition(";")
+        if not coding:
+            continue
+        q = 1.0
+        for param in params.split(";"):
+            name, _, value = param.strip().partition("=")
+            if name == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        qualities[coding.strip()] = q
+
+    wildcard = qualities.get("*", 0.0)
+    best, best_q = None, 0.0
+    for coding in offered:
+        q = qualities.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def _weaken_etag(headers: MutableHeaders) -> None:
+    etag = headers.get("etag")
+    if etag and not etag.startswith("W/"):
+        headers["ETag"] = f"W/{etag}"
+
+
+class CompressionMiddleware:
+    """
+    Pure ASGI middleware compressing HTTP responses with the best coding the
+    client accepts. `encodings` lists the codings to offer, most preferred
+    first; codings this process cannot produce are dropped.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: tuple[str, ...] = ("br", "gzip"),
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+        excluded_media_types: tuple[str, ...] = ("text/event-stream",),
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encodings = tuple(e for e in encodings if e in available_encodings())
+        self.levels = {"gzip": gzip_level, "br": brotli_quality}
+        self.excluded_media_types = excluded_media_types
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.encodings)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+        responder = _CompressingResponder(send, encoding, self.levels[encoding], self)
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressingResponder:
+    """Per-request send() wrapper; holds the start message until the first body chunk decides."""
+
+    def __init__(self, send: Send, encoding: str, level: int, middleware: CompressionMiddleware):
+        self._send = send
+        self._encoding = encoding
+        self._level = level
+        self._middleware = middleware
+        self._start: Optional[Message] = None
+        self._compressor: Optional[Compressor] = None
+        self._passthrough = False
+
+    def _eligible(self, start: Message) -> bool:
+        headers = Headers(raw=start["headers"])
+        if "content-encoding" in headers or start["status"] in (204, 304):
+            return False
+        media_type = headers.get("content-type", "").split(";")[0].strip()
+        return media_type not in self._middleware.excluded_media_types
+
+    def _compressed_start(self, content_length: Optional[int]) -> Message:
+        headers = MutableHeaders(scope=self._start)
+        headers["Content-Encoding"] = self._encoding
+        headers.add_vary_header("Accept-Encoding")
+        _weaken_etag(headers)
+        if content_length is None:
+            del headers["Content-Length"]
+        else:
+            headers["Content-Length"] = str(content_length)
+        return self._start
+
+    async def send(self, message: Message) -> None:
+        if message["type"] == "http.response.start":
+            self._start = message
+            self._passthrough = not self._eligible(message)
+            if self._passthrough:
+                if message["status"] == 304:
+                    # Revalidates a compressed 200, so it must carry the same weak tag
+                    _weaken_etag(MutableHeaders(scope=message))
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self._compressor is None:
+            if not more_body:
+                # Complete body in one message: compress only past the threshold
+                if len(body) < self._middleware.minimum_size:
+                    self._passthrough = True
+                    await self._send(self._start)
+                    await self._send(message)
+                    return
+                compressor = make_compressor(self._encoding, self._level)
+                compressed = compressor.compress(body) + compressor.finish()
+                await self._send(self._compressed_start(len(compressed)))
+                await self._send({"type": "http.response.body", "body": compressed})
+                return
+            # Streamed body: length unknown, compress incrementally
+            self._compressor = make_compressor(self._encoding, self._level)
+            await self._send(self._compressed_start(None))
+
+        if more_body:
+            chunk = self._compressor.compress(body) + self._compressor.flush() if body else b""
+        else:
+            chunk = self._compressor.compress(body) + self._compressor.finish()
+        await self._send({"type": "http.response.body", "body": chunk, "more_body": more_body})
@@ -0,0 +1,138 @@
+"""
+In-process pub/sub fan-out for server-sent events (/dashboard/stream).
+
+Broadcaster keeps the last `backlog` events in a ring, each encoded once as a
+ready-to-send SSE frame, and wakes every waiting subscriber through one shared
+future. A subscriber is only a sequence number, so thousands of idle streams
+cost one generator each and no per-connection queue. A subscriber that falls
+more than `backlog` events behind is told to resync instead.
+
+publish() may be called from any thread (crud runs on the threadpool); the
+frame is encoded there and handed to the event loop with call_soon_threadsafe.
+With no subscriber connected it does nothing.
+
+Every event carries an id (the SSE `id:` field), so a snapshot can say which
+events it already reflects. Writers wrap their commit and publish in
+writing(); version() is the id of the last event sent, or None while a write
+is between the two, so a snapshot read while version() stays put covers
+exactly the events up to it.
+"""
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager
+from itertools import islice
+from typing import Any, Iterator, Optional
+
+from app.core.config import settings
+from app.utils.responses import dumps
+
+# Stands in for a frame when subscribers must reload the full snapshot
+RESYNC = b""
+
+
+def sse_frame(event: str, data: Any, event_id: Optional[int] = None) -> bytes:
+    """One SSE message: `event: <name>` plus its JSON payload, and `id: <event_id>` when given."""
+    frame = b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+    return frame if event_id is None else b"id: %d\n" % event_id + frame
+
+
+class Broadcaster:
+    """Single-loop fan-out of encoded frames to any number of subscribers."""
+
+    def __init__(self, backlog: int):
+        self._frames: deque[tuple[int, bytes]] = deque(maxlen=backlog)
+        self._seq = 0
+        self._lock = threading.Lock()
+        self._last_id = 0
+        self._writing = 0
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._wakeup: Optional[asyncio.Future] = None
+        self.subscribers = 0
+
+    def subscribe(self) -> int:
+        """Register a subscriber on the running loop; returns its starting cursor."""
+        loop = asyncio.get_running_loop()
+        if loop is not self._loop:  # First subscriber, or the app moved to a new loop
+            self._loop, self._wakeup = loop, None
+        self.subscribers += 1
+        return self._seq
+
+    def unsubscribe(self) -> None:
+        self.subscribers -= 1
+
+    def cursor(self) -> int:
+        return self._seq
+
+    @contextmanager
+    def writing(self) -> Iterator[None]:
+        """Wrap a write's commit and the publish/resync that follows it. Thread-safe."""
+        with self._lock:
+            self._writing += 1
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._writing -= 1
+
+    def version(self) -> Optional[int]:
+        """Id of the last event sent, or None while a write is between its commit and its publish."""
+        with self._lock:
+            return None if self._writing else self._last_id
+
+    def publish(self, event: str, data: Any) -> None:
+        """Send an event to every subscriber. Thread-safe."""
+        self._send(sse_frame(event, data))
+
+    def resync(self) -> None:
+        """Tell every subscriber to reload the full snapshot. Thread-safe."""
+        self._send(RESYNC)
+
+    def _send(self, frame: bytes) -> None:
+        loop = self._loop
+        if loop is None or not self.subscribers:
+            return
+        with self._lock:
+            self._last_id += 1
+            event_id = self._last_id
+        if frame is not RESYNC:
+            frame = b"id: %d\n" % event_id + frame
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            self._append(event_id, frame)
+            return
+        try:
+            loop.call_soon_threadsafe(self._append, event_id, frame)
+        except RuntimeError:  # Loop already closed
+            pass
+
+    def _append(self, event_id: int, frame: bytes) -> None:
+        self._seq += 1
+        self._frames.append((event_id, frame))
+        wakeup, self._wakeup = self._wakeup, None
+        if wakeup is not None and not wakeup.done():
+            wakeup.set_result(None)
+
+    async def wait(self, cursor: int, timeout: float) -> tuple[Optional[list[tuple[int, bytes]]], int]:
+        """
+        (event_id, frame) pairs published after `cursor`, waiting up to `timeout`
+        seconds for the first one. Returns (frames, new_cursor); frames is empty
+        on timeout and None when the cursor fell out of the backlog. Frames from
+        different threads may arrive slightly out of id order.
+        """
+        if self._seq == cursor:
+            if self._wakeup is None:
+                self._wakeup = self._loop.create_future()
+            await asyncio.wait((self._wakeup,), timeout=timeout)
+        missed = self._seq - cursor
+        if missed > len(self._frames):
+            return None, self._seq
+        frames = list(islice(reversed(self._frames), missed))
+        frames.reverse()
+        return frames, self._seq
+
+
+dashboard_events = Broadcaster(settings.DASHBOARD_STREAM_BACKLOG)
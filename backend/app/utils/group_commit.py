@@ -0,0 +1,87 @@
+"""
+Group commit: batch concurrent single-item writes into one transaction.
+
+Requests call GroupCommitter.submit(item) and await their own item's result.
+One background task per event loop takes the first queued item, keeps
+collecting until max_batch items or max_delay seconds, then hands the whole
+batch to `flush`. While a flush runs, new items queue up for the next batch,
+so batches grow with load and an idle server adds at most max_delay latency.
+
+`flush(items)` returns one outcome per item, in order: a result, or an
+exception instance to raise in that item's request. If flush itself raises,
+every item in the batch gets that exception.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Optional
+
+
+class GroupCommitter:
+    """Queue + single background flusher; one instance per write path."""
+
+    def __init__(self, flush: Callable[[list], Awaitable[list]], max_batch: int, max_delay: float):
+        self.flush = flush
+        self.max_batch = max_batch
+        self.max_delay = max_delay
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.batches = self.items = 0
+
+    async def submit(self, item: Any) -> Any:
+        """Enqueue item and wait for its outcome; exceptions are re-raised here."""
+        loop = asyncio.get_running_loop()
+        if self._task is None or self._task.done() or loop is not self._loop:
+            self._loop, self._queue = loop, asyncio.Queue()
+            self._task = loop.create_task(self._run())
+        future = loop.create_future()
+        self._queue.put_nowait((item, future))
+        return await future
+
+    async def close(self) -> None:
+        """Flush everything already queued, then stop the background task."""
+        if self._task is None or self._task.done():
+            return
+        await self._queue.join()
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
+
+    async def _run(self) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch:
+                if not self._queue.empty():
+                    batch.append(self._queue.get_nowait())
+                    continue
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except TimeoutError:
+                    break
+            try:
+                await self._flush_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def _flush_batch(self, batch: list[tuple[Any, asyncio.Future]]) -> None:
+        self.batches += 1
+        self.items += len(batch)
+        try:
+            outcomes = await self.flush([item for item, _ in batch])
+        except Exception as exc:
+            outcomes = [exc] * len(batch)
+        for (_, future), outcome in zip(batch, outcomes):
+            if future.done():  # The request was cancelled; its write still went through
+                continue
+            if isinstance(outcome, BaseException):
+                future.set_exception(outcome)
+            else:
+                future.set_result(outcome)
@@ -0,0 +1,208 @@
+"""
+Request, query and connection-pool instrumentation rendered as Prometheus text.
+
+MetricsMiddleware opens a RequestStats in a contextvar for every HTTP request and
+records per-route latency when the request finishes. instrument_engine() hooks
+before/after_cursor_execute on an engine and adds every statement to the current
+request's stats. Context variables are copied into the threadpool and into
+AsyncSession.run_sync, so crud code needs no changes to be counted.
+
+All series live in process memory; with several workers, scrape each worker.
+"""
+import threading
+import time
+from contextvars import ContextVar
+from dataclasses import dataclass
+from typing import Iterable, Optional
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100, 250)
+
+
+def _format_labels(pairs: Iterable[tuple[str, str]]) -> str:
+    """Render {name="value",...}, escaping backslashes, quotes and newlines."""
+    body = ",".join(
+        '{}="{}"'.format(name, value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    )
+    return "{" + body + "}" if body else ""
+
+
+class Histogram:
+    """Thread-safe cumulative histogram with a fixed label set."""
+
+    def __init__(self, name: str, help_text: str, label_names: tuple[str, ...] = (), buckets=LATENCY_BUCKETS):
+        self.name = name
+        self.help_text = help_text
+        self.label_names = label_names
+        self.buckets = tuple(buckets)
+        # label values -> [per-bucket counts, sum, count]
+        self._series: dict[tuple[str, ...], list] = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, *labels: str) -> None:
+        with self._lock:
+            series = self._series.get(labels)
+            if series is None:
+                series = self._series[labels] = [[0] * len(self.buckets), 0.0, 0]
+            counts = series[0]
+            for index, bound in enumerate(self.buckets):
+                if value <= bound:
+                    counts[index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> list[str]:
+        lines = [f"# HELP {self.name} {self.help_text}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            snapshot = sorted((labels, list(counts), total, n) for labels, (counts, total, n) in self._series.items())
+        for labels, counts, total, n in snapshot:
+            pairs = list(zip(self.label_names, labels))
+            for bound, count in zip(self.buckets, counts):
+                lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', repr(float(bound)))])} {count}")
+            lines.append(f"{self.name}_bucket{_format_labels(pairs + [('le', '+Inf')])} {n}")
+            lines.append(f"{self.name}_sum{_format_labels(pairs)} {total}")
+            lines.append(f"{self.name}_count{_format_labels(pairs)} {n}")
+        return lines
+
+
+REQUEST_SECONDS = Histogram(
+    "hrms_http_request_duration_seconds", "HTTP request latency by route.", ("method", "route", "status")
+)
+REQUEST_DB_QUERIES = Histogram(
+    "hrms_http_request_db_queries", "SQL statements executed per HTTP request.", ("method", "route"), COUNT_BUCKETS
+)
+REQUEST_DB_SECONDS = Histogram(
+    "hrms_http_request_db_seconds", "Time spent executing SQL per HTTP request.", ("method", "route")
+)
+QUERY_SECONDS = Histogram("hrms_db_query_duration_seconds", "SQL statement execution time.", ("engine",), QUERY_BUCKETS)
+POOL_CHECKOUT_SECONDS = Histogram(
+    "hrms_db_pool_checkout_seconds",
+    "Time to obtain a pooled connection, including queue wait and pre-ping.",
+    ("engine",),
+    QUERY_BUCKETS,
+)
+
+
+@dataclass
+class RequestStats:
+    """SQL activity of one HTTP request."""
+    queries: int = 0
+    db_seconds: float = 0.0
+
+
+_request_stats: ContextVar[Optional[RequestStats]] = ContextVar("request_stats", default=None)
+
+_engines: dict[str, Engine] = {}
+
+
+def current_request_stats() -> Optional[RequestStats]:
+    """The RequestStats of the request being served, or None outside a request."""
+    return _request_stats.get()
+
+
+def instrument_engine(engine: Engine, name: str) -> None:
+    """
+    Time every statement executed through `engine` and every pool checkout,
+    and report the engine's pool occupancy under engine="<name>".
+    Pass AsyncEngine.sync_engine for async engines.
+    """
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        context._metrics_started = time.perf_counter()
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        elapsed = time.perf_counter() - context._metrics_started
+        QUERY_SECONDS.observe(elapsed, name)
+        stats = _request_stats.get()
+        if stats is not None:
+            stats.queries += 1
+            stats.db_seconds += elapsed
+
+    # Pools have no "checkout requested" event, so time Pool.connect itself
+    pool_connect = engine.pool.connect
+
+    def timed_connect():
+        started = time.perf_counter()
+        try:
+            return pool_connect()
+        finally:
+            POOL_CHECKOUT_SECONDS.observe(time.perf_counter() - started, name)
+
+    engine.pool.connect = timed_connect
+    _engines[name] = engine
+
+
+def _pool_gauges() -> list[str]:
+    gauges = {
+        "hrms_db_pool_size": ("Configured persistent connections.", lambda p: p.size()),
+        "hrms_db_pool_checked_out": ("Connections currently checked out.", lambda p: p.checkedout()),
+        "hrms_db_pool_checked_in": ("Idle connections held by the pool.", lambda p: p.checkedin()),
+        "hrms_db_pool_overflow": ("Open connections beyond pool_size.", lambda p: max(p.overflow(), 0)),
+    }
+    # Only QueuePool-style pools expose occupancy (not StaticPool / NullPool)
+    pools = {name: engine.pool for name, engine in _engines.items() if hasattr(engine.pool, "checkedout")}
+    lines = []
+    for metric, (help_text, read) in gauges.items():
+        lines += [f"# HELP {metric} {help_text}", f"# TYPE {metric} gauge"]
+        lines += [f"{metric}{_format_labels([('engine', name)])} {read(pool)}" for name, pool in pools.items()]
+    return lines
+
+
+def render_metrics() -> str:
+    """All metrics in Prometheus text exposition format (version 0.0.4)."""
+    lines = []
+    for histogram in (REQUEST_SECONDS, REQUEST_DB_QUERIES, REQUEST_DB_SECONDS, QUERY_SECONDS, POOL_CHECKOUT_SECONDS):
+        lines += histogram.render()
+    lines += _pool_gauges()
+    return "\n".join(lines) + "\n"
+
+
+class MetricsMiddleware:
+    """
+    Pure ASGI middleware recording latency and SQL activity per route template
+    (e.g. /attendance/{employee_id}). With debug_headers it also adds
+    X-DB-Query-Count and X-DB-Time-Ms to every response.
+    """
+
+    def __init__(self, app: ASGIApp, debug_headers: bool = False):
+        self.app = app
+        self.debug_headers = debug_headers
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = RequestStats()
+        token = _request_stats.set(stats)
+        started = time.perf_counter()
+        status_code = 500
+
+        async def send_with_stats(message: Message) -> None:
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                if self.debug_headers:
+                    headers = MutableHeaders(scope=message)
+                    headers["X-DB-Query-Count"] = str(stats.queries)
+                    headers["X-DB-Time-Ms"] = f"{stats.db_seconds * 1000:.2f}"
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_stats)
+        finally:
+            _request_stats.reset(token)
+            # Unmatched paths share one series so 404 probes cannot explode cardinality
+            route = getattr(scope.get("route"), "path", "<unmatched>")
+            REQUEST_SECONDS.observe(time.perf_counter() - started, scope["method"], route, str(status_code))
+            REQUEST_DB_QUERIES.observe(stats.queries, scope["method"], route)
+            REQUEST_DB_SECONDS.observe(stats.db_seconds, scope["method"], route)
@@ -0,0 +1,70 @@
+"""
+Keyset (cursor) pagination helpers.
+
+A cursor is an opaque, URL-safe token encoding the sort key and primary key of
+the last row on the previous page. The next page is fetched with a
+"strictly after this (sort_key, id)" predicate, so query cost stays flat no
+matter how deep the client pages, unlike OFFSET.
+
+Page sizes above MAX_PAGE_SIZE are clamped rather than rejected, so a client
+built against a larger cap keeps working (with more pages) when it is lowered.
+"""
+import base64
+import datetime as dt
+import json
+from typing import Callable, Optional, Sequence, TypeVar
+
+from fastapi import HTTPException, Query, status
+
+from app.core.config import settings
+
+T = TypeVar("T")
+SortKey = TypeVar("SortKey", dt.date, dt.datetime)
+
+
+def page_limit(
+    limit: int = Query(
+        settings.DEFAULT_PAGE_SIZE, ge=1, description="Page size; values above MAX_PAGE_SIZE are capped"
+    ),
+) -> int:
+    """
+    Dependency: the requested page size, clamped to settings.MAX_PAGE_SIZE.
+    Usage: limit: int = Depends(page_limit)
+    """
+    return min(limit, settings.MAX_PAGE_SIZE)
+
+
+def encode_cursor(sort_value: dt.date, row_id: int) -> str:
+    """Encode (sort_value, row_id) into an opaque URL-safe cursor string."""
+    raw = json.dumps([sort_value.isoformat(), row_id], separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, parse: Callable[[str], SortKey]) -> tuple[SortKey, int]:
+    """
+    Decode a cursor produced by encode_cursor.
+    `parse` converts the ISO sort value back (e.g. dt.date.fromisoformat).
+    Raises 400 if the cursor is malformed.
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        sort_value, row_id = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return parse(sort_value), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Invalid pagination cursor.",
+        )
+
+
+def paginate(
+    rows: Sequence[T], limit: int, key: Callable[[T], tuple[dt.date, int]]
+) -> tuple[Sequence[T], Optional[str]]:
+    """
+    Split rows fetched with `limit + 1` into (page, next_cursor).
+    next_cursor is None when there are no further rows.
+    """
+    if len(rows) <= limit:
+        return rows, None
+    page = rows[:limit]
+    return page, encode_cursor(*key(page[-1]))
@@ -0,0 +1,152 @@
+"""
+Read-replica routing state: replica rotation, failover and read-your-writes.
+
+- ReplicaPool hands out replica engines round-robin. A replica that fails to
+  connect (or disconnects mid-query) is taken out of rotation for
+  retry_seconds. The first read after that acts as its health probe. With no
+  healthy replica left, reads go to the primary.
+- ReadYourWritesMiddleware marks every successful write with a short-lived
+  cookie and a PRIMARY_HEADER response header carrying the same deadline.
+  While a request carries either one, unexpired, that client's reads go to
+  the primary, so it never reads a replica that has not caught up with its
+  own write yet. The cookie covers same-site clients; a cross-origin SPA
+  (whose XHRs do not send SameSite=Lax cookies) echoes the header instead.
+- note_write() records the last write committed by this process. For the same
+  window afterwards, replica reads are flagged as possibly lagging. Such a
+  read drops its ETag and is not stored in the response caches, so a stale
+  replica result is never cached under the version the write produced.
+
+Engine-agnostic: works with sync Engines and AsyncEngines alike.
+"""
+import itertools
+import threading
+import time
+from contextvars import ContextVar
+from http.cookies import SimpleCookie
+from typing import Any, Sequence
+
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+PRIMARY_COOKIE = "hrms_primary_until"
+PRIMARY_HEADER = "X-Primary-Until"
+SAFE_METHODS = frozenset({"GET", "HEAD", "OPTIONS"})
+
+_prefer_primary: ContextVar[bool] = ContextVar("prefer_primary", default=False)
+_lagging_read: ContextVar[bool] = ContextVar("lagging_read", default=False)
+_last_write = 0.0
+
+
+class ReplicaPool:
+    """Thread-safe round-robin over replica engines, skipping ones that recently failed."""
+
+    def __init__(self, engines: Sequence[Any], retry_seconds: float):
+        self.engines = list(engines)
+        self.retry_seconds = retry_seconds
+        self._down_until: dict[int, float] = {}
+        self._counter = itertools.count()
+        self._lock = threading.Lock()
+
+    def candidates(self) -> list[Any]:
+        """Healthy replicas in the order to try them, starting at the next one in rotation."""
+        if not self.engines:
+            return []
+        start = next(self._counter) % len(self.engines)
+        rotated = self.engines[start:] + self.engines[:start]
+        now = time.monotonic()
+        with self._lock:
+            return [engine for engine in rotated if self._down_until.get(id(engine), 0.0) <= now]
+
+    def mark_down(self, engine: Any) -> None:
+        """Take a replica out of rotation for retry_seconds."""
+        with self._lock:
+            self._down_until[id(engine)] = time.monotonic() + self.retry_seconds
+
+    def healthy_count(self) -> int:
+        now = time.monotonic()
+        with self._lock:
+            return sum(self._down_until.get(id(engine), 0.0) <= now for engine in self.engines)
+
+
+def note_write() -> None:
+    """Record that this process just committed a write."""
+    global _last_write
+    _last_write = time.monotonic()
+
+
+def recently_written(window_seconds: float) -> bool:
+    """Whether this process committed a write within the last window_seconds."""
+    return time.monotonic() - _last_write < window_seconds
+
+
+def prefers_primary() -> bool:
+    """True while the current request's client is inside its read-your-writes window."""
+    return _prefer_primary.get()
+
+
+def flag_lagging_read() -> None:
+    """Mark the current request as served by a replica that may lag a recent write."""
+    _lagging_read.set(True)
+
+
+def lagging_read() -> bool:
+    return _lagging_read.get()
+
+
+class ReadYourWritesMiddleware:
+    """
+    Pure ASGI middleware: sets PRIMARY_COOKIE and PRIMARY_HEADER on successful
+    non-GET responses and routes requests carrying either one, unexpired, to
+    the primary. A deadline further out than window_seconds is ignored, so a
+    client cannot pin itself to the primary.
+    """
+
+    def __init__(self, app: ASGIApp, window_seconds: float):
+        self.app = app
+        self.window_seconds = window_seconds
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        _prefer_primary.set(_marker_valid(scope, self.window_seconds))
+        _lagging_read.set(False)
+        if scope["method"] in SAFE_METHODS:
+            await self.app(scope, receive, send)
+            return
+
+        async def send_with_marker(message: Message) -> None:
+            if message["type"] == "http.response.start" and message["status"] < 400:
+                until = time.time() + self.window_seconds
+                max_age = max(1, round(self.window_seconds))
+                headers = MutableHeaders(scope=message)
+                headers.append(
+                    "Set-Cookie",
+                    f"{PRIMARY_COOKIE}={until:.3f}; Max-Age={max_age}; Path=/; HttpOnly; SameSite=Lax",
+                )
+                headers[PRIMARY_HEADER] = f"{until:.3f}"
+            await send(message)
+
+        await self.app(scope, receive, send_with_marker)
+
+
+def _marker_valid(scope: Scope, window_seconds: float) -> bool:
+    """Whether the request carries a PRIMARY_HEADER or PRIMARY_COOKIE deadline that has not passed yet."""
+    header_name = PRIMARY_HEADER.lower().encode("latin-1")
+    values = []
+    for name, value in scope["headers"]:
+        if name == header_name:
+            values.append(value.decode("latin-1"))
+        elif name == b"cookie":
+            morsel = SimpleCookie(value.decode("latin-1")).get(PRIMARY_COOKIE)
+            if morsel is not None:
+                values.append(morsel.value)
+    now = time.time()
+    for value in values:
+        try:
+            if now < float(value) <= now + window_seconds:
+                return True
+        except ValueError:
+            continue
+    return False
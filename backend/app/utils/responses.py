@@ -0,0 +1,44 @@
+"""
+orjson-backed JSON responses.
+
+ORJSONResponse is the app's default_response_class. Read-heavy endpoints also
+return it directly through trusted_json() with content built from database
+rows (row dicts or model_construct'ed schemas): returning a Response skips
+FastAPI's response_model re-validation and jsonable_encoder pass, while the
+route's response_model still documents the shape in OpenAPI.
+"""
+from typing import Any
+
+import orjson
+from fastapi import Response
+from pydantic import BaseModel
+from starlette.responses import JSONResponse
+
+
+def _default(value: Any) -> Any:
+    """orjson fallback for types it does not encode natively."""
+    if isinstance(value, BaseModel):
+        return value.model_dump()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Encode content with orjson; Pydantic models are dumped without validation."""
+    return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+class ORJSONResponse(JSONResponse):
+    """JSONResponse rendered with orjson; also accepts Pydantic models (dumped without validation)."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+def trusted_json(content: Any, response: Response, status_code: int = 200) -> ORJSONResponse:
+    """
+    Render content that came from the database as-is.
+    Carries over headers that dependencies set on the request's `response`
+    (e.g. the ETag from conditional_get), which FastAPI drops when a handler
+    returns its own Response.
+    """
+    return ORJSONResponse(content, status_code=status_code, headers=dict(response.headers))
@@ -0,0 +1,90 @@
+"""
+Per-table data version counters and conditional GET (ETag / If-None-Match) support.
+
+crud write paths bump the counter of every table they modify after commit.
+GET endpoints derive a strong ETag from the counters of the tables they read,
+so an unchanged poll is answered with 304 before any database work or
+serialization happens.
+
+Counters live in process memory and only count this worker's writes. Each
+process also gets a random epoch baked into its ETags, so tags never survive a
+restart. Every tag also carries the time it was issued and stops matching
+CACHE_TTL_SECONDS later, the same bound as the response cache: a worker that
+did not serve a write made through another worker answers 304 (or serves its
+cached copy) for at most that long.
+"""
+import secrets
+import threading
+import time
+from typing import Callable, Optional
+
+from fastapi import HTTPException, Request, Response, status
+
+from app.core.config import settings
+
+
+class DataVersions:
+    """Thread-safe, monotonically increasing write counters keyed by table name."""
+
+    def __init__(self):
+        self.epoch = secrets.token_hex(4)
+        self._versions: dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def bump(self, *tables: str) -> None:
+        """Record a committed write to each of the given tables."""
+        with self._lock:
+            for table in tables:
+                self._versions[table] = self._versions.get(table, 0) + 1
+
+    def get(self, table: str) -> int:
+        """Current version of a table (0 if never written by this process)."""
+        return self._versions.get(table, 0)
+
+    def etag(self, *tables: str, extra: str = "") -> str:
+        """
+        Strong ETag covering the current versions of the given tables (plus
+        `extra`, if any), stamped with the time it was issued.
+        """
+        return f'"{self._base(tables, extra)}-{int(time.time())}"'
+
+    def is_current(self, etag: str, *tables: str, extra: str = "") -> bool:
+        """Whether `etag` was issued for the current versions less than CACHE_TTL_SECONDS ago."""
+        base, _, issued = etag.strip('"').rpartition("-")
+        if base != self._base(tables, extra) or not issued.isdigit():
+            return False
+        return time.time() - int(issued) < settings.CACHE_TTL_SECONDS
+
+    def _base(self, tables: tuple[str, ...], extra: str) -> str:
+        versions = ".".join(str(self.get(table)) for table in tables)
+        return f"{self.epoch}-{versions}-{extra}" if extra else f"{self.epoch}-{versions}"
+
+
+data_versions = DataVersions()
+
+
+def conditional_get(
+    *tables: str, key: Optional[Callable[[], object]] = None
+) -> Callable[[Request, Response], None]:
+    """
+    Build a route dependency that tags responses with an ETag over `tables`
+    and answers a matching, unexpired If-None-Match with 304 Not Modified.
+    `key` covers inputs other than table data: its current value goes into the
+    tag, e.g. today's date for a response that counts today's attendance.
+    Attach it via the route's dependencies=[Depends(conditional_get(...))] so it
+    runs before the db dependency.
+    """
+
+    def dependency(request: Request, response: Response) -> None:
+        extra = str(key()) if key else ""
+        if_none_match = request.headers.get("if-none-match", "")
+        # If-None-Match uses weak comparison, so W/"x" matches "x"
+        candidates = {tag.strip().removeprefix("W/") for tag in if_none_match.split(",")}
+        for candidate in candidates:
+            if candidate == "*" or data_versions.is_current(candidate, *tables, extra=extra):
+                # Echo the client's tag: a fresh issue time would let a polling client keep it forever
+                etag = candidate if candidate != "*" else data_versions.etag(*tables, extra=extra)
+                raise HTTPException(status_code=status.HTTP_304_NOT_MODIFIED, headers={"ETag": etag})
+        response.headers["ETag"] = data_versions.etag(*tables, extra=extra)
+
+    return dependency
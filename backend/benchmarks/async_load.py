@@ -0,0 +1,131 @@
+"""
+Load test: sync (threadpool) vs async (AsyncEngine) request handling.
+
+Seeds a SQLite database, then for each mode starts a live uvicorn server with
+DB_ASYNC set accordingly and drives it with many concurrent clients, reporting
+throughput and p50/p95/p99 latency. The response cache is turned off so every
+request reaches the database; otherwise both modes mostly measure cache hits.
+
+Usage (from backend/):
+    python -m benchmarks.async_load [--requests 3000] [--concurrency 100]
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.async_load
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "DATABASE_URL" not in os.environ:
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+from sqlalchemy import insert  # noqa: E402
+
+from app import models, rollups  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+PORT = 8765
+PATHS = ("/dashboard", "/employees/?limit=100", "/attendance/?limit=100")
+EMPLOYEES = 500
+DAYS = 30
+
+
+def _seed() -> None:
+    """Recreate the schema with EMPLOYEES employees and DAYS days of attendance, then rebuild rollups."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    today = dt.date.today()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Employee),
+            [
+                {"employee_id": f"EMP{i:05d}", "full_name": f"Employee {i}",
+                 "email": f"emp{i}@example.com", "department": f"Dept {i % 10}"}
+                for i in range(1, EMPLOYEES + 1)
+            ],
+        )
+        conn.execute(
+            insert(models.Attendance),
+            [
+                {"employee_id": pk, "date": today - dt.timedelta(days=d),
+                 "status": "Present" if (pk + d) % 7 else "Absent"}
+                for pk in range(1, EMPLOYEES + 1)
+                for d in range(DAYS)
+            ],
+        )
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+
+
+async def _drive(total: int, concurrency: int) -> tuple[float, list[float]]:
+    """Issue `total` GETs over PATHS with `concurrency` workers; return (seconds, latencies)."""
+    latencies: list[float] = []
+    counter = iter(range(total))
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        for n in counter:
+            started = time.perf_counter()
+            response = await client.get(PATHS[n % len(PATHS)])
+            latencies.append(time.perf_counter() - started)
+            response.raise_for_status()
+
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=60) as client:
+        started = time.perf_counter()
+        await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+        return time.perf_counter() - started, latencies
+
+
+def _wait_until_up() -> None:
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=3000)
+    parser.add_argument("--concurrency", type=int, default=100)
+    args = parser.parse_args()
+
+    _seed()
+    print(f"{'mode':>6} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}")
+    for mode, flag in (("sync", "false"), ("async", "true")):
+        server = subprocess.Popen(
+            [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+            cwd=BACKEND_DIR,
+            env={**os.environ, "DB_ASYNC": flag, "CACHE_ENABLED": "false"},
+        )
+        try:
+            _wait_until_up()
+            elapsed, latencies = asyncio.run(_drive(args.requests, args.concurrency))
+        finally:
+            server.terminate()
+            server.wait()
+        latencies.sort()
+        print(
+            f"{mode:>6} {len(latencies) / elapsed:>8.0f} "
+            + " ".join(f"{_percentile(latencies, p) * 1000:>8.1f}" for p in (50, 95, 99))
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Benchmark: compression CPU cost against bytes saved on representative payloads.
+
+Loads a synthetic dataset (benchmarks.datagen) into an in-memory SQLite
+database. It fetches identity bodies from the real endpoints: an /attendance
+page, one day's attendance, one employee's history, /dashboard and the NDJSON
+export. Each body is then compressed with every coding and level through the
+same compressors CompressionMiddleware uses. For each combination it reports:
+- compressed size and ratio
+- CPU milliseconds per response (time.process_time, median of --repeat)
+- CPU microseconds per KiB saved, to compare settings directly
+
+Usage (from backend/):
+    python -m benchmarks.compression [--employees 2000] [--years 0.25] [--repeat 20]
+"""
+import argparse
+import datetime as dt
+import os
+import statistics
+import sys
+import time
+import warnings
+
+os.environ["DATABASE_URL"] = "sqlite://"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.utils.compression import available_encodings, make_compressor  # noqa: E402
+from benchmarks.datagen import generate  # noqa: E402
+
+LEVELS = {"gzip": (1, 6, 9), "br": (1, 4, 6, 11)}
+
+
+def _payloads(client: TestClient, last_day: dt.date) -> dict[str, bytes]:
+    headers = {"Accept-Encoding": "identity"}
+    paths = {
+        "attendance page (500)": "/attendance/?limit=500",
+        "attendance by date": f"/attendance/?date={last_day}&limit=500",
+        "employee history": "/attendance/EMP000001",
+        "dashboard": "/dashboard",
+        "export ndjson": "/attendance/export?format=ndjson",
+    }
+    payloads = {}
+    for name, path in paths.items():
+        response = client.get(path, headers=headers)
+        response.raise_for_status()
+        payloads[name] = response.content
+    return payloads
+
+
+def _compress_cpu_ms(body: bytes, encoding: str, level: int, repeat: int) -> tuple[int, float]:
+    timings, size = [], 0
+    for _ in range(repeat):
+        started = time.process_time()
+        compressor = make_compressor(encoding, level)
+        size = len(compressor.compress(body) + compressor.finish())
+        timings.append(time.process_time() - started)
+    return size, statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--years", type=float, default=0.25)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    last_day = dt.date.today() - dt.timedelta(days=1)
+    while last_day.weekday() >= 5:  # Attendance is generated on weekdays only
+        last_day -= dt.timedelta(days=1)
+    generate(args.employees, args.years, seed=42, batch_size=20_000, last_day=last_day)
+
+    from app.main import app
+
+    payloads = _payloads(TestClient(app), last_day)
+    print(f"{'payload':>22} {'coding':>8} {'bytes':>10} {'ratio':>6} {'cpu ms':>8} {'cpu us/KiB saved':>17}")
+    for name, body in payloads.items():
+        print(f"{name:>22} {'identity':>8} {len(body):>10}")
+        for encoding in available_encodings():
+            for level in LEVELS[encoding]:
+                size, cpu_ms = _compress_cpu_ms(body, encoding, level, args.repeat)
+                saved_kib = (len(body) - size) / 1024
+                per_kib = cpu_ms * 1000 / saved_kib if saved_kib > 0 else float("nan")
+                label = f"{encoding}-{level}"
+                print(f"{'':>22} {label:>8} {size:>10} {len(body) / size:>5.1f}x {cpu_ms:>8.2f} {per_kib:>17.2f}")
+
+
+if __name__ == "__main__":
+    main()
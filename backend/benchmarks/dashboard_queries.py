@@ -0,0 +1,87 @@
+"""
+Benchmark: /dashboard aggregation cost as headcount grows.
+
+Seeds a throwaway SQLite database at several scales and reports the number of
+SQL statements and wall time spent in crud.get_dashboard_data. The statement
+count must stay constant across scales.
+
+Usage (from backend/):
+    python -m benchmarks.dashboard_queries
+"""
+import datetime as dt
+import os
+import random
+import sys
+import tempfile
+import time
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import crud, models, rollups  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+SCALES = (10, 100, 1000, 8000)
+DAYS = 20
+
+
+def _seed(employee_count: int) -> None:
+    """Recreate the schema, bulk-load employees plus DAYS of attendance and rebuild rollups."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    today = dt.date.today()
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Employee),
+            [
+                {
+                    "employee_id": f"EMP{i:05d}",
+                    "full_name": f"Employee {i}",
+                    "email": f"emp{i}@example.com",
+                    "department": f"Dept {i % 10}",
+                }
+                for i in range(1, employee_count + 1)
+            ],
+        )
+        conn.execute(
+            insert(models.Attendance),
+            [
+                {
+                    "employee_id": pk,
+                    "date": today - dt.timedelta(days=offset),
+                    "status": "Present" if random.random() < 0.85 else "Absent",
+                }
+                for pk in range(1, employee_count + 1)
+                for offset in range(DAYS)
+            ],
+        )
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+
+
+def main() -> None:
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *args: statements.append(args[2]))
+
+    print(f"{'employees':>10} {'queries':>8} {'ms':>10}")
+    for scale in SCALES:
+        _seed(scale)
+        statements.clear()
+        db = SessionLocal()
+        try:
+            started = time.perf_counter()
+            crud.get_dashboard_data(db)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+        finally:
+            db.close()
+        print(f"{scale:>10} {len(statements):>8} {elapsed_ms:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,172 @@
+"""
+Synthetic dataset generator for sizing and benchmarks.
+
+Bulk-loads employees and their attendance history into DATABASE_URL (SQLite or
+MySQL), then rebuilds the attendance rollups. Output is fully determined by
+--seed and --end-date, so runs on different commits see identical data.
+
+Distributions:
+- departments are weighted (Engineering largest, Legal smallest)
+- hire dates are spread over the history window with more recent hires
+- attendance is recorded on weekdays from the hire date up to --end-date
+- each employee has their own attendance propensity (beta, mean ~0.93),
+  and absences are likelier on Mondays and Fridays
+
+Rows are inserted with Core executemany in batches of --batch-size, one
+transaction per batch (PyMySQL rewrites these into multi-row INSERTs). SQLite
+loads with an in-memory journal and sync turned off.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --employees 50000 --years 5
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.datagen --employees 50000 --years 5
+"""
+import argparse
+import datetime as dt
+import os
+import random
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(BACKEND_DIR, "benchmarks", "data", "bench.db")
+if "DATABASE_URL" not in os.environ:
+    os.makedirs(os.path.dirname(DEFAULT_DB_PATH), exist_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{DEFAULT_DB_PATH}"
+sys.path.insert(0, BACKEND_DIR)
+
+from sqlalchemy import event, insert  # noqa: E402
+
+from app import models, rollups  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+DEPARTMENTS = {
+    "Engineering": 0.35,
+    "Sales": 0.20,
+    "Operations": 0.15,
+    "Customer Success": 0.12,
+    "Marketing": 0.08,
+    "Finance": 0.05,
+    "Human Resources": 0.03,
+    "Legal": 0.02,
+}
+ABSENCE_WEEKDAY_FACTOR = {0: 1.4, 1: 0.9, 2: 0.8, 3: 0.9, 4: 1.5}  # Monday..Friday
+
+
+def _employee_rows(rng: random.Random, count: int, first_day: dt.date, last_day: dt.date):
+    """Yield (row, attendance propensity) per employee; hire dates skew recent."""
+    span = (last_day - first_day).days
+    departments, weights = list(DEPARTMENTS), list(DEPARTMENTS.values())
+    for n in range(1, count + 1):
+        hired = first_day + dt.timedelta(days=int(span * rng.random() ** 0.7))
+        row = {
+            "employee_id": f"EMP{n:06d}",
+            "full_name": f"Employee {n}",
+            "email": f"employee{n}@example.com",
+            "department": rng.choices(departments, weights)[0],
+            "created_at": dt.datetime.combine(hired, dt.time(9)),
+        }
+        yield row, rng.betavariate(28, 2)
+
+
+def _attendance_rows(rng: random.Random, employee_pk: int, hired: dt.date, last_day: dt.date, propensity: float):
+    day = hired
+    while day <= last_day:
+        weekday = day.weekday()
+        if weekday < 5:
+            absent = rng.random() < (1 - propensity) * ABSENCE_WEEKDAY_FACTOR[weekday]
+            yield {"employee_id": employee_pk, "date": day, "status": "Absent" if absent else "Present"}
+        day += dt.timedelta(days=1)
+
+
+def _fast_sqlite_load(dbapi_connection, connection_record) -> None:
+    """Trade crash safety for load speed; the file is disposable."""
+    dbapi_connection.execute("PRAGMA journal_mode=MEMORY")
+    dbapi_connection.execute("PRAGMA synchronous=OFF")
+
+
+def _insert_batches(table, rows, batch_size: int) -> int:
+    """executemany `rows` into `table`, one transaction per batch; returns the row count."""
+    batch, total = [], 0
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= batch_size:
+            with engine.begin() as conn:
+                conn.execute(insert(table), batch)
+            total += len(batch)
+            batch = []
+    if batch:
+        with engine.begin() as conn:
+            conn.execute(insert(table), batch)
+        total += len(batch)
+    return total
+
+
+def generate(employees: int, years: float, seed: int, batch_size: int, last_day: dt.date) -> dict:
+    """Recreate the schema and load the dataset ending on last_day; returns row counts and timings."""
+    rng = random.Random(seed)
+    first_day = last_day - dt.timedelta(days=int(years * 365))
+
+    if engine.dialect.name == "sqlite":
+        event.listen(engine, "connect", _fast_sqlite_load)
+        engine.dispose()  # Pooled connections predate the listener
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+
+    started = time.perf_counter()
+    people = list(_employee_rows(rng, employees, first_day, last_day))
+    _insert_batches(models.Employee.__table__, (row for row, _ in people), batch_size)
+    employees_seconds = time.perf_counter() - started
+
+    # Primary keys follow insertion order on a freshly created table
+    attendance = (
+        record
+        for pk, (row, propensity) in enumerate(people, start=1)
+        for record in _attendance_rows(rng, pk, row["created_at"].date(), last_day, propensity)
+    )
+    started = time.perf_counter()
+    attendance_count = _insert_batches(models.Attendance.__table__, attendance, batch_size)
+    attendance_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+    rollups_seconds = time.perf_counter() - started
+
+    return {
+        "employees": employees,
+        "attendance": attendance_count,
+        "first_day": first_day.isoformat(),
+        "last_day": last_day.isoformat(),
+        "seed": seed,
+        "employees_seconds": round(employees_seconds, 2),
+        "attendance_seconds": round(attendance_seconds, 2),
+        "attendance_rows_per_second": round(attendance_count / attendance_seconds) if attendance_seconds else None,
+        "rollups_seconds": round(rollups_seconds, 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--employees", type=int, default=1000)
+    parser.add_argument("--years", type=float, default=1.0, help="Length of attendance history")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--batch-size", type=int, default=20_000)
+    parser.add_argument(
+        "--end-date",
+        type=dt.date.fromisoformat,
+        default=dt.date.today() - dt.timedelta(days=1),
+        help="Last day of attendance (YYYY-MM-DD); defaults to yesterday. Pin it to reproduce a dataset exactly.",
+    )
+    args = parser.parse_args()
+
+    print(f"Loading into {engine.url.render_as_string(hide_password=True)}")
+    summary = generate(args.employees, args.years, args.seed, args.batch_size, args.end_date)
+    for key, value in summary.items():
+        print(f"{key:>28}: {value}")
+
+
+if __name__ == "__main__":
+    main()
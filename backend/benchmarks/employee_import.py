@@ -0,0 +1,61 @@
+"""
+Benchmark: POST /employees/import throughput.
+
+Uploads generated CSV files of increasing size to a throwaway SQLite database
+and reports rows/sec. A fraction of rows are deliberately invalid or duplicated
+so the validation and duplicate-detection paths are exercised too.
+
+Usage (from backend/):
+    python -m benchmarks.employee_import
+"""
+import io
+import os
+import sys
+import tempfile
+import time
+import warnings
+
+DB_PATH = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "bench.db")
+os.environ["DATABASE_URL"] = f"sqlite:///{DB_PATH}"
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app.database import Base, engine  # noqa: E402
+from app.main import app  # noqa: E402
+
+SCALES = (1_000, 10_000, 50_000)
+
+
+def _csv(row_count: int) -> bytes:
+    """Build a CSV where ~1% of rows have a bad email and ~1% repeat an earlier ID."""
+    out = io.StringIO()
+    out.write("employee_id,full_name,email,department\n")
+    for i in range(1, row_count + 1):
+        employee_id = f"EMP{i - 1:06d}" if i % 100 == 0 else f"EMP{i:06d}"
+        email = "not-an-email" if i % 100 == 50 else f"emp{i}@example.com"
+        out.write(f"{employee_id},Employee {i},{email},Dept {i % 10}\n")
+    return out.getvalue().encode()
+
+
+def main() -> None:
+    client = TestClient(app)
+    print(f"{'rows':>8} {'imported':>9} {'failed':>7} {'seconds':>8} {'rows/sec':>10}")
+    for scale in SCALES:
+        Base.metadata.drop_all(bind=engine)
+        Base.metadata.create_all(bind=engine)
+        body = _csv(scale)
+        started = time.perf_counter()
+        response = client.post("/employees/import", files={"file": ("employees.csv", body, "text/csv")})
+        elapsed = time.perf_counter() - started
+        response.raise_for_status()
+        result = response.json()
+        print(
+            f"{scale:>8} {result['imported']:>9} {result['failed']:>7} "
+            f"{elapsed:>8.2f} {scale / elapsed:>10.0f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,187 @@
+"""
+Benchmark: POST /attendance/ throughput, one commit per request vs group commit.
+
+Seeds --employees employees, then for each mode (ATTENDANCE_GROUP_COMMIT off /
+on) sends --requests marks, each for a distinct (employee, date), from
+--concurrency clients. This is the 9:00 spike: many small writes at once.
+Reports throughput, p50/p95/p99 latency, non-2xx responses, and whether every
+row landed with exact rollups.
+
+--mode asgi (default) drives the app in-process through httpx's ASGITransport,
+so HTTP parsing and the client do not compete with the server for CPU;
+--mode live starts a uvicorn server per mode.
+
+SQLite's default journal fsyncs on every commit; set DATABASE_URL to measure
+against MySQL.
+
+Usage (from backend/):
+    python -m benchmarks.group_commit [--requests 5000] [--concurrency 200]
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.group_commit --mode live
+"""
+import argparse
+import asyncio
+import datetime as dt
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if "DATABASE_URL" not in os.environ:
+    db_path = os.path.join(tempfile.mkdtemp(prefix="hrms-bench-"), "bench.db")
+    os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+sys.path.insert(0, BACKEND_DIR)
+
+import httpx  # noqa: E402
+from sqlalchemy import func, insert, select  # noqa: E402
+
+from app import models, rollups  # noqa: E402
+from app.database import Base, SessionLocal, engine  # noqa: E402
+
+PORT = 8766
+START = dt.date(2026, 1, 1)
+
+
+def _seed(employees: int) -> None:
+    """Recreate the schema with `employees` employees and no attendance."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Employee),
+            [
+                {"employee_id": f"EMP{i:05d}", "full_name": f"Employee {i}",
+                 "email": f"emp{i}@example.com", "department": f"Dept {i % 10}"}
+                for i in range(1, employees + 1)
+            ],
+        )
+
+
+def _marks(total: int, employees: int) -> list[dict]:
+    return [
+        {"employee_id": f"EMP{n % employees + 1:05d}", "date": str(START + dt.timedelta(days=n // employees)),
+         "status": "Present" if n % 5 else "Absent"}
+        for n in range(total)
+    ]
+
+
+async def _drive(client: httpx.AsyncClient, marks: list[dict], concurrency: int) -> tuple[float, list[float], int]:
+    """POST every mark with `concurrency` workers; return (seconds, latencies, non-2xx count)."""
+    latencies: list[float] = []
+    failures = 0
+    pending = iter(marks)
+
+    async def worker(client: httpx.AsyncClient) -> None:
+        nonlocal failures
+        for body in pending:
+            started = time.perf_counter()
+            response = await client.post("/attendance/", json=body)
+            latencies.append(time.perf_counter() - started)
+            failures += not response.is_success
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker(client) for _ in range(concurrency)))
+    return time.perf_counter() - started, latencies, failures
+
+
+async def _run_asgi(marks: list[dict], concurrency: int, committer) -> tuple[float, list[float], int]:
+    """In-process: swap the route's GroupCommitter (or None) in and drive the app directly."""
+    from app.main import app
+    from app.routers import attendance
+
+    attendance.attendance_writes = committer
+    try:
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)  # 500s count as errors
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            return await _drive(client, marks, concurrency)
+    finally:
+        if committer is not None:
+            await committer.close()
+        attendance.attendance_writes = None
+
+
+async def _run_live(marks: list[dict], concurrency: int) -> tuple[float, list[float], int]:
+    limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+    async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=120) as client:
+        return await _drive(client, marks, concurrency)
+
+
+def _wait_until_up() -> None:
+    for _ in range(100):
+        try:
+            httpx.get(f"http://127.0.0.1:{PORT}/health", timeout=1)
+            return
+        except httpx.HTTPError:
+            time.sleep(0.1)
+    raise RuntimeError("uvicorn did not start")
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def _check_rollups(expected: int) -> str:
+    """Rows written and whether the employee totals match them."""
+    db = SessionLocal()
+    try:
+        written = db.execute(select(func.count()).select_from(models.Attendance)).scalar()
+        drift = rollups.reconcile(db)
+    finally:
+        db.close()
+    return f"{written}/{expected} rows, {'rollups ok' if not drift else f'{len(drift)} drifted'}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["asgi", "live"], default="asgi")
+    parser.add_argument("--requests", type=int, default=5000)
+    parser.add_argument("--concurrency", type=int, default=200)
+    parser.add_argument("--employees", type=int, default=2000)
+    parser.add_argument("--max-batch", type=int, default=200)
+    parser.add_argument("--max-delay-ms", type=float, default=5.0)
+    args = parser.parse_args()
+
+    marks = _marks(args.requests, args.employees)
+    print(f"Against {os.environ['DATABASE_URL'].split('@')[-1]}, {args.requests} marks, {args.concurrency} clients")
+    print(f"{'mode':>14} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'errors':>7}  check")
+    for mode, flag in (("per-request", "false"), ("group commit", "true")):
+        _seed(args.employees)
+        if args.mode == "asgi":
+            from app.routers import attendance
+            from app.utils.group_commit import GroupCommitter
+
+            committer = (
+                GroupCommitter(attendance._flush_attendance, args.max_batch, args.max_delay_ms / 1000)
+                if flag == "true"
+                else None
+            )
+            elapsed, latencies, failures = asyncio.run(_run_asgi(marks, args.concurrency, committer))
+        else:
+            server = subprocess.Popen(
+                [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT), "--log-level", "warning"],
+                cwd=BACKEND_DIR,
+                env={
+                    **os.environ,
+                    "ATTENDANCE_GROUP_COMMIT": flag,
+                    "ATTENDANCE_GROUP_COMMIT_MAX_BATCH": str(args.max_batch),
+                    "ATTENDANCE_GROUP_COMMIT_MAX_DELAY_MS": str(args.max_delay_ms),
+                    "METRICS_ENABLED": "false",
+                },
+            )
+            try:
+                _wait_until_up()
+                elapsed, latencies, failures = asyncio.run(_run_live(marks, args.concurrency))
+            finally:
+                server.terminate()
+                server.wait()
+        latencies.sort()
+        print(
+            f"{mode:>14} {len(latencies) / elapsed:>8.0f} "
+            + " ".join(f"{_percentile(latencies, p) * 1000:>8.1f}" for p in (50, 95, 99))
+            + f" {failures:>7}  {_check_rollups(args.requests)}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,406 @@
+"""
+Benchmark runner: drive every API endpoint concurrently and report JSON.
+
+Replays a seeded, weighted mix of requests against a dataset produced by
+benchmarks.datagen, either in-process (httpx ASGITransport: app + database,
+no HTTP server) or against a live uvicorn server. Reports throughput,
+p50/p95/p99 latency and SQL statements per request (X-DB-Query-Count), both
+overall and per endpoint.
+
+Runs are comparable across commits: the request plan depends only on --seed
+and the dataset, SQLite datasets are copied before the run so write endpoints
+never change the source file, and the JSON records the commit it ran on.
+Against MySQL the write endpoints do modify the data; regenerate it between runs.
+
+Usage (from backend/):
+    python -m benchmarks.datagen --employees 50000 --years 5 --end-date 2026-01-31
+    python -m benchmarks.load --mode asgi --requests 5000 --concurrency 50
+    python -m benchmarks.load --mode live --workers 4 --compare benchmarks/results/asgi-<commit>.json
+"""
+import argparse
+import asyncio
+import datetime as dt
+import json
+import os
+import platform
+import random
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from collections import defaultdict
+from dataclasses import dataclass, field
+from typing import Optional
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(BACKEND_DIR, "benchmarks", "data", "bench.db")
+RESULTS_DIR = os.path.join(BACKEND_DIR, "benchmarks", "results")
+PORT = 8766
+
+# name -> (weight, write endpoint)
+ENDPOINTS = {
+    "dashboard": (10, False),
+    "employees_list": (10, False),
+    "employees_next_page": (5, False),
+    "attendance_list": (8, False),
+    "attendance_by_date": (8, False),
+    "attendance_by_employee": (10, False),
+    "attendance_export_day": (2, False),
+    "stats_employees_month": (2, False),
+    "stats_departments_year": (3, False),
+    "stats_daily_year": (3, False),
+    "health": (1, False),
+    "metrics": (1, False),
+    "cache_stats": (1, False),
+    "employee_create": (3, True),
+    "employee_import": (1, True),
+    "employee_delete": (2, True),
+    "attendance_mark": (6, True),
+    "attendance_bulk": (2, True),
+}
+
+
+@dataclass
+class PlannedRequest:
+    name: str
+    method: str
+    url: str
+    kwargs: dict = field(default_factory=dict)
+
+
+@dataclass
+class Dataset:
+    employees: int
+    attendance: int
+    first_day: dt.date
+    last_day: dt.date
+    employee_ids: list[str]
+
+
+def _prepare_database(database_url: Optional[str]) -> str:
+    """Return the DATABASE_URL to benchmark; SQLite files are copied so the source stays pristine."""
+    url = database_url or f"sqlite:///{DEFAULT_DB_PATH}"
+    prefix = "sqlite:///"
+    if url.startswith(prefix) and url != "sqlite://":
+        source = url[len(prefix):]
+        if not os.path.exists(source):
+            sys.exit(f"{source} does not exist; run `python -m benchmarks.datagen` first.")
+        copy = os.path.join(tempfile.mkdtemp(prefix="hrms-load-"), "bench.db")
+        shutil.copyfile(source, copy)
+        return prefix + copy
+    return url
+
+
+def _load_dataset() -> Dataset:
+    from sqlalchemy import func, select
+
+    from app import models
+    from app.database import engine
+
+    with engine.connect() as conn:
+        employee_ids = list(conn.execute(select(models.Employee.employee_id).order_by(models.Employee.id)).scalars())
+        attendance, first_day, last_day = conn.execute(
+            select(func.count(), func.min(models.Attendance.date), func.max(models.Attendance.date))
+        ).one()
+    if not employee_ids or first_day is None:
+        sys.exit("The benchmark database is empty; run `python -m benchmarks.datagen` first.")
+    if isinstance(first_day, str):  # Aggregates over SQLite dates come back as text
+        first_day, last_day = dt.date.fromisoformat(first_day), dt.date.fromisoformat(last_day)
+    return Dataset(len(employee_ids), attendance, first_day, last_day, employee_ids)
+
+
+def _plan(dataset: Dataset, total: int, seed: int, read_only: bool, next_cursor: Optional[str]) -> list[PlannedRequest]:
+    """Build the request sequence; identical for the same dataset, seed and options."""
+    rng = random.Random(seed)
+    names = [name for name, (_, write) in ENDPOINTS.items() if not (read_only and write)]
+    weights = [ENDPOINTS[name][0] for name in names]
+    span = (dataset.last_day - dataset.first_day).days
+    today = dt.date.today()
+    year_ago = max(dataset.first_day, dataset.last_day - dt.timedelta(days=364))
+    month_ago = max(dataset.first_day, dataset.last_day - dt.timedelta(days=29))
+    deletable = iter(dataset.employee_ids[::-1])  # Later reads of these employees answer 404
+
+    def random_employee() -> str:
+        return rng.choice(dataset.employee_ids)
+
+    def random_day() -> dt.date:
+        return dataset.first_day + dt.timedelta(days=rng.randint(0, span))
+
+    plan = []
+    for n in range(total):
+        name = rng.choices(names, weights)[0]
+        if name == "dashboard":
+            request = PlannedRequest(name, "GET", "/dashboard")
+        elif name == "employees_list":
+            request = PlannedRequest(name, "GET", "/employees/?limit=100")
+        elif name == "employees_next_page":
+            request = PlannedRequest(name, "GET", f"/employees/?limit=100&cursor={next_cursor}")
+        elif name == "attendance_list":
+            request = PlannedRequest(name, "GET", "/attendance/?limit=100")
+        elif name == "attendance_by_date":
+            request = PlannedRequest(name, "GET", f"/attendance/?date={random_day()}&limit=100")
+        elif name == "attendance_by_employee":
+            request = PlannedRequest(name, "GET", f"/attendance/{random_employee()}?limit=100")
+        elif name == "attendance_export_day":
+            day = random_day()
+            request = PlannedRequest(name, "GET", f"/attendance/export?format=csv&date_from={day}&date_to={day}")
+        elif name == "stats_employees_month":
+            request = PlannedRequest(
+                name, "GET", f"/attendance/stats/employees?date_from={month_ago}&date_to={dataset.last_day}"
+            )
+        elif name == "stats_departments_year":
+            request = PlannedRequest(
+                name, "GET", f"/attendance/stats/departments?date_from={year_ago}&date_to={dataset.last_day}"
+            )
+        elif name == "stats_daily_year":
+            request = PlannedRequest(
+                name, "GET", f"/attendance/stats/daily?date_from={year_ago}&date_to={dataset.last_day}"
+            )
+        elif name == "health":
+            request = PlannedRequest(name, "GET", "/health")
+        elif name == "metrics":
+            request = PlannedRequest(name, "GET", "/metrics")
+        elif name == "cache_stats":
+            request = PlannedRequest(name, "GET", "/cache/stats")
+        elif name == "employee_create":
+            request = PlannedRequest(name, "POST", "/employees/", {"json": {
+                "employee_id": f"BENCH{n:07d}", "full_name": f"Bench {n}",
+                "email": f"bench{n}@example.com", "department": "Benchmark",
+            }})
+        elif name == "employee_import":
+            rows = "\n".join(
+                json.dumps({"employee_id": f"IMP{n:07d}-{i}", "full_name": f"Imported {i}",
+                            "email": f"imp{n}-{i}@example.com", "department": "Benchmark"})
+                for i in range(50)
+            )
+            request = PlannedRequest(name, "POST", "/employees/import", {
+                "files": {"file": ("employees.ndjson", rows.encode(), "application/x-ndjson")},
+            })
+        elif name == "employee_delete":
+            request = PlannedRequest(name, "DELETE", f"/employees/{next(deletable)}")
+        elif name == "attendance_mark":
+            request = PlannedRequest(name, "POST", "/attendance/", {"json": {
+                "employee_id": random_employee(), "date": str(today), "status": rng.choice(["Present", "Absent"]),
+            }})
+        else:  # attendance_bulk
+            request = PlannedRequest(name, "POST", "/attendance/bulk", {"json": {"records": [
+                {"employee_id": random_employee(), "date": str(today), "status": "Present"} for _ in range(100)
+            ]}})
+        plan.append(request)
+    return plan
+
+
+# Statuses that are a correct answer for the request, not a failure
+EXPECTED_STATUSES = {
+    "attendance_mark": {201, 404, 409},   # Same employee/day twice -> 409; deleted employee -> 404
+    "attendance_bulk": {201, 409},        # 409 when a concurrent write marked the same pair first
+    "employee_create": {201},
+    "employee_import": {201},
+    "employee_delete": {200, 404},        # Concurrent plan items can race on the same row
+    "attendance_by_employee": {200, 404},   # The employee may have been deleted earlier in the run
+}
+
+
+async def _drive(client, plan: list[PlannedRequest], concurrency: int) -> tuple[float, list[tuple]]:
+    """Replay `plan` with `concurrency` workers; return (seconds, [(name, status, seconds, queries)])."""
+    results = []
+    queue = iter(plan)
+
+    async def worker() -> None:
+        for request in queue:
+            started = time.perf_counter()
+            response = await client.request(request.method, request.url, **request.kwargs)
+            elapsed = time.perf_counter() - started
+            queries = response.headers.get("x-db-query-count")
+            results.append((request.name, response.status_code, elapsed, int(queries) if queries else None))
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    return time.perf_counter() - started, results
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    return sorted_values[min(len(sorted_values) - 1, int(len(sorted_values) * pct / 100))]
+
+
+def _summarize(results: list[tuple], seconds: Optional[float] = None) -> dict:
+    latencies = sorted(r[2] for r in results)
+    queries = [r[3] for r in results if r[3] is not None]
+    statuses: dict[str, int] = defaultdict(int)
+    errors = 0
+    for name, status_code, _, _ in results:
+        statuses[str(status_code)] += 1
+        if status_code not in EXPECTED_STATUSES.get(name, {200}):
+            errors += 1
+    summary = {
+        "requests": len(results),
+        "errors": errors,
+        "statuses": dict(sorted(statuses.items())),
+        "p50_ms": round(_percentile(latencies, 50) * 1000, 2),
+        "p95_ms": round(_percentile(latencies, 95) * 1000, 2),
+        "p99_ms": round(_percentile(latencies, 99) * 1000, 2),
+        "queries_per_request": round(sum(queries) / len(queries), 2) if queries else None,
+        "max_queries": max(queries) if queries else None,
+    }
+    if seconds is not None:
+        summary = {"seconds": round(seconds, 3), "throughput_rps": round(len(results) / seconds, 1), **summary}
+    return summary
+
+
+def _git_revision() -> dict:
+    def git(*args: str) -> Optional[str]:
+        try:
+            return subprocess.run(
+                ["git", *args], cwd=BACKEND_DIR, capture_output=True, text=True, check=True
+            ).stdout.strip()
+        except (OSError, subprocess.CalledProcessError):
+            return None
+
+    return {"commit": git("rev-parse", "HEAD"), "dirty": bool(git("status", "--porcelain", "--untracked-files=no"))}
+
+
+async def _run_asgi(plan: list[PlannedRequest], concurrency: int) -> tuple[float, list[tuple]]:
+    import httpx
+
+    from app.main import app
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=300) as client:
+        return await _drive(client, plan, concurrency)
+
+
+def _run_live(plan: list[PlannedRequest], concurrency: int, workers: int) -> tuple[float, list[tuple]]:
+    import httpx
+
+    server = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--port", str(PORT),
+         "--workers", str(workers), "--log-level", "warning"],
+        cwd=BACKEND_DIR,
+        env=os.environ.copy(),
+    )
+    try:
+        for _ in range(200):
+            try:
+                httpx.get(f"http://127.0.0.1:{PORT}/health", timeout=1)
+                break
+            except httpx.HTTPError:
+                time.sleep(0.1)
+        else:
+            raise RuntimeError("uvicorn did not start")
+
+        async def drive() -> tuple[float, list[tuple]]:
+            limits = httpx.Limits(max_connections=concurrency, max_keepalive_connections=concurrency)
+            async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{PORT}", limits=limits, timeout=300) as client:
+                return await _drive(client, plan, concurrency)
+
+        return asyncio.run(drive())
+    finally:
+        server.terminate()
+        server.wait()
+
+
+def _print_report(report: dict, baseline: Optional[dict]) -> None:
+    header = f"{'endpoint':<24} {'n':>6} {'err':>4} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'q/req':>6}"
+    if baseline:
+        header += f" {'Δp50':>8} {'Δp95':>8}"
+    print(header)
+    rows = [("TOTAL", report["summary"])] + sorted(report["endpoints"].items())
+    for name, stats in rows:
+        line = (
+            f"{name:<24} {stats['requests']:>6} {stats['errors']:>4} {stats['p50_ms']:>8.1f} "
+            f"{stats['p95_ms']:>8.1f} {stats['p99_ms']:>8.1f} {stats['queries_per_request'] or 0:>6.1f}"
+        )
+        before = None
+        if baseline:
+            before = baseline["summary"] if name == "TOTAL" else baseline["endpoints"].get(name)
+        if before:
+            line += " ".join(
+                f" {(stats[key] - before[key]) / before[key] * 100 if before[key] else 0:>+7.0f}%"
+                for key in ("p50_ms", "p95_ms")
+            )
+        print(line)
+    summary = report["summary"]
+    print(f"\n{summary['throughput_rps']} req/s over {summary['seconds']}s")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--mode", choices=["asgi", "live"], default="asgi")
+    parser.add_argument("--requests", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=50)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn workers (live mode)")
+    parser.add_argument("--seed", type=int, default=7)
+    parser.add_argument("--read-only", action="store_true", help="Only GET endpoints")
+    parser.add_argument("--no-cache", action="store_true", help="Disable the in-process response caches")
+    parser.add_argument("--output", help="JSON report path (default: benchmarks/results/<mode>-<commit>.json)")
+    parser.add_argument("--compare", help="Earlier JSON report to print latency deltas against")
+    args = parser.parse_args()
+
+    # Configure the app (in-process, or through the environment uvicorn inherits) before importing it
+    os.environ["DATABASE_URL"] = _prepare_database(os.environ.get("DATABASE_URL"))
+    os.environ["METRICS_DEBUG_HEADERS"] = "true"
+    if args.no_cache:
+        os.environ["CACHE_ENABLED"] = "false"
+    sys.path.insert(0, BACKEND_DIR)
+
+    dataset = _load_dataset()
+    from fastapi.testclient import TestClient
+
+    from app.main import app
+
+    next_cursor = TestClient(app).get("/employees/?limit=100").json()["next_cursor"]
+    plan = _plan(dataset, args.requests, args.seed, args.read_only, next_cursor)
+
+    if args.mode == "asgi":
+        seconds, results = asyncio.run(_run_asgi(plan, args.concurrency))
+    else:
+        seconds, results = _run_live(plan, args.concurrency, args.workers)
+
+    by_endpoint = defaultdict(list)
+    for result in results:
+        by_endpoint[result[0]].append(result)
+
+    from app.database import engine
+
+    revision = _git_revision()
+    report = {
+        "meta": {
+            **revision,
+            "timestamp": dt.datetime.now(dt.timezone.utc).isoformat(timespec="seconds"),
+            "mode": args.mode,
+            "workers": args.workers if args.mode == "live" else None,
+            "requests": args.requests,
+            "concurrency": args.concurrency,
+            "seed": args.seed,
+            "read_only": args.read_only,
+            "cache": not args.no_cache,
+            "db_async": os.environ.get("DB_ASYNC", "false"),
+            "database": engine.dialect.name,
+            "python": platform.python_version(),
+            "dataset": {
+                "employees": dataset.employees,
+                "attendance": dataset.attendance,
+                "first_day": dataset.first_day.isoformat(),
+                "last_day": dataset.last_day.isoformat(),
+            },
+        },
+        "summary": _summarize(results, seconds),
+        "endpoints": {name: _summarize(items) for name, items in sorted(by_endpoint.items())},
+    }
+
+    output = args.output or os.path.join(RESULTS_DIR, f"{args.mode}-{(revision['commit'] or 'unknown')[:10]}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w") as fh:
+        json.dump(report, fh, indent=2)
+
+    baseline = None
+    if args.compare:
+        with open(args.compare) as fh:
+            baseline = json.load(fh)
+    _print_report(report, baseline)
+    print(f"Report written to {output}")
+
+
+if __name__ == "__main__":
+    main()
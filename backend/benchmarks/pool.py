@@ -0,0 +1,120 @@
+"""
+Benchmark: connection checkout latency and throughput under contention.
+
+--threads threads (one worker's threadpool) run a checkout -> SELECT 1 ->
+hold for --hold-ms -> return loop against DATABASE_URL for --seconds per pool
+configuration. Each configuration reports:
+- throughput
+- checkout latency, including the pre-ping round trip when enabled
+- pool timeouts
+- the peak number of checked-out connections
+
+The "budget" rows size the pool with app.database.pool_budget for
+--max-connections over --workers processes.
+
+Usage (from backend/):
+    python -m benchmarks.pool [--threads 32] [--seconds 3] [--hold-ms 2]
+    DATABASE_URL=mysql+pymysql://... python -m benchmarks.pool --max-connections 150 --workers 8
+"""
+import argparse
+import os
+import statistics
+import sys
+import threading
+import time
+import warnings
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_DB_PATH = os.path.join(BACKEND_DIR, "benchmarks", "data", "pool.db")
+if "DATABASE_URL" not in os.environ:
+    os.makedirs(os.path.dirname(DEFAULT_DB_PATH), exist_ok=True)
+    os.environ["DATABASE_URL"] = f"sqlite:///{DEFAULT_DB_PATH}"
+sys.path.insert(0, BACKEND_DIR)
+warnings.filterwarnings("ignore")
+
+from sqlalchemy import create_engine, text  # noqa: E402
+from sqlalchemy.exc import TimeoutError as PoolTimeout  # noqa: E402
+
+from app.core.config import settings  # noqa: E402
+from app.database import pool_budget  # noqa: E402
+
+
+def _configs(max_connections: int, workers: int) -> list[tuple[str, dict]]:
+    budget_size, budget_overflow = pool_budget(10, 20, max_connections, workers, 1)
+    budget = f"budget {max_connections}/{workers}"
+    return [
+        ("10+20 pre-ping", dict(pool_size=10, max_overflow=20, pool_pre_ping=True)),
+        ("10+20 no pre-ping", dict(pool_size=10, max_overflow=20, pool_pre_ping=False)),
+        (f"{budget} pre-ping", dict(pool_size=budget_size, max_overflow=budget_overflow, pool_pre_ping=True)),
+        (f"{budget} no pre-ping", dict(pool_size=budget_size, max_overflow=budget_overflow, pool_pre_ping=False)),
+        ("2+0 no pre-ping", dict(pool_size=2, max_overflow=0, pool_pre_ping=False)),
+    ]
+
+
+def _run(options: dict, threads: int, seconds: float, hold_seconds: float) -> dict:
+    engine = create_engine(settings.DATABASE_URL, pool_timeout=5, **options)
+    with engine.connect() as conn:  # Open the first connection outside the measurement
+        conn.execute(text("SELECT 1"))
+
+    checkouts: list[list[float]] = [[] for _ in range(threads)]
+    timeouts = [0] * threads
+    peak = [0]
+    stop = time.perf_counter() + seconds
+    barrier = threading.Barrier(threads)
+
+    def worker(n: int) -> None:
+        barrier.wait()
+        while time.perf_counter() < stop:
+            started = time.perf_counter()
+            try:
+                conn = engine.connect()
+            except PoolTimeout:
+                timeouts[n] += 1
+                continue
+            checkouts[n].append(time.perf_counter() - started)
+            peak[0] = max(peak[0], engine.pool.checkedout())
+            try:
+                conn.execute(text("SELECT 1"))
+                if hold_seconds:
+                    time.sleep(hold_seconds)  # Stands in for query time
+            finally:
+                conn.close()
+
+    pool_threads = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    for thread in pool_threads:
+        thread.start()
+    for thread in pool_threads:
+        thread.join()
+    engine.dispose()
+
+    latencies = sorted(latency for per_thread in checkouts for latency in per_thread)
+    return {
+        "ops_per_second": len(latencies) / seconds,
+        "checkout_p50_ms": statistics.median(latencies) * 1000 if latencies else float("nan"),
+        "checkout_p99_ms": latencies[int(len(latencies) * 0.99)] * 1000 if latencies else float("nan"),
+        "timeouts": sum(timeouts),
+        "peak_connections": peak[0],
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=32)
+    parser.add_argument("--seconds", type=float, default=3.0)
+    parser.add_argument("--hold-ms", type=float, default=2.0, help="Time each connection is held per operation")
+    parser.add_argument("--max-connections", type=int, default=150)
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    print(f"Against {settings.DATABASE_URL.split('@')[-1]}, {args.threads} threads, hold {args.hold_ms} ms")
+    print(f"{'pool':>26} {'ops/s':>8} {'p50 ms':>8} {'p99 ms':>8} {'timeouts':>9} {'peak conns':>11}")
+    for name, options in _configs(args.max_connections, args.workers):
+        r = _run(options, args.threads, args.seconds, args.hold_ms / 1000)
+        print(
+            f"{name:>26} {r['ops_per_second']:>8.0f} {r['checkout_p50_ms']:>8.3f} {r['checkout_p99_ms']:>8.2f} "
+            f"{r['timeouts']:>9} {r['peak_connections']:>11}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Microbenchmark: response serialization for large list responses.
+
+Serves the same employee and attendance lists from two routes each:
+- validated: schemas built with validation and returned through response_model
+  (FastAPI re-validates, runs jsonable_encoder and encodes with the stdlib json)
+- trusted:   model_construct / row dicts returned through trusted_json (orjson)
+and reports the median request time through an in-process TestClient.
+No database is involved; only the serialization path differs.
+
+Usage (from backend/):
+    python -m benchmarks.serialization [--rows 10000] [--repeat 15]
+"""
+import argparse
+import datetime as dt
+import os
+import statistics
+import sys
+import time
+import warnings
+from types import SimpleNamespace
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+warnings.filterwarnings("ignore")
+
+from fastapi import FastAPI, Response  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.testclient import TestClient  # noqa: E402
+
+from app import schemas  # noqa: E402
+from app.utils.responses import trusted_json  # noqa: E402
+
+
+def _build_app(rows: int) -> FastAPI:
+    created = dt.datetime(2026, 1, 1, 9, 30)
+    employees = [
+        SimpleNamespace(
+            id=n, employee_id=f"EMP{n:06d}", full_name=f"Employee {n}", email=f"employee{n}@example.com",
+            department="Engineering", created_at=created,
+        )
+        for n in range(1, rows + 1)
+    ]
+    attendance = [
+        {"id": n, "employee_id": n, "employee_string_id": f"EMP{n:06d}", "employee_name": f"Employee {n}",
+         "date": dt.date(2026, 1, 5), "status": "Present" if n % 9 else "Absent"}
+        for n in range(1, rows + 1)
+    ]
+    app = FastAPI(default_response_class=JSONResponse)
+
+    @app.get("/validated/employees", response_model=schemas.EmployeeListResponse)
+    def validated_employees():
+        responses = []
+        for emp in employees:
+            response = schemas.EmployeeResponse.model_validate(emp)
+            response.total_present_days = 3
+            responses.append(response)
+        return schemas.EmployeeListResponse(total=rows, employees=responses, next_cursor=None)
+
+    @app.get("/trusted/employees", response_model=schemas.EmployeeListResponse)
+    def trusted_employees(response: Response):
+        responses = [
+            schemas.EmployeeResponse.model_construct(
+                id=emp.id, employee_id=emp.employee_id, full_name=emp.full_name, email=emp.email,
+                department=emp.department, created_at=emp.created_at, total_present_days=3,
+            )
+            for emp in employees
+        ]
+        result = schemas.EmployeeListResponse.model_construct(total=rows, employees=responses, next_cursor=None)
+        return trusted_json(result, response)
+
+    @app.get("/validated/attendance", response_model=schemas.AttendanceListResponse)
+    def validated_attendance():
+        records = [schemas.AttendanceResponse.model_validate(row) for row in attendance]
+        return schemas.AttendanceListResponse(total=rows, records=records, next_cursor=None)
+
+    @app.get("/trusted/attendance", response_model=schemas.AttendanceListResponse)
+    def trusted_attendance(response: Response):
+        return trusted_json({"total": rows, "records": attendance, "next_cursor": None}, response)
+
+    return app
+
+
+def _median_ms(client: TestClient, path: str, repeat: int) -> float:
+    client.get(path).raise_for_status()  # Warm up
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        client.get(path).raise_for_status()
+        timings.append(time.perf_counter() - started)
+    return statistics.median(timings) * 1000
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=15)
+    args = parser.parse_args()
+
+    client = TestClient(_build_app(args.rows))
+    print(f"{'list':>12} {'validated ms':>13} {'trusted ms':>11} {'speedup':>8}")
+    for name in ("employees", "attendance"):
+        validated = _median_ms(client, f"/validated/{name}", args.repeat)
+        trusted = _median_ms(client, f"/trusted/{name}", args.repeat)
+        assert client.get(f"/validated/{name}").json() == client.get(f"/trusted/{name}").json()
+        print(f"{name:>12} {validated:>13.1f} {trusted:>11.1f} {validated / trusted:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
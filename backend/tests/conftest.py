@@ -0,0 +1,28 @@
+"""
+Shared pytest fixtures: point the app at an in-memory SQLite database before it is imported.
+"""
+import os
+import sys
+
+os.environ["DATABASE_URL"] = "sqlite://"
+
+# Add backend directory to path so app modules can be imported
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pytest  # noqa: E402
+
+from app.database import Base, SessionLocal, engine  # noqa: E402
+from app.utils.cache import employee_cache  # noqa: E402
+
+
+@pytest.fixture
+def db():
+    """A session bound to a freshly created, empty schema."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    employee_cache.invalidate("employee")  # Primary keys are reused by the new schema
+    session = SessionLocal()
+    try:
+        yield session
+    finally:
+        session.close()
@@ -0,0 +1,102 @@
+"""
+GET /attendance/export: NDJSON and CSV output, date and department filters, range validation.
+"""
+import csv
+import datetime as dt
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.routers import attendance
+
+DAY = dt.date(2026, 4, 6)
+COLUMNS = ["id", "employee_id", "employee_string_id", "employee_name", "date", "status"]
+
+
+@pytest.fixture
+def client(db):
+    """EMP1 (IT) and EMP2 (Ops), each marked on DAY, DAY+1 and DAY+2."""
+    client = TestClient(app)
+    for n, department in ((1, "IT"), (2, "Ops")):
+        client.post("/employees/", json={"employee_id": f"EMP{n}", "full_name": f"Employee {n}",
+                                          "email": f"e{n}@example.com", "department": department})
+    client.post("/attendance/bulk", json={"records": [
+        {"employee_id": f"EMP{n}", "date": str(DAY + dt.timedelta(days=offset)),
+         "status": "Present" if n == 1 else "Absent"}
+        for offset in range(3)
+        for n in (1, 2)
+    ]})
+    return client
+
+
+def _ndjson(response) -> list[dict]:
+    return [json.loads(line) for line in response.text.splitlines() if line]
+
+
+def test_ndjson_is_the_default(client):
+    response = client.get("/attendance/export")
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    assert response.headers["content-disposition"] == 'attachment; filename="attendance.ndjson"'
+    records = _ndjson(response)
+    assert len(records) == 6
+    assert list(records[0]) == COLUMNS
+    assert [(r["date"], r["employee_string_id"]) for r in records[:2]] == [(str(DAY), "EMP1"), (str(DAY), "EMP2")]
+    assert [r["date"] for r in records] == sorted(r["date"] for r in records)  # Oldest first
+
+
+def test_csv_has_a_header_and_one_row_per_record(client):
+    response = client.get("/attendance/export", params={"format": "csv"})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.headers["content-disposition"] == 'attachment; filename="attendance.csv"'
+    rows = list(csv.reader(io.StringIO(response.text)))
+    assert rows[0] == COLUMNS
+    assert len(rows) == 7
+    assert rows[1][2:] == ["EMP1", "Employee 1", str(DAY), "Present"]
+
+
+@pytest.mark.parametrize("fmt", ["ndjson", "csv"])
+def test_output_spanning_several_chunks_is_complete(client, monkeypatch, fmt):
+    monkeypatch.setattr(attendance, "EXPORT_CHUNK_ROWS", 4)  # 6 rows: one full chunk plus a remainder
+    response = client.get("/attendance/export", params={"format": fmt})
+    lines = response.text.splitlines()
+    assert len(lines) == (7 if fmt == "csv" else 6)
+    assert len(set(lines)) == len(lines)
+
+
+@pytest.mark.parametrize(
+    "params, expected",
+    [
+        ({"date_from": str(DAY + dt.timedelta(days=1))}, {(1, "EMP1"), (1, "EMP2"), (2, "EMP1"), (2, "EMP2")}),
+        ({"date_to": str(DAY)}, {(0, "EMP1"), (0, "EMP2")}),
+        ({"date_from": str(DAY + dt.timedelta(days=1)), "date_to": str(DAY + dt.timedelta(days=1))},
+         {(1, "EMP1"), (1, "EMP2")}),
+        ({"department": "Ops"}, {(0, "EMP2"), (1, "EMP2"), (2, "EMP2")}),
+        ({"department": "Ops", "date_from": str(DAY + dt.timedelta(days=2))}, {(2, "EMP2")}),
+        ({"department": "Finance"}, set()),
+    ],
+    ids=["from", "to", "single day", "department", "department and from", "unknown department"],
+)
+def test_filters(client, params, expected):
+    records = _ndjson(client.get("/attendance/export", params=params))
+    assert {((dt.date.fromisoformat(r["date"]) - DAY).days, r["employee_string_id"]) for r in records} == expected
+
+
+def test_empty_csv_export_still_has_the_header(client):
+    response = client.get("/attendance/export", params={"format": "csv", "department": "Finance"})
+    assert list(csv.reader(io.StringIO(response.text))) == [COLUMNS]
+
+
+def test_inverted_range_is_a_400(client):
+    response = client.get("/attendance/export", params={"date_from": str(DAY), "date_to": str(DAY - dt.timedelta(days=1))})
+    assert response.status_code == 400
+    assert response.json()["detail"] == "date_from must be on or before date_to."
+
+
+@pytest.mark.parametrize("params", [{"format": "xlsx"}, {"date_from": "yesterday"}])
+def test_invalid_parameters_are_a_422(client, params):
+    assert client.get("/attendance/export", params=params).status_code == 422
@@ -0,0 +1,153 @@
+"""
+POST /attendance modes (insert / skip / upsert) and concurrent submissions for one key.
+
+The concurrency tests run crud.mark_attendance from many threads against a
+file-backed SQLite database with a real connection pool. Each thread gets its
+own session, like concurrent requests. (The shared in-memory test database
+is a single connection.)
+"""
+import datetime as dt
+import threading
+from collections import Counter
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func
+from sqlalchemy.orm import sessionmaker
+
+from app import crud, models, schemas
+from app.database import Base
+from app.main import app
+from app.utils.cache import employee_cache
+
+DAY = dt.date(2026, 3, 2)
+THREADS = 16
+
+
+def _employee(db, employee_id: str = "EMP001") -> None:
+    crud.create_employee(
+        db,
+        schemas.EmployeeCreate(employee_id=employee_id, full_name="Ada", email=f"{employee_id}@example.com", department="IT"),
+    )
+
+
+def _rollup_counts(db) -> tuple[int, int, int, int]:
+    """(present, absent) from the employee totals columns, then (present, absent) from the daily summary."""
+    totals = db.query(
+        func.coalesce(func.sum(models.Employee.total_present), 0),
+        func.coalesce(func.sum(models.Employee.total_absent), 0),
+    ).one()
+    daily = db.query(
+        func.coalesce(func.sum(models.AttendanceDailySummary.present), 0),
+        func.coalesce(func.sum(models.AttendanceDailySummary.absent), 0),
+    ).one()
+    return (*totals, *daily)
+
+
+@pytest.fixture
+def client(db):
+    _employee(db)
+    return TestClient(app)
+
+
+def _post(client, status: str, mode: str = None):
+    url = "/attendance/" + (f"?mode={mode}" if mode else "")
+    return client.post(url, json={"employee_id": "EMP001", "date": str(DAY), "status": status})
+
+
+def test_insert_mode_rejects_duplicates(client):
+    assert _post(client, "Present").status_code == 201
+    response = _post(client, "Absent")
+    assert response.status_code == 409
+    assert "already marked as 'Present'" in response.json()["detail"]
+
+
+def test_skip_mode_returns_existing_record_unchanged(client):
+    created = _post(client, "Present", "skip")
+    skipped = _post(client, "Absent", "skip")
+    assert (created.status_code, skipped.status_code) == (201, 200)
+    assert skipped.json() == created.json()
+
+
+def test_upsert_mode_overwrites_status_and_rollups(client, db):
+    created = _post(client, "Present", "upsert")
+    updated = _post(client, "Absent", "upsert")
+    unchanged = _post(client, "Absent", "upsert")
+
+    assert (created.status_code, updated.status_code, unchanged.status_code) == (201, 200, 200)
+    assert updated.json()["id"] == created.json()["id"]
+    assert updated.json()["status"] == unchanged.json()["status"] == "Absent"
+    assert _rollup_counts(db) == (0, 1, 0, 1)
+
+
+def test_unknown_employee_is_404_in_every_mode(client):
+    for mode in crud.ATTENDANCE_MODES:
+        response = client.post(
+            f"/attendance/?mode={mode}", json={"employee_id": "NOPE", "date": str(DAY), "status": "Present"}
+        )
+        assert response.status_code == 404
+
+
+@pytest.fixture
+def pooled_sessions(tmp_path):
+    """sessionmaker over a file-backed SQLite database holding one employee."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'concurrency.db'}",
+        connect_args={"check_same_thread": False, "timeout": 30},
+        pool_size=THREADS,
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    employee_cache.invalidate("employee")
+    with Session() as db:
+        _employee(db)
+    yield Session
+    employee_cache.invalidate("employee")
+    engine.dispose()
+
+
+def _hammer(Session, mode: str) -> list:
+    """Mark EMP001 on DAY from THREADS threads at once; returns each call's result or exception."""
+    barrier = threading.Barrier(THREADS)
+    results = [None] * THREADS
+
+    def worker(n: int) -> None:
+        payload = schemas.AttendanceCreate(
+            employee_id="EMP001", date=DAY, status="Present" if n % 2 else "Absent"
+        )
+        with Session() as db:
+            barrier.wait()
+            try:
+                results[n] = crud.mark_attendance(db, payload, mode)
+            except Exception as exc:  # Collected and asserted on below
+                results[n] = exc
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+@pytest.mark.parametrize("mode", crud.ATTENDANCE_MODES)
+def test_concurrent_marks_for_one_key_create_exactly_one_record(pooled_sessions, mode):
+    results = _hammer(pooled_sessions, mode)
+
+    outcomes = Counter(
+        "created" if isinstance(r, tuple) and r[1]
+        else "existing" if isinstance(r, tuple)
+        else r.status_code if isinstance(r, HTTPException)
+        else repr(r)
+        for r in results
+    )
+    expected_other = 409 if mode == "insert" else "existing"
+    assert outcomes == {"created": 1, expected_other: THREADS - 1}
+
+    with pooled_sessions() as db:
+        records = db.query(models.Attendance.status).all()
+        assert len(records) == 1
+        # Rollups agree with the one surviving record, however many times it flipped
+        present = int(records[0].status == "Present")
+        assert _rollup_counts(db) == (present, 1 - present, present, 1 - present)
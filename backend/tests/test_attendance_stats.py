@@ -0,0 +1,111 @@
+"""
+/attendance/stats/*: zero-filled results, range validation and the closed-range memo.
+"""
+import datetime as dt
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import models, rollups
+from app.core.config import settings
+from app.main import app
+from app.utils import cache
+from app.utils.cache import stats_cache
+
+TODAY = dt.date.today()
+START = TODAY - dt.timedelta(days=10)
+END = TODAY - dt.timedelta(days=6)  # Closed range: memoized
+RANGE = {"date_from": str(START), "date_to": str(END)}
+STATS_ROUTES = ("/attendance/stats/employees", "/attendance/stats/departments", "/attendance/stats/daily")
+NAMESPACES = ("get_employee_attendance_stats", "get_department_attendance_stats", "get_daily_attendance_stats")
+
+
+@pytest.fixture
+def client(db):
+    """EMP1 (IT) present on START, absent the day after; EMP2 (Ops) has no records."""
+    stats_cache.invalidate(*NAMESPACES)
+    client = TestClient(app)
+    for n, department in ((1, "IT"), (2, "Ops")):
+        client.post("/employees/", json={"employee_id": f"EMP{n}", "full_name": f"Employee {n}",
+                                          "email": f"e{n}@example.com", "department": department})
+    for offset, status in ((0, "Present"), (1, "Absent")):
+        client.post("/attendance/", json={"employee_id": "EMP1", "date": str(START + dt.timedelta(days=offset)),
+                                          "status": status})
+    yield client
+    stats_cache.invalidate(*NAMESPACES)
+
+
+def _mark_elsewhere(db, day: dt.date) -> None:
+    """Write attendance for EMP1 the way another worker would: this process's data versions do not move."""
+    employee = db.query(models.Employee).filter_by(employee_id="EMP1").one()
+    db.add(models.Attendance(employee_id=employee.id, date=day, status="Present"))
+    rollups.apply_attendance(db, [(employee.id, employee.department, day, "Present")])
+    db.commit()
+
+
+def test_daily_stats_zero_fill_every_day(client):
+    days = client.get("/attendance/stats/daily", params=RANGE).json()["days"]
+    assert [day["date"] for day in days] == [str(START + dt.timedelta(days=n)) for n in range(5)]
+    assert [(day["present"], day["absent"]) for day in days] == [(1, 0), (0, 1), (0, 0), (0, 0), (0, 0)]
+    assert [day["attendance_rate"] for day in days] == [1.0, 0.0, None, None, None]
+
+
+def test_employees_without_records_report_zero_counts(client):
+    employees = client.get("/attendance/stats/employees", params=RANGE).json()["employees"]
+    assert [(e["employee_id"], e["present"], e["absent"], e["attendance_rate"]) for e in employees] == [
+        ("EMP1", 1, 1, 0.5),
+        ("EMP2", 0, 0, None),
+    ]
+    departments = client.get("/attendance/stats/departments", params=RANGE).json()["departments"]
+    assert [d["department"] for d in departments] == ["IT"]  # Departments without records are left out
+
+
+@pytest.mark.parametrize("route", STATS_ROUTES)
+def test_reversed_range_is_a_400(client, route):
+    response = client.get(route, params={"date_from": str(END), "date_to": str(START)})
+    assert response.status_code == 400
+    assert "date_from must be on or before date_to" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("route", STATS_ROUTES)
+def test_range_longer_than_the_maximum_is_a_400(client, monkeypatch, route):
+    monkeypatch.setattr(settings, "STATS_MAX_RANGE_DAYS", 5)
+    assert client.get(route, params=RANGE).status_code == 200  # 5 days inclusive
+    response = client.get(route, params={"date_from": str(START - dt.timedelta(days=1)), "date_to": str(END)})
+    assert response.status_code == 400
+    assert "at most 5 days" in response.json()["detail"]
+
+
+@pytest.mark.parametrize("route", STATS_ROUTES)
+def test_missing_range_is_a_422(client, route):
+    assert client.get(route, params={"date_from": str(START)}).status_code == 422
+
+
+def _present_on_day_three(client) -> int:
+    return client.get("/attendance/stats/daily", params=RANGE).json()["days"][2]["present"]
+
+
+def test_write_to_a_past_date_through_this_worker_invalidates_the_memo(client):
+    assert _present_on_day_three(client) == 0
+    client.post("/attendance/", json={"employee_id": "EMP2", "date": str(START + dt.timedelta(days=2)),
+                                      "status": "Present"})
+    assert _present_on_day_three(client) == 1
+
+
+def test_write_through_another_worker_is_seen_after_the_ttl(client, db, monkeypatch):
+    assert _present_on_day_three(client) == 0
+    _mark_elsewhere(db, START + dt.timedelta(days=2))
+    assert _present_on_day_three(client) == 0  # Still memoized here
+
+    expired = time.monotonic() + stats_cache.ttl_seconds + 1
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: expired))
+    assert _present_on_day_three(client) == 1
+
+
+def test_ranges_reaching_today_are_not_memoized(client, db):
+    params = {"date_from": str(START), "date_to": str(TODAY)}
+    assert client.get("/attendance/stats/daily", params=params).json()["days"][2]["present"] == 0
+    _mark_elsewhere(db, START + dt.timedelta(days=2))
+    assert client.get("/attendance/stats/daily", params=params).json()["days"][2]["present"] == 1
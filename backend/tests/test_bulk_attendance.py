@@ -0,0 +1,131 @@
+"""
+POST /attendance/bulk: per-item outcomes, the duplicate probe and the response status.
+"""
+import datetime as dt
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, text
+
+from app import crud, models
+from app.database import engine
+from app.main import app
+
+DAY = dt.date(2026, 2, 2)
+
+
+@pytest.fixture
+def client(db):
+    """EMP1 and EMP2, each already marked on DAY."""
+    client = TestClient(app)
+    for n in (1, 2):
+        client.post("/employees/", json={"employee_id": f"EMP{n}", "full_name": f"Employee {n}",
+                                          "email": f"e{n}@example.com", "department": "IT"})
+        client.post("/attendance/", json={"employee_id": f"EMP{n}", "date": str(DAY), "status": "Present"})
+    return client
+
+
+def _record(employee_id: str, day: dt.date, status: str = "Present") -> dict:
+    return {"employee_id": employee_id, "date": str(day), "status": status}
+
+
+def test_outcomes_and_201_when_something_was_created(client):
+    later = DAY + dt.timedelta(days=1)
+    response = client.post("/attendance/bulk", json={"records": [
+        _record("EMP1", DAY),              # Already marked
+        _record("EMP1", later),
+        _record("EMP1", later, "Absent"),  # Repeat within the request
+        _record("EMP9", later),
+    ]})
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["created"], body["duplicates"], body["unknown_employees"]) == (1, 2, 1)
+    assert [r["result"] for r in body["results"]] == ["duplicate", "created", "duplicate", "unknown_employee"]
+
+
+@pytest.mark.parametrize(
+    "records",
+    [[_record("EMP1", DAY), _record("EMP2", DAY)], [_record("EMP9", DAY)]],
+    ids=["all duplicates", "all unknown"],
+)
+def test_200_when_nothing_was_created(client, records):
+    response = client.post("/attendance/bulk", json={"records": records})
+    assert response.status_code == 200
+    assert response.json()["created"] == 0
+
+
+def test_duplicate_probe_binds_only_the_requested_pairs(client):
+    # Every day between the first and last date is marked for both employees;
+    # none of those rows should be fetched, only the two pairs asked for.
+    for offset in range(1, 30):
+        client.post("/attendance/bulk", json={"records": [
+            _record("EMP1", DAY + dt.timedelta(days=offset)), _record("EMP2", DAY + dt.timedelta(days=offset)),
+        ]})
+    last = DAY + dt.timedelta(days=40)
+    probes = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().startswith("SELECT") and "FROM attendance" in statement:
+            probes.append(parameters)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.post("/attendance/bulk", json={"records": [
+            _record("EMP1", DAY), _record("EMP2", last), _record("EMP2", last),
+        ]})
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.json()["results"][0]["result"] == "duplicate"
+    assert len(probes) == 1
+    assert sorted(zip(probes[0][::2], probes[0][1::2])) == [(1, str(DAY)), (2, str(last))]
+
+
+@pytest.fixture
+def foreign_keys(db):
+    """Enforce foreign keys on the shared in-memory connection (SQLite leaves them off)."""
+    db.execute(text("PRAGMA foreign_keys=ON"))
+    yield
+    db.execute(text("PRAGMA foreign_keys=OFF"))
+
+
+def _deleted_by_another_worker(db, employee_id: str) -> None:
+    """Delete the row directly, as another worker would: this process's employee_cache keeps its ref."""
+    db.query(models.Attendance).filter(
+        models.Attendance.employee_id == crud.resolve_employee(db, employee_id).id
+    ).delete(synchronize_session=False)
+    db.query(models.Employee).filter(models.Employee.employee_id == employee_id).delete(synchronize_session=False)
+    db.commit()
+
+
+def test_employee_deleted_elsewhere_is_a_404_not_a_409(client, db, foreign_keys):
+    later = DAY + dt.timedelta(days=1)
+    crud.resolve_employees(db, ["EMP1", "EMP2"])  # Both cached
+    _deleted_by_another_worker(db, "EMP2")
+
+    records = [_record("EMP1", later), _record("EMP2", later)]
+    response = client.post("/attendance/bulk", json={"records": records})
+    assert response.status_code == 404
+    assert "EMP2" in response.json()["detail"] and "EMP1" not in response.json()["detail"]
+
+    # The stale ref was dropped: EMP2 is now reported per item and EMP1 goes through
+    retried = client.post("/attendance/bulk", json={"records": records})
+    assert retried.status_code == 201
+    assert [r["result"] for r in retried.json()["results"]] == ["created", "unknown_employee"]
+
+
+def test_conflict_with_every_employee_present_stays_a_409(client, db, monkeypatch):
+    later = DAY + dt.timedelta(days=1)
+    # A concurrent request marks EMP1 after this one probed for duplicates
+    probe = crud._classify_bulk_items
+
+    def classify_then_race(*args):
+        outcome = probe(*args)
+        db.add(models.Attendance(employee_id=crud.resolve_employee(db, "EMP1").id, date=later, status="Absent"))
+        db.commit()
+        return outcome
+
+    monkeypatch.setattr(crud, "_classify_bulk_items", classify_then_race)
+    response = client.post("/attendance/bulk", json={"records": [_record("EMP1", later)]})
+    assert response.status_code == 409
+    assert "concurrently" in response.json()["detail"]
@@ -0,0 +1,146 @@
+"""
+CompressionMiddleware: negotiation, size threshold, streamed bodies and ETag handling.
+"""
+import asyncio
+import datetime as dt
+import zlib
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from starlette.applications import Starlette
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app import models, rollups
+from app.main import app
+from app.utils.compression import CompressionMiddleware, available_encodings, negotiate
+
+ENCODINGS = available_encodings()
+
+
+@pytest.fixture
+def client(db):
+    """The app over 40 employees with 5 days of attendance each."""
+    today = dt.date.today()
+    db.execute(
+        insert(models.Employee),
+        [
+            {"employee_id": f"EMP{pk:05d}", "full_name": f"Employee {pk}",
+             "email": f"emp{pk}@example.com", "department": "Engineering"}
+            for pk in range(1, 41)
+        ],
+    )
+    db.execute(
+        insert(models.Attendance),
+        [
+            {"employee_id": pk, "date": today - dt.timedelta(days=offset), "status": "Present"}
+            for pk in range(1, 41)
+            for offset in range(1, 6)
+        ],
+    )
+    db.commit()
+    rollups.rebuild(db)
+    return TestClient(app)
+
+
+@pytest.mark.parametrize(
+    "accept_encoding, expected",
+    [
+        ("gzip, deflate, br", "br"),
+        ("gzip;q=1.0, br;q=0.5", "gzip"),
+        ("br;q=0, gzip", "gzip"),
+        ("*", "br"),
+        ("*;q=0", None),
+        ("identity", None),
+        ("", None),
+    ],
+)
+def test_negotiate(accept_encoding, expected):
+    assert negotiate(accept_encoding, ("br", "gzip")) == expected
+
+
+@pytest.mark.parametrize("encoding", ENCODINGS)
+def test_large_json_is_compressed_and_round_trips(client, encoding):
+    identity = client.get("/attendance/?limit=200", headers={"Accept-Encoding": "identity"})
+    response = client.get("/attendance/?limit=200", headers={"Accept-Encoding": encoding})
+
+    assert "content-encoding" not in identity.headers
+    assert response.headers["content-encoding"] == encoding
+    assert "Accept-Encoding" in response.headers["vary"]
+    assert response.num_bytes_downloaded < len(identity.content) / 4
+    assert response.json() == identity.json()
+
+
+def test_compressed_response_has_weak_etag_that_still_revalidates(client):
+    response = client.get("/attendance/?limit=200", headers={"Accept-Encoding": "gzip"})
+    etag = response.headers["etag"]
+    assert etag.startswith('W/"')
+
+    revalidated = client.get("/attendance/?limit=200", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"] == etag
+
+
+def test_small_response_is_not_compressed(client):
+    response = client.get("/health", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["content-length"] == str(len(response.content))
+
+
+def test_streamed_export_is_compressed_without_content_length(client):
+    identity = client.get("/attendance/export?format=ndjson", headers={"Accept-Encoding": "identity"})
+    response = client.get("/attendance/export?format=ndjson", headers={"Accept-Encoding": "gzip"})
+
+    assert response.headers["content-encoding"] == "gzip"
+    assert "content-length" not in response.headers
+    assert response.text == identity.text
+
+
+def _stream_app() -> Starlette:
+    async def chunks():
+        for n in range(3):
+            yield f"data: {n}\n\n" * 200
+
+    async def events(request):
+        return StreamingResponse(chunks(), media_type="text/event-stream")
+
+    async def stream(request):
+        return StreamingResponse(chunks(), media_type="text/plain")
+
+    async def precompressed(request):
+        return PlainTextResponse("x" * 5000, headers={"Content-Encoding": "identity"})
+
+    routes = [Route("/events", events), Route("/stream", stream), Route("/precompressed", precompressed)]
+    return CompressionMiddleware(Starlette(routes=routes), minimum_size=10, encodings=("gzip",))
+
+
+def test_each_streamed_chunk_is_flushed():
+    scope = {
+        "type": "http", "method": "GET", "path": "/stream", "raw_path": b"/stream", "root_path": "",
+        "query_string": b"", "headers": [(b"accept-encoding", b"gzip")], "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1234), "http_version": "1.1",
+    }
+    messages = []
+
+    async def receive():
+        await asyncio.sleep(60)  # Client never disconnects during the test
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        messages.append(message)
+
+    asyncio.run(_stream_app()(scope, receive, send))
+
+    bodies = [m for m in messages if m["type"] == "http.response.body"]
+    # Every yielded chunk is sent at once as a sync-flushed deflate block ...
+    assert all(m["body"].endswith(b"\x00\x00\xff\xff") for m in bodies if m.get("more_body"))
+    # ... and the whole stream decodes to the original body
+    decoded = zlib.decompress(b"".join(m["body"] for m in bodies), 16 + zlib.MAX_WBITS)
+    assert decoded == "".join(f"data: {n}\n\n" * 200 for n in range(3)).encode()
+
+
+@pytest.mark.parametrize("path", ["/events", "/precompressed"])
+def test_excluded_responses_pass_through(path):
+    response = TestClient(_stream_app()).get(path, headers={"Accept-Encoding": "gzip"})
+    assert response.headers.get("content-encoding") in (None, "identity")
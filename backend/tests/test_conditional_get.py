@@ -0,0 +1,78 @@
+"""
+ETag / If-None-Match handling (conditional_get) on the read routes.
+"""
+import datetime as dt
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import main
+from app.core.config import settings
+from app.main import app
+from app.utils import versions
+
+EMPLOYEE = {"employee_id": "EMP1", "full_name": "Ada", "email": "ada@example.com", "department": "IT"}
+
+
+@pytest.fixture
+def client(db):
+    client = TestClient(app)
+    assert client.post("/employees/", json=EMPLOYEE).status_code == 201
+    return client
+
+
+@pytest.mark.parametrize("path", ["/dashboard", "/employees/", "/attendance/", "/attendance/EMP1"])
+def test_unchanged_data_is_answered_with_304(client, path):
+    first = client.get(path)
+    etag = first.headers["etag"]  # Set by the dependency, carried through trusted_json
+    assert first.status_code == 200 and first.json()
+
+    again = client.get(path, headers={"If-None-Match": etag})
+    assert again.status_code == 304
+    # Weakened by CompressionMiddleware: the 304 may stand for a compressed body
+    assert again.headers["etag"].removeprefix("W/") == etag and again.content == b""
+    assert client.get(path, headers={"If-None-Match": f"W/{etag}"}).status_code == 304
+
+
+def test_a_write_changes_the_tag(client):
+    etag = client.get("/dashboard").headers["etag"]
+    client.post("/attendance/", json={"employee_id": "EMP1", "date": str(dt.date.today()), "status": "Present"})
+
+    response = client.get("/dashboard", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
+    assert response.json()["total_present_today"] == 1
+
+
+def test_dashboard_tag_changes_at_midnight(client, monkeypatch):
+    client.post("/attendance/", json={"employee_id": "EMP1", "date": str(dt.date.today()), "status": "Present"})
+    today = client.get("/dashboard")
+    assert today.json()["total_present_today"] == 1
+
+    tomorrow = dt.date.today() + dt.timedelta(days=1)
+    monkeypatch.setattr(main, "dt", SimpleNamespace(date=SimpleNamespace(today=lambda: tomorrow)))
+    response = client.get("/dashboard", headers={"If-None-Match": today.headers["etag"]})
+    assert response.status_code == 200
+    assert response.headers["etag"] != today.headers["etag"]
+
+
+def test_other_tags_do_not_match(client):
+    assert client.get("/dashboard", headers={"If-None-Match": '"stale-0.0"'}).status_code == 200
+    assert client.get("/dashboard", headers={"If-None-Match": "*"}).status_code == 304
+
+
+def test_tags_expire_after_the_cache_ttl(client, monkeypatch):
+    """A worker that missed another worker's write must stop answering 304 within CACHE_TTL_SECONDS."""
+    etag = client.get("/employees/").headers["etag"]
+    issued = time.time()
+    monkeypatch.setattr(versions, "time", SimpleNamespace(time=lambda: issued + settings.CACHE_TTL_SECONDS - 1))
+    revalidated = client.get("/employees/", headers={"If-None-Match": etag})
+    assert revalidated.status_code == 304
+    assert revalidated.headers["etag"].removeprefix("W/") == etag  # Not re-stamped, so polling cannot extend it
+
+    monkeypatch.setattr(versions, "time", SimpleNamespace(time=lambda: issued + settings.CACHE_TTL_SECONDS + 1))
+    response = client.get("/employees/", headers={"If-None-Match": etag})
+    assert response.status_code == 200
+    assert response.headers["etag"] != etag
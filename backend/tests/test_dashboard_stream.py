@@ -0,0 +1,219 @@
+"""
+/dashboard/stream: snapshot, then deltas from committed writes, plus the
+Broadcaster fan-out underneath it.
+
+The streaming tests drive the ASGI app directly; TestClient buffers a
+response until it ends.
+"""
+import asyncio
+import datetime as dt
+import json
+import threading
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import crud, schemas
+from app.core.config import settings
+from app.main import app
+from app.utils.cache import response_cache
+from app.utils.events import Broadcaster, dashboard_events
+
+TODAY = dt.date.today()
+YESTERDAY = TODAY - dt.timedelta(days=1)
+
+
+def _employee(db, employee_id: str) -> None:
+    crud.create_employee(
+        db,
+        schemas.EmployeeCreate(employee_id=employee_id, full_name=employee_id, email=f"{employee_id}@example.com",
+                               department="IT"),
+    )
+
+
+def _mark(db, employee_id: str, date: dt.date, status: str) -> None:
+    crud.mark_attendance(db, schemas.AttendanceCreate(employee_id=employee_id, date=date, status=status))
+
+
+def _parse(body: bytes, with_ids: bool = False) -> list[tuple]:
+    events = []
+    for block in body.split(b"\n\n"):
+        fields = dict(line.split(b": ", 1) for line in block.split(b"\n") if b": " in line and not line.startswith(b":"))
+        if b"event" in fields:
+            event = (fields[b"event"].decode(), json.loads(fields[b"data"]))
+            events.append(event + (int(fields[b"id"]),) if with_ids else event)
+    return events
+
+
+def _stream(db, actions, expected_events: int, with_ids: bool = False) -> list[tuple]:
+    """Open the stream, run each action on a worker thread once the snapshot arrived, collect events."""
+    scope = {
+        "type": "http", "method": "GET", "path": "/dashboard/stream", "raw_path": b"/dashboard/stream",
+        "root_path": "", "query_string": b"", "headers": [], "scheme": "http",
+        "server": ("test", 80), "client": ("test", 1234), "http_version": "1.1",
+    }
+    body = bytearray()
+
+    async def main():
+        disconnected, received = asyncio.Event(), asyncio.Event()
+
+        async def receive():
+            await disconnected.wait()
+            return {"type": "http.disconnect"}
+
+        async def send(message):
+            if message["type"] == "http.response.body":
+                body.extend(message.get("body", b""))
+                received.set()
+
+        task = asyncio.create_task(app(scope, receive, send))
+        async with asyncio.timeout(10):
+            while not _parse(bytes(body)):
+                received.clear()
+                await received.wait()
+            for action in actions:
+                await asyncio.to_thread(action, db)
+            while len(_parse(bytes(body))) < expected_events:
+                received.clear()
+                await received.wait()
+        disconnected.set()
+        await task
+
+    asyncio.run(main())
+    return _parse(bytes(body), with_ids)
+
+
+def _apply(dashboard: dict, event: str, data: dict) -> dict:
+    """What the frontend does with each event."""
+    if event == "snapshot":
+        return data
+    rows = {row["employee_id"]: row for row in dashboard["employees_summary"]}
+    if event == "employee_created":
+        dashboard["employees_summary"].insert(0, data)
+        dashboard["total_employees"] += 1
+    elif event == "employee_deleted":
+        dashboard["employees_summary"] = [r for r in dashboard["employees_summary"] if r["employee_id"] != data["employee_id"]]
+        dashboard["total_employees"] -= 1
+    if event in ("attendance", "employee_deleted"):
+        dashboard["total_present_today"] += data["today"]["present"]
+        dashboard["total_absent_today"] += data["today"]["absent"]
+    for employee_id, delta in data.get("employees", {}).items():
+        rows[employee_id]["total_present"] += delta["present"]
+        rows[employee_id]["total_absent"] += delta["absent"]
+    return dashboard
+
+
+@pytest.fixture
+def seeded(db, monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", False)
+    _employee(db, "EMP1")
+    _mark(db, "EMP1", TODAY, "Present")
+    return db
+
+
+def test_snapshot_then_deltas_track_the_dashboard(seeded):
+    events = _stream(
+        seeded,
+        [
+            lambda db: _mark(db, "EMP1", YESTERDAY, "Absent"),
+            lambda db: _employee(db, "EMP2"),
+            lambda db: _mark(db, "EMP2", TODAY, "Absent"),
+            lambda db: crud.delete_employee(db, "EMP1"),
+        ],
+        expected_events=5,
+    )
+
+    assert [name for name, _ in events] == [
+        "snapshot", "attendance", "employee_created", "attendance", "employee_deleted",
+    ]
+    assert events[0][1]["total_present_today"] == 1
+    assert events[1][1] == {"today": {"present": 0, "absent": 0}, "employees": {"EMP1": {"present": 0, "absent": 1}}}
+    assert events[4][1] == {"employee_id": "EMP1", "today": {"present": -1, "absent": 0}}
+
+    dashboard = None
+    for name, data in events:
+        dashboard = _apply(dashboard, name, data)
+    assert dashboard == crud.get_dashboard_data(seeded).model_dump(mode="json")
+
+
+def test_large_changes_resend_the_snapshot(seeded, monkeypatch):
+    monkeypatch.setattr(crud, "STREAM_DELTA_MAX_EMPLOYEES", 0)
+    events = _stream(seeded, [lambda db: _mark(db, "EMP1", YESTERDAY, "Present")], expected_events=2)
+    assert [name for name, _ in events] == ["snapshot", "snapshot"]
+    assert events[1][1]["employees_summary"][0]["total_present"] == 2
+
+
+def test_write_committed_during_the_snapshot_is_not_applied_twice(seeded, monkeypatch):
+    """A mark published after the stream subscribed but before its snapshot was read."""
+    read_dashboard = crud.get_dashboard_data
+    raced = []
+
+    def get_dashboard_data(db):
+        if not raced:
+            raced.append(True)
+            _mark(seeded, "EMP1", YESTERDAY, "Present")
+        return read_dashboard(db)
+
+    monkeypatch.setattr(crud, "get_dashboard_data", get_dashboard_data)
+    events = _stream(seeded, [lambda db: _mark(db, "EMP1", YESTERDAY - dt.timedelta(days=1), "Absent")],
+                     expected_events=2, with_ids=True)
+
+    (_, snapshot, snapshot_id), (name, delta, delta_id) = events
+    assert snapshot["employees_summary"][0]["total_present"] == 2  # Includes the raced mark
+    assert name == "attendance" and delta["employees"] == {"EMP1": {"present": 0, "absent": 1}}
+    assert delta_id > snapshot_id
+
+    dashboard = None
+    for name, data, _ in events:
+        dashboard = _apply(dashboard, name, data)
+    assert dashboard == crud.get_dashboard_data(seeded).model_dump(mode="json")
+
+
+def test_stream_ends_after_its_lifetime(seeded, monkeypatch):
+    monkeypatch.setattr(settings, "DASHBOARD_STREAM_MAX_SECONDS", 0)
+    response = TestClient(app).get("/dashboard/stream")
+    assert response.headers["content-type"].startswith("text/event-stream")
+    assert [name for name, _ in _parse(response.content)] == ["snapshot"]
+    assert dashboard_events.subscribers == 0
+
+
+def test_broadcaster_fans_out_and_detects_overruns():
+    broadcaster = Broadcaster(backlog=2)
+
+    async def main():
+        first, second = broadcaster.subscribe(), broadcaster.subscribe()
+        assert await broadcaster.wait(first, timeout=0.01) == ([], first)  # Heartbeat timeout
+
+        waiters = [asyncio.create_task(broadcaster.wait(cursor, timeout=5)) for cursor in (first, second)]
+        await asyncio.sleep(0)
+        thread = threading.Thread(target=broadcaster.publish, args=("ping", {"n": 1}))
+        thread.start()
+        thread.join()
+        (frames_a, cursor), (frames_b, _) = await asyncio.gather(*waiters)
+        assert frames_a == frames_b == [(1, b'id: 1\nevent: ping\ndata: {"n":1}\n\n')]
+
+        for n in range(3):
+            broadcaster.publish("ping", {"n": n})
+        assert (await broadcaster.wait(cursor, timeout=0))[0] is None  # Fell behind the backlog
+
+    asyncio.run(main())
+
+
+def test_publish_without_subscribers_is_a_no_op():
+    broadcaster = Broadcaster(backlog=2)
+    broadcaster.publish("ping", {})
+    assert broadcaster.cursor() == 0
+
+
+def test_version_is_hidden_while_a_write_is_in_flight():
+    broadcaster = Broadcaster(backlog=2)
+
+    async def main():
+        broadcaster.subscribe()
+        assert broadcaster.version() == 0
+        with broadcaster.writing():
+            assert broadcaster.version() is None  # Committed, not yet published
+            broadcaster.publish("ping", {})
+        assert broadcaster.version() == 1
+
+    asyncio.run(main())
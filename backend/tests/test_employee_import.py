@@ -0,0 +1,65 @@
+"""
+POST /employees/import: row validation and clashes with concurrent writers.
+"""
+import io
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import crud, models
+from app.main import app
+
+
+def _ndjson(rows: list[dict]) -> dict:
+    body = "\n".join(json.dumps(row) for row in rows)
+    return {"file": ("employees.ndjson", io.BytesIO(body.encode()), "application/x-ndjson")}
+
+
+def _row(n: int, **overrides) -> dict:
+    return {"employee_id": f"EMP{n}", "full_name": f"Employee {n}", "email": f"e{n}@example.com",
+            "department": "IT", **overrides}
+
+
+@pytest.fixture
+def client(db):
+    db.add(models.Employee(**_row(1)))
+    db.commit()
+    return TestClient(app)
+
+
+def test_invalid_and_duplicate_rows_are_reported(client):
+    response = client.post(
+        "/employees/import",
+        files=_ndjson([_row(2), _row(1, email="x@example.com"), _row(3, email="e2@example.com"), _row(4, email="bad")]),
+    )
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["total_rows"], body["imported"], body["failed"]) == (4, 1, 3)
+    assert [err["row"] for err in body["errors"]] == [2, 3, 4]
+
+
+def test_clash_with_a_concurrent_writer_is_409_not_500(client, db, monkeypatch):
+    # Pretend the clash check ran before another request created EMP1
+    monkeypatch.setattr(crud, "_existing_values", lambda db, column, values: set())
+    response = client.post("/employees/import", files=_ndjson([_row(2), _row(1, email="new@example.com")]))
+    assert response.status_code == 409
+    assert db.query(models.Employee).count() == 1  # The whole import rolled back
+
+
+def test_clash_in_an_earlier_batch_is_409(client, db, monkeypatch):
+    monkeypatch.setattr(crud, "IMPORT_BATCH_SIZE", 1)
+    monkeypatch.setattr(crud, "_existing_values", lambda db, column, values: set())
+    response = client.post("/employees/import", files=_ndjson([_row(1, email="new@example.com"), _row(2)]))
+    assert response.status_code == 409
+    assert db.query(models.Employee).count() == 1
+
+
+@pytest.mark.parametrize("rows", [4, 5])
+def test_rows_are_validated_and_inserted_in_batches(client, monkeypatch, rows):
+    monkeypatch.setattr(crud, "IMPORT_BATCH_SIZE", 2)
+    response = client.post("/employees/import", files=_ndjson([_row(n) for n in range(2, rows + 2)] + [_row(1)]))
+    assert response.status_code == 201
+    body = response.json()
+    assert (body["total_rows"], body["imported"], body["failed"]) == (rows + 1, rows, 1)
+    assert client.get("/employees/").json()["total"] == rows + 1
@@ -0,0 +1,93 @@
+"""
+employee_cache: employee_id -> EmployeeRef lookups on the attendance paths.
+"""
+import datetime as dt
+from contextlib import contextmanager
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import event, insert
+
+from app import crud, models
+from app.database import engine
+from app.main import app
+from app.utils.cache import employee_cache
+
+
+@pytest.fixture
+def client(db):
+    db.execute(
+        insert(models.Employee),
+        [
+            {"employee_id": f"EMP{pk:03d}", "full_name": f"Employee {pk}",
+             "email": f"emp{pk}@example.com", "department": "Engineering"}
+            for pk in range(1, 6)
+        ],
+    )
+    db.commit()
+    return TestClient(app)
+
+
+@contextmanager
+def count_statements():
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+
+def test_warm_cache_saves_the_employee_query_on_attendance_writes(client, db):
+    day = dt.date.today()
+    with count_statements() as cold:
+        client.post("/attendance/", json={"employee_id": "EMP001", "date": str(day), "status": "Present"})
+
+    assert crud.warm_employee_cache(db) == 5
+    with count_statements() as warm:
+        response = client.post("/attendance/", json={"employee_id": "EMP002", "date": str(day), "status": "Present"})
+
+    assert response.status_code == 201
+    assert response.json()["employee_name"] == "Employee 2"
+    assert len(warm) == len(cold) - 1
+
+
+def test_resolve_employees_fetches_only_misses_in_one_query(client, db):
+    crud.resolve_employee(db, "EMP001")
+    with count_statements() as statements:
+        refs = crud.resolve_employees(db, ["EMP001", "EMP002", "EMP003", "NOPE"])
+
+    assert len(statements) == 1
+    assert sorted(refs) == ["EMP001", "EMP002", "EMP003"]
+    assert refs["EMP002"] == crud.EmployeeRef(2, "EMP002", "Employee 2", "Engineering")
+
+
+def test_delete_and_recreate_discard_the_cached_employee(client, db):
+    day = str(dt.date.today())
+    crud.warm_employee_cache(db)
+
+    assert client.delete("/employees/EMP001").status_code == 200
+    response = client.post("/attendance/", json={"employee_id": "EMP001", "date": day, "status": "Present"})
+    assert response.status_code == 404
+
+    created = client.post(
+        "/employees/",
+        json={"employee_id": "EMP001", "full_name": "Rehired", "email": "rehired@example.com", "department": "Ops"},
+    )
+    response = client.post("/attendance/", json={"employee_id": "EMP001", "date": day, "status": "Present"})
+    assert response.status_code == 201
+    assert response.json()["employee_id"] == created.json()["id"]
+    assert response.json()["employee_name"] == "Rehired"
+
+
+def test_values_read_before_a_delete_are_not_cached(client, db):
+    generation = employee_cache.generation("employee")
+    employee_cache.discard("employee", {"employee_id": "EMP003"})
+    ref = crud.EmployeeRef(3, "EMP003", "Employee 3", "Engineering")
+    employee_cache.set("employee", {"employee_id": "EMP003"}, ref, generation)
+
+    assert employee_cache.get("employee", {"employee_id": "EMP003"}) is None
@@ -0,0 +1,104 @@
+"""
+Denormalized employees.total_present / total_absent: kept exact by the write
+paths, read without extra queries, and reconciled against attendance.
+"""
+import datetime as dt
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import update
+
+from app import models, rollups
+from app.main import app
+from app.utils.cache import response_cache
+
+DAY = dt.date(2026, 3, 2)
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    monkeypatch.setattr(response_cache, "enabled", False)
+    client = TestClient(app)
+    for n in range(1, 4):
+        client.post(
+            "/employees/",
+            json={"employee_id": f"EMP{n}", "full_name": f"Employee {n}", "email": f"e{n}@example.com",
+                  "department": "IT"},
+        )
+    return client
+
+
+def _mark(client, employee_id: str, day: dt.date, status: str, mode: str = "insert"):
+    return client.post(f"/attendance/?mode={mode}", json={"employee_id": employee_id, "date": str(day), "status": status})
+
+
+def _totals(db) -> dict[str, tuple[int, int]]:
+    db.expire_all()
+    return {e.employee_id: (e.total_present, e.total_absent) for e in db.query(models.Employee)}
+
+
+def test_write_paths_keep_totals_exact(client, db):
+    _mark(client, "EMP1", DAY, "Present")
+    _mark(client, "EMP1", DAY + dt.timedelta(days=1), "Absent")
+    _mark(client, "EMP2", DAY, "Present")
+    bulk = client.post("/attendance/bulk", json={"records": [
+        {"employee_id": "EMP2", "date": str(DAY + dt.timedelta(days=1)), "status": "Present"},
+        {"employee_id": "EMP3", "date": str(DAY), "status": "Absent"},
+    ]})
+    assert bulk.json()["created"] == 2
+    _mark(client, "EMP1", DAY, "Absent", mode="upsert")  # Flips Present -> Absent
+    _mark(client, "EMP2", DAY, "Absent", mode="skip")    # Already marked: no change
+
+    assert _totals(db) == {"EMP1": (0, 2), "EMP2": (2, 0), "EMP3": (0, 1)}
+    assert rollups.reconcile(db) == []
+
+    listed = {e["employee_id"]: e["total_present_days"] for e in client.get("/employees/").json()["employees"]}
+    assert listed == {"EMP1": 0, "EMP2": 2, "EMP3": 0}
+    dashboard = {e["employee_id"]: (e["total_present"], e["total_absent"])
+                 for e in client.get("/dashboard").json()["employees_summary"]}
+    assert dashboard == _totals(db)
+
+    assert client.delete("/employees/EMP2").status_code == 200
+    assert rollups.reconcile(db) == []
+
+
+def test_reconcile_reports_and_repairs_drift(client, db):
+    _mark(client, "EMP1", DAY, "Present")
+    _mark(client, "EMP3", DAY, "Absent")
+    db.execute(update(models.Employee).where(models.Employee.employee_id == "EMP1").values(total_present=7))
+    db.execute(update(models.Employee).where(models.Employee.employee_id == "EMP2").values(total_absent=2))
+    db.commit()
+
+    drift = rollups.reconcile(db, chunk_size=2)  # EMP1 and EMP2 land in different chunks from EMP3
+    assert [(d["employee_id"], d["stored"], d["actual"]) for d in drift] == [
+        ("EMP1", (7, 0), (1, 0)),
+        ("EMP2", (0, 2), (0, 0)),
+    ]
+    assert _totals(db)["EMP1"] == (7, 0)  # Report only
+
+    assert len(rollups.reconcile(db, repair=True, chunk_size=2)) == 2
+    assert _totals(db) == {"EMP1": (1, 0), "EMP2": (0, 0), "EMP3": (0, 1)}
+    assert rollups.reconcile(db) == []
+
+
+def test_rebuild_recomputes_totals(client, db):
+    _mark(client, "EMP1", DAY, "Present")
+    db.execute(update(models.Employee).values(total_present=0, total_absent=5))
+    db.commit()
+
+    rollups.rebuild(db)
+    assert _totals(db) == {"EMP1": (1, 0), "EMP2": (0, 0), "EMP3": (0, 0)}
+
+
+def test_attendance_list_totals_match_the_rows(client):
+    _mark(client, "EMP1", DAY, "Present")
+    _mark(client, "EMP2", DAY, "Absent")
+    _mark(client, "EMP1", DAY + dt.timedelta(days=1), "Absent")
+    _mark(client, "EMP1", DAY, "Absent", mode="upsert")  # Status change, same row count
+    assert client.delete("/employees/EMP2").status_code == 200
+
+    assert client.get("/attendance/").json()["total"] == 2
+    assert client.get(f"/attendance/?date={DAY}").json()["total"] == 1
+    assert client.get(f"/attendance/?date={DAY + dt.timedelta(days=5)}").json()["total"] == 0
+    assert client.get("/attendance/EMP1").json()["total"] == 2
+    assert client.get(f"/attendance/EMP1?date={DAY}").json()["total"] == 1
@@ -0,0 +1,135 @@
+"""
+Group commit for POST /attendance/: crud.mark_attendance_batch semantics, the
+GroupCommitter queue, and the route with ATTENDANCE_GROUP_COMMIT on.
+"""
+import asyncio
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlalchemy.exc import IntegrityError
+
+from app import crud, rollups, schemas
+from app.database import engine
+from app.main import app
+from app.routers import attendance
+from app.utils.group_commit import GroupCommitter
+
+DAY = dt.date(2026, 3, 2)
+
+
+@pytest.fixture
+def employees(db):
+    for n in range(1, 21):
+        crud.create_employee(
+            db,
+            schemas.EmployeeCreate(employee_id=f"EMP{n}", full_name=f"Employee {n}", email=f"e{n}@example.com",
+                                   department="IT"),
+        )
+    return db
+
+
+def _item(employee_id: str, status: str, mode: str = "insert", day: dt.date = DAY):
+    return schemas.AttendanceCreate(employee_id=employee_id, date=day, status=status), mode
+
+
+def _summary(outcome) -> object:
+    if isinstance(outcome, HTTPException):
+        return outcome.status_code
+    record, created = outcome
+    return record.employee_string_id, record.status, created
+
+
+def test_batch_outcomes_match_marking_one_after_another(employees):
+    outcomes = crud.mark_attendance_batch(
+        employees,
+        [
+            _item("EMP1", "Present"),
+            _item("EMP1", "Absent"),              # Same key earlier in the batch: 409
+            _item("EMP1", "Absent", "skip"),
+            _item("EMP1", "Absent", "upsert"),    # Flips the record made by the first item
+            _item("NOPE", "Present"),
+            _item("EMP2", "Absent", "skip"),
+        ],
+    )
+    assert [_summary(o) for o in outcomes] == [
+        ("EMP1", "Present", True),
+        409,
+        ("EMP1", "Present", False),
+        ("EMP1", "Absent", False),
+        404,
+        ("EMP2", "Absent", True),
+    ]
+    assert rollups.reconcile(employees) == []
+    assert crud.get_dashboard_data(employees).employees_summary[-1].total_absent == 1
+
+
+def test_batch_falls_back_to_single_marks_on_a_constraint_error(employees, monkeypatch):
+    calls = {"n": 0}
+    real_insert = crud._insert_attendance
+
+    def flaky_insert(db, row, ignore_conflict):
+        calls["n"] += 1
+        if calls["n"] == 2:
+            raise IntegrityError("INSERT", {}, Exception("FOREIGN KEY constraint failed"))
+        return real_insert(db, row, ignore_conflict)
+
+    monkeypatch.setattr(crud, "_insert_attendance", flaky_insert)
+    outcomes = crud.mark_attendance_batch(employees, [_item("EMP1", "Present"), _item("EMP2", "Present")])
+    assert [_summary(o) for o in outcomes] == [("EMP1", "Present", True), ("EMP2", "Present", True)]
+    assert rollups.reconcile(employees) == []
+
+
+def test_committer_batches_and_propagates_failures():
+    flushed = []
+
+    async def flush(items):
+        flushed.append(list(items))
+        if "boom" in items:
+            raise RuntimeError("database down")
+        return [ValueError(item) if item == "bad" else item.upper() for item in items]
+
+    async def main():
+        committer = GroupCommitter(flush, max_batch=3, max_delay=0.05)
+        results = await asyncio.gather(
+            *(committer.submit(item) for item in ("a", "b", "bad", "c")), return_exceptions=True
+        )
+        assert results[:2] == ["A", "B"] and isinstance(results[2], ValueError) and results[3] == "C"
+        assert [len(batch) for batch in flushed] == [3, 1]
+
+        failed = await asyncio.gather(committer.submit("boom"), committer.submit("x"), return_exceptions=True)
+        assert all(isinstance(r, RuntimeError) for r in failed)
+        await committer.close()
+
+    asyncio.run(main())
+
+
+def test_route_commits_concurrent_marks_together(employees, monkeypatch):
+    committer = GroupCommitter(attendance._flush_attendance, max_batch=50, max_delay=0.05)
+    monkeypatch.setattr(attendance, "attendance_writes", committer)
+    commits = []
+
+    def count_commit(conn):
+        commits.append(conn)
+
+    event.listen(engine, "commit", count_commit)
+
+    bodies = [{"employee_id": f"EMP{n}", "date": str(DAY), "status": "Present"} for n in range(1, 21)]
+    bodies += [{"employee_id": "EMP1", "date": str(DAY), "status": "Absent"},
+               {"employee_id": "NOPE", "date": str(DAY), "status": "Absent"}]
+    try:
+        with TestClient(app) as client, ThreadPoolExecutor(len(bodies)) as pool:
+            responses = list(pool.map(lambda body: client.post("/attendance/", json=body), bodies))
+    finally:
+        event.remove(engine, "commit", count_commit)
+
+    statuses = [r.status_code for r in responses]
+    # EMP1 is marked twice: whichever request is queued second gets the 409
+    assert (statuses.count(201), statuses.count(409), statuses[-1]) == (20, 1, 404)
+    assert committer.items == len(bodies)
+    assert committer.batches < len(bodies)
+    assert len(commits) < len(bodies)
+    assert rollups.reconcile(employees) == []
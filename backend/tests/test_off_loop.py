@@ -0,0 +1,41 @@
+"""
+database.off_loop: CPU-bound steps in crud leave the event loop under DB_ASYNC.
+"""
+import asyncio
+import threading
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+
+from app.database import off_loop, run_db
+
+
+def test_runs_on_the_threadpool_under_an_async_session(tmp_path):
+    engine = create_async_engine(f"sqlite+aiosqlite:///{tmp_path / 'off_loop.db'}")
+    ticks = 0
+
+    def busy(session) -> threading.Thread:
+        return off_loop(lambda: time.sleep(0.2) or threading.current_thread())
+
+    async def ticker():
+        nonlocal ticks
+        while True:
+            await asyncio.sleep(0.01)
+            ticks += 1
+
+    async def main():
+        task = asyncio.create_task(ticker())
+        try:
+            async with AsyncSession(engine) as db:
+                return await run_db(db, busy)
+        finally:
+            task.cancel()
+            await engine.dispose()
+
+    worker = asyncio.run(main())
+    assert worker is not threading.current_thread()
+    assert ticks >= 5  # The loop kept running while busy() slept
+
+
+def test_is_a_plain_call_on_a_sync_session(db):
+    assert off_loop(threading.current_thread) is threading.current_thread()
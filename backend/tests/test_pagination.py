@@ -0,0 +1,94 @@
+"""
+Keyset pagination: cursors, ties on the sort key, and page size clamping.
+"""
+import datetime as dt
+
+import pytest
+from fastapi import HTTPException
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+
+from app import models
+from app.core.config import settings
+from app.main import app
+from app.utils.cache import response_cache
+from app.utils.pagination import decode_cursor, encode_cursor
+
+EMPLOYEES = 7
+CREATED = dt.datetime(2026, 3, 2, 9, 30)
+DAY = dt.date(2026, 3, 2)
+
+
+@pytest.fixture
+def client(db, monkeypatch):
+    """EMPLOYEES employees created in the same second, all marked on the same day."""
+    monkeypatch.setattr(response_cache, "enabled", False)  # Rows are inserted behind the cache's back
+    db.execute(
+        insert(models.Employee),
+        [
+            {"employee_id": f"EMP{pk:03d}", "full_name": f"Employee {pk}", "email": f"emp{pk}@example.com",
+             "department": "Engineering", "created_at": CREATED}
+            for pk in range(1, EMPLOYEES + 1)
+        ],
+    )
+    db.execute(
+        insert(models.Attendance),
+        [{"employee_id": pk, "date": DAY, "status": "Present"} for pk in range(1, EMPLOYEES + 1)],
+    )
+    db.commit()
+    return TestClient(app)
+
+
+def _all_pages(client: TestClient, url: str, list_key: str, limit: int) -> list[list[int]]:
+    """Ids on every page of `url`, following next_cursor until it is null."""
+    pages, params = [], {"limit": limit}
+    while True:
+        response = client.get(url, params=params)
+        assert response.status_code == 200, response.text
+        body = response.json()
+        pages.append([item["id"] for item in body[list_key]])
+        if body["next_cursor"] is None:
+            return pages
+        params = {"limit": limit, "cursor": body["next_cursor"]}
+
+
+@pytest.mark.parametrize(
+    "sort_value, parse",
+    [(DAY, dt.date.fromisoformat), (CREATED, dt.datetime.fromisoformat)],
+    ids=["date", "datetime"],
+)
+def test_cursor_round_trips(sort_value, parse):
+    cursor = encode_cursor(sort_value, 42)
+    assert "=" not in cursor
+    assert decode_cursor(cursor, parse) == (sort_value, 42)
+
+
+@pytest.mark.parametrize("cursor", ["not-a-cursor", encode_cursor(DAY, 1)[:-3], "WyIyMDI2Il0"])
+def test_malformed_cursor_is_a_400(cursor):
+    with pytest.raises(HTTPException) as raised:
+        decode_cursor(cursor, dt.date.fromisoformat)
+    assert raised.value.status_code == 400
+
+
+@pytest.mark.parametrize(
+    "url, list_key",
+    [("/employees/", "employees"), ("/attendance/", "records"), (f"/attendance/?date={DAY}", "records")],
+)
+def test_ties_on_the_sort_key_are_paged_by_id(client, url, list_key):
+    pages = _all_pages(client, url, list_key, limit=2)
+    assert [len(page) for page in pages] == [2, 2, 2, 1]
+    ids = [row_id for page in pages for row_id in page]
+    assert ids == sorted(ids, reverse=True)
+    assert len(set(ids)) == EMPLOYEES
+
+
+def test_limit_above_the_cap_is_clamped(client, monkeypatch):
+    monkeypatch.setattr(settings, "MAX_PAGE_SIZE", 3)
+    body = client.get("/employees/", params={"limit": 500}).json()
+    assert len(body["employees"]) == 3
+    assert body["total"] == EMPLOYEES
+    assert [len(page) for page in _all_pages(client, "/attendance/", "records", limit=500)] == [3, 3, 1]
+
+
+def test_limit_below_one_is_rejected(client):
+    assert client.get("/employees/", params={"limit": 0}).status_code == 422
@@ -0,0 +1,60 @@
+"""
+Connection pool sizing and error-driven invalidation (run_db retry on read-only sessions).
+"""
+import asyncio
+
+import pytest
+from sqlalchemy.exc import DBAPIError
+
+from app.database import SessionLocal, pool_budget, run_db
+
+
+@pytest.mark.parametrize(
+    "pool_size, max_overflow, max_connections, workers, engines, expected",
+    [
+        (10, 20, 0, 8, 1, (10, 20)),      # No cap: configured sizes
+        (10, 20, 150, 8, 1, (10, 8)),     # 150 // 8 = 18 per worker
+        (10, 20, 150, 8, 2, (9, 0)),      # Async mode: sync + async pools share the worker's 18
+        (10, 20, 240, 4, 1, (10, 20)),    # Cap larger than the configured pools
+        (10, 20, 4, 8, 1, (1, 0)),        # Never below one connection
+    ],
+)
+def test_pool_budget(pool_size, max_overflow, max_connections, workers, engines, expected):
+    size, overflow = pool_budget(pool_size, max_overflow, max_connections, workers, engines)
+    assert (size, overflow) == expected
+    if max_connections >= workers * engines:
+        assert (size + overflow) * workers * engines <= max_connections
+
+
+def _flaky(failures: int):
+    """A crud-style function whose first `failures` calls hit a dead connection."""
+    calls = []
+
+    def fn(db):
+        calls.append(db)
+        if len(calls) <= failures:
+            raise DBAPIError("SELECT 1", {}, Exception("server has gone away"), connection_invalidated=True)
+        return "ok"
+
+    return fn, calls
+
+
+def test_read_only_work_is_retried_once_on_a_dead_connection():
+    fn, calls = _flaky(failures=1)
+    with SessionLocal(info={"read_only": True}) as db:
+        assert asyncio.run(run_db(db, fn)) == "ok"
+    assert len(calls) == 2
+
+
+def test_read_only_work_gives_up_after_one_retry():
+    fn, calls = _flaky(failures=2)
+    with SessionLocal(info={"read_only": True}) as db, pytest.raises(DBAPIError):
+        asyncio.run(run_db(db, fn))
+    assert len(calls) == 2
+
+
+def test_writes_are_not_retried():
+    fn, calls = _flaky(failures=1)
+    with SessionLocal() as db, pytest.raises(DBAPIError):
+        asyncio.run(run_db(db, fn))
+    assert len(calls) == 1
@@ -0,0 +1,265 @@
+"""
+N+1 regression guard: every route issues a fixed number of SQL statements,
+independent of how many employees and attendance records exist.
+
+Each case runs against datasets seeded at several scales, once with sync
+sessions and once with DB_ASYNC AsyncSessions. It fails when a route exceeds
+its statement budget or when its count differs between scales.
+"""
+import datetime as dt
+import io
+import json
+import re
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+import pytest
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, event, insert
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.pool import NullPool
+
+from app import database, main, models, rollups
+from app.core.config import settings
+from app.database import Base, SessionLocal
+from app.main import app
+from app.routers import attendance
+from app.utils.cache import employee_cache, response_cache, stats_cache
+from app.utils.replicas import ReplicaPool
+
+SCALES = (5, 50, 250)  # employees; each gets DAYS days of attendance
+DAYS = 10
+TODAY = dt.date.today()
+PAST = TODAY - dt.timedelta(days=1)
+
+
+@dataclass
+class Case:
+    method: str
+    route: str                          # Route template as registered, e.g. /attendance/{employee_id}
+    max_statements: int
+    url: Optional[Callable[[int], str]] = None   # Defaults to the route itself
+    json: Optional[Callable[[int], object]] = None
+    files: Optional[Callable[[int], dict]] = None
+    expected_status: int = 200
+    label: str = ""                     # Distinguishes several cases on one route
+
+
+def _new_employees(scale: int) -> list[dict]:
+    return [
+        {"employee_id": f"NEW{i:05d}", "full_name": f"New {i}", "email": f"new{i}@example.com", "department": "Ops"}
+        for i in range(scale)
+    ]
+
+
+def _import_file(scale: int) -> dict:
+    body = "\n".join(json.dumps(row) for row in _new_employees(scale))
+    return {"file": ("employees.ndjson", io.BytesIO(body.encode()), "application/x-ndjson")}
+
+
+def _bulk_records(scale: int, day: dt.date = TODAY) -> dict:
+    return {
+        "records": [
+            {"employee_id": f"EMP{pk:05d}", "date": str(day), "status": "Present"} for pk in range(1, scale + 1)
+        ]
+    }
+
+
+STATS_RANGE = f"date_from={TODAY - dt.timedelta(days=DAYS)}&date_to={PAST}"
+
+CASES = [
+    # main.py
+    Case("GET", "/", 0),
+    Case("GET", "/health", 0),
+    Case("GET", "/cache/stats", 0),
+    Case("GET", "/metrics", 0),
+    Case("GET", "/dashboard", 2),
+    Case("GET", "/dashboard/stream", 2),    # Snapshot only: short_streams ends the stream right after it
+    # routers/employees.py
+    Case("GET", "/employees/", 2),
+    Case("GET", "/employees/", 1, url=lambda n: "/employees/?limit=2&cursor=" + _second_page_cursor(), label="next page"),
+    Case(
+        "POST", "/employees/", 5, expected_status=201,
+        json=lambda n: _new_employees(1)[0],
+    ),
+    Case("POST", "/employees/import", 3, files=_import_file, expected_status=201),
+    Case("DELETE", "/employees/{employee_id}", 6, url=lambda n: "/employees/EMP00001"),
+    # routers/attendance.py
+    Case("GET", "/attendance/", 2),
+    Case("GET", "/attendance/", 2, url=lambda n: f"/attendance/?date={PAST}", label="by date"),
+    Case(
+        "POST", "/attendance/", 4, expected_status=201,
+        json=lambda n: {"employee_id": "EMP00001", "date": str(TODAY), "status": "Present"},
+    ),
+    Case(
+        "POST", "/attendance/", 3, expected_status=409, label="duplicate",
+        json=lambda n: {"employee_id": "EMP00001", "date": str(PAST), "status": "Present"},
+    ),
+    Case(
+        "POST", "/attendance/", 3, url=lambda n: "/attendance/?mode=skip", label="skip existing",
+        json=lambda n: {"employee_id": "EMP00001", "date": str(PAST), "status": "Absent"},
+    ),
+    Case(
+        "POST", "/attendance/", 8, url=lambda n: "/attendance/?mode=upsert", label="upsert existing",
+        json=lambda n: {"employee_id": "EMP00001", "date": str(PAST), "status": "Absent"},
+    ),
+    Case("POST", "/attendance/bulk", 5, json=_bulk_records, expected_status=201),
+    Case(
+        "POST", "/attendance/bulk", 2, expected_status=200, label="all duplicates",
+        json=lambda n: _bulk_records(n, PAST),
+    ),
+    Case("GET", "/attendance/export", 1, url=lambda n: "/attendance/export?format=csv"),
+    Case("GET", "/attendance/stats/employees", 1, url=lambda n: f"/attendance/stats/employees?{STATS_RANGE}"),
+    Case("GET", "/attendance/stats/departments", 1, url=lambda n: f"/attendance/stats/departments?{STATS_RANGE}"),
+    Case("GET", "/attendance/stats/daily", 1, url=lambda n: f"/attendance/stats/daily?{STATS_RANGE}"),
+    Case("GET", "/attendance/{employee_id}", 3, url=lambda n: "/attendance/EMP00001"),
+]
+
+
+def _second_page_cursor() -> str:
+    return TestClient(app).get("/employees/?limit=2").json()["next_cursor"]
+
+
+def _seed(engine, scale: int) -> None:
+    """Recreate the schema with `scale` employees in 5 departments and DAYS past days of attendance."""
+    Base.metadata.drop_all(bind=engine)
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(
+            insert(models.Employee),
+            [
+                {"employee_id": f"EMP{pk:05d}", "full_name": f"Employee {pk}",
+                 "email": f"emp{pk}@example.com", "department": f"Dept {pk % 5}"}
+                for pk in range(1, scale + 1)
+            ],
+        )
+        conn.execute(
+            insert(models.Attendance),
+            [
+                {"employee_id": pk, "date": TODAY - dt.timedelta(days=offset),
+                 "status": "Present" if (pk + offset) % 4 else "Absent"}
+                for pk in range(1, scale + 1)
+                for offset in range(1, DAYS + 1)
+            ],
+        )
+    db = SessionLocal()
+    try:
+        rollups.rebuild(db)
+    finally:
+        db.close()
+
+
+@pytest.fixture(autouse=True)
+def uncached(monkeypatch):
+    """Disable the in-process caches so every request reaches the database."""
+    monkeypatch.setattr(response_cache, "enabled", False)
+    monkeypatch.setattr(stats_cache, "enabled", False)
+    monkeypatch.setattr(employee_cache, "enabled", False)
+
+
+@pytest.fixture(autouse=True)
+def short_streams(monkeypatch):
+    """End /dashboard/stream after its first snapshot so the request completes."""
+    monkeypatch.setattr(settings, "DASHBOARD_STREAM_MAX_SECONDS", 0)
+
+
+@pytest.fixture(params=[False, True], ids=["sync", "async"])
+def engines(request, tmp_path, monkeypatch):
+    """
+    Serve the app with DB_ASYNC off or on, whichever DB_ASYNC the suite was
+    started with. Both modes use one SQLite file, so the async driver sees what
+    the sync engine seeded; routes that open sync sessions in async mode (the
+    export) are counted too. Yields the engines to count statements on.
+    """
+    use_async = request.param
+    url = f"sqlite:///{tmp_path / 'counts.db'}"
+    sync_engine = create_engine(url)
+    async_engine = create_async_engine(settings.to_async_url(url), poolclass=NullPool)  # One loop per request
+    async_sessions = async_sessionmaker(bind=async_engine, autoflush=False)
+
+    monkeypatch.setitem(SessionLocal.kw, "bind", sync_engine)
+    for module in (database, main, attendance):
+        monkeypatch.setattr(module, "AsyncSessionLocal", async_sessions)
+    monkeypatch.setattr(database, "async_read_replicas", ReplicaPool([], retry_seconds=0))
+    monkeypatch.setattr(settings, "DB_ASYNC", use_async)
+    get_db = database.get_async_db if use_async else database.get_sync_db
+    get_read_db = database.get_async_read_db if use_async else database.get_sync_read_db
+    monkeypatch.setattr(app, "dependency_overrides", {
+        database.get_sync_db: get_db,
+        database.get_async_db: get_db,
+        database.get_sync_read_db: get_read_db,
+        database.get_async_read_db: get_read_db,
+    })
+    yield sync_engine, async_engine.sync_engine
+    sync_engine.dispose()
+
+
+def _statements(case: Case, scale: int, engines: tuple) -> list[str]:
+    _seed(engines[0], scale)
+    client = TestClient(app)
+    # Build URL and body before counting; some need requests of their own
+    url = case.url(scale) if case.url else case.route
+    kwargs = {}
+    if case.json:
+        kwargs["json"] = case.json(scale)
+    if case.files:
+        kwargs["files"] = case.files(scale)
+
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    for engine in engines:
+        event.listen(engine, "before_cursor_execute", capture)
+    try:
+        response = client.request(case.method, url, **kwargs)
+    finally:
+        for engine in engines:
+            event.remove(engine, "before_cursor_execute", capture)
+
+    assert response.status_code == case.expected_status, response.text
+    return statements
+
+
+def _count_statements(case: Case, scale: int, engines: tuple) -> int:
+    return len(_statements(case, scale, engines))
+
+
+def _case_id(case: Case) -> str:
+    return f"{case.method} {case.route}" + (f" [{case.label}]" if case.label else "")
+
+
+@pytest.mark.parametrize("case", CASES, ids=_case_id)
+def test_statement_count_is_bounded_and_scale_independent(case, engines):
+    counts = {scale: _count_statements(case, scale, engines) for scale in SCALES}
+    assert max(counts.values()) <= case.max_statements, f"{_case_id(case)} exceeded its budget: {counts}"
+    assert len(set(counts.values())) == 1, f"{_case_id(case)} statement count grows with data: {counts}"
+
+
+ATTENDANCE_TABLE = re.compile(r"\battendance\b")  # Not attendance_daily_summary
+
+TOTAL_CASES = [
+    Case("GET", "/attendance/", 2),
+    Case("GET", "/attendance/", 2, url=lambda n: f"/attendance/?date={PAST}", label="by date"),
+    Case("GET", "/attendance/{employee_id}", 3, url=lambda n: "/attendance/EMP00001"),
+]
+
+
+@pytest.mark.parametrize("case", TOTAL_CASES, ids=_case_id)
+def test_first_page_total_is_read_from_rollups(case, engines):
+    """Only the LIMITed page query may read attendance; a COUNT(*) for `total` would cost O(records)."""
+    statements = _statements(case, SCALES[-1], engines)
+    on_attendance = [s for s in statements if ATTENDANCE_TABLE.search(s)]
+    assert len(on_attendance) == 1 and "LIMIT" in on_attendance[0], on_attendance
+
+
+def test_every_route_is_covered():
+    covered = {(case.method, case.route) for case in CASES}
+    documentation = {app.openapi_url, app.docs_url, app.redoc_url, app.swagger_ui_oauth2_redirect_url}
+    for route in app.routes:
+        if not isinstance(route, APIRoute) or route.path in documentation:
+            continue
+        for method in route.methods - {"HEAD"}:
+            assert (method, route.path) in covered, f"No statement budget for {method} {route.path}"
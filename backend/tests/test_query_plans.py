@@ -0,0 +1,105 @@
+"""
+Query-plan regression tests: every SELECT issued by a crud read path must be
+answered through an index on SQLite, never a bare full-table scan.
+"""
+import datetime as dt
+import re
+
+import pytest
+from sqlalchemy import event
+
+from app import crud, rollups, schemas
+from app.database import engine
+
+DAY = dt.date(2026, 1, 5)
+FULL_SCAN = re.compile(r"^SCAN \w+$")  # e.g. "SCAN attendance" (vs "SCAN attendance USING INDEX ...")
+
+
+@pytest.fixture
+def seeded(db):
+    for i in range(20):
+        crud.create_employee(
+            db,
+            schemas.EmployeeCreate(
+                employee_id=f"EMP{i:03d}", full_name=f"Employee {i}", email=f"e{i}@example.com", department="IT"
+            ),
+        )
+    crud.bulk_mark_attendance(
+        db,
+        [
+            schemas.AttendanceCreate(employee_id=f"EMP{i:03d}", date=dt.date(2026, 1, d), status="Present")
+            for i in range(20)
+            for d in range(1, 10)
+        ],
+    )
+    return db
+
+
+def _query_plans(db, call) -> list[tuple[str, list[str]]]:
+    """Run `call(db)` and return (statement, plan details) for every SELECT it issued."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    try:
+        result = call(db)
+        if hasattr(result, "__next__"):
+            list(result)
+    finally:
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).fetchall()
+            plans.append((statement, [row[-1] for row in rows]))
+    return plans
+
+
+READ_PATHS = {
+    "employee_by_employee_id": lambda db: crud.get_employee_by_employee_id(db, "EMP001"),
+    "employee_by_email": lambda db: crud.get_employee_by_email(db, "e1@example.com"),
+    "employees_first_page": lambda db: crud.get_all_employees(db, limit=5),
+    "employees_next_page": lambda db: crud.get_all_employees(db, limit=5, after=(dt.datetime(2030, 1, 1), 10)),
+    "count_employees": lambda db: crud.count_employees(db),
+    "attendance_first_page": lambda db: crud.get_all_attendance(db, limit=5),
+    "attendance_next_page": lambda db: crud.get_all_attendance(db, limit=5, after=(DAY, 50)),
+    "attendance_by_date": lambda db: crud.get_attendance_by_date(db, DAY, limit=5, after=(DAY, 50)),
+    "attendance_by_employee": lambda db: crud.get_attendance_by_employee(db, 3, limit=5, after=(DAY, 50)),
+    "count_attendance_by_date": lambda db: crud.count_attendance(db, filter_date=DAY),
+    "count_attendance_by_employee": lambda db: crud.count_attendance(db, employee_pk=3),
+    "count_attendance_by_employee_and_date": lambda db: crud.count_attendance(db, filter_date=DAY, employee_pk=3),
+    "stream_attendance_range": lambda db: crud.stream_attendance(db, DAY, DAY + dt.timedelta(days=2), "IT"),
+    "dashboard": lambda db: crud.get_dashboard_data(db),
+    "employee_stats": lambda db: crud.get_employee_attendance_stats(db, DAY, DAY + dt.timedelta(days=30)),
+    "department_stats": lambda db: crud.get_department_attendance_stats(db, DAY, DAY + dt.timedelta(days=30)),
+    "daily_stats": lambda db: crud.get_daily_attendance_stats(db, DAY, DAY + dt.timedelta(days=30), "IT"),
+    "bulk_mark_lookups": lambda db: crud.bulk_mark_attendance(
+        db, [schemas.AttendanceCreate(employee_id="EMP001", date=DAY, status="Present")]
+    ),
+    "bulk_mark_lookups_many_pairs": lambda db: crud.bulk_mark_attendance(
+        db,
+        [
+            schemas.AttendanceCreate(employee_id=f"EMP{i:03d}", date=DAY + dt.timedelta(days=d), status="Present")
+            for i in range(0, 20, 3)
+            for d in range(0, 60, 7)
+        ],
+    ),
+    "mark_attendance_upsert_existing": lambda db: crud.mark_attendance(
+        db, schemas.AttendanceCreate(employee_id="EMP001", date=DAY, status="Absent"), mode="upsert"
+    ),
+    "rollup_remove_employee": lambda db: rollups.remove_employee(db, crud.get_employee_by_id(db, 2)),
+    "rollup_reconcile": lambda db: rollups.reconcile(db, chunk_size=5),
+}
+
+
+@pytest.mark.parametrize("name", READ_PATHS)
+def test_crud_queries_use_indexes(seeded, name):
+    plans = _query_plans(seeded, READ_PATHS[name])
+    assert plans, f"{name} issued no SELECT statements"
+    for statement, details in plans:
+        full_scans = [d for d in details if FULL_SCAN.match(d)]
+        assert not full_scans, f"{name} full-scans a table:\n{statement}\n{details}"
@@ -0,0 +1,149 @@
+"""
+Read-replica routing with SQLite files standing in for replicas.
+
+The primary is the shared in-memory test database. Each replica file holds a
+different employee, so the response of GET /employees/ shows which database
+served it.
+"""
+import asyncio
+import time
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.exc import DBAPIError
+
+from app import database, models
+from app.database import Base, engine_options
+from app.main import app
+from app.utils import replicas
+from app.utils.cache import response_cache
+from app.utils.replicas import PRIMARY_COOKIE, PRIMARY_HEADER, ReadYourWritesMiddleware, ReplicaPool
+
+
+def _database_file(path, employee_id: str):
+    url = f"sqlite:///{path}"
+    file_engine = create_engine(url, **engine_options(url))
+    Base.metadata.create_all(bind=file_engine)
+    with file_engine.begin() as conn:
+        conn.execute(
+            models.Employee.__table__.insert(),
+            {"employee_id": employee_id, "full_name": employee_id, "email": f"{employee_id}@example.com",
+             "department": "IT"},
+        )
+    return file_engine
+
+
+@pytest.fixture
+def replica_engines(db, tmp_path, monkeypatch):
+    """Primary holds PRIMARY; replica files hold REPLICA_A and REPLICA_B."""
+    db.add(models.Employee(employee_id="PRIMARY", full_name="Primary", email="p@example.com", department="IT"))
+    db.commit()
+    engines = [_database_file(tmp_path / "replica_a.db", "REPLICA_A"), _database_file(tmp_path / "replica_b.db", "REPLICA_B")]
+    monkeypatch.setattr(database, "read_replicas", ReplicaPool(engines, retry_seconds=60))
+    monkeypatch.setattr(response_cache, "enabled", False)
+    monkeypatch.setattr(replicas, "_last_write", 0.0)
+    yield engines
+    for file_engine in engines:
+        file_engine.dispose()
+
+
+def _client() -> TestClient:
+    return TestClient(ReadYourWritesMiddleware(app, window_seconds=5))
+
+
+def _served_by(client: TestClient) -> set[str]:
+    return {e["employee_id"] for e in client.get("/employees/").json()["employees"]}
+
+
+def test_reads_rotate_over_replicas(replica_engines):
+    client = _client()
+    served = [_served_by(client) for _ in range(4)]
+    assert sorted(map(sorted, served)) == [["REPLICA_A"], ["REPLICA_A"], ["REPLICA_B"], ["REPLICA_B"]]
+    assert served[0] != served[1]
+
+
+def test_writer_reads_its_own_write_from_the_primary(replica_engines):
+    writer, other = _client(), _client()
+    created = writer.post(
+        "/employees/",
+        json={"employee_id": "NEW", "full_name": "New", "email": "new@example.com", "department": "IT"},
+    )
+    assert created.status_code == 201
+    assert PRIMARY_COOKIE in created.cookies
+    assert float(created.headers[PRIMARY_HEADER]) > time.time()
+
+    assert _served_by(writer) == {"PRIMARY", "NEW"}
+    assert _served_by(other) <= {"REPLICA_A", "REPLICA_B"}
+
+
+def test_failed_writes_do_not_pin_reads_to_the_primary(replica_engines):
+    client = _client()
+    duplicate = client.post(
+        "/employees/",
+        json={"employee_id": "PRIMARY", "full_name": "Dup", "email": "dup@example.com", "department": "IT"},
+    )
+    assert duplicate.status_code == 409
+    assert PRIMARY_COOKIE not in duplicate.cookies
+    assert PRIMARY_HEADER not in duplicate.headers
+
+
+def test_cross_origin_client_reads_its_write_via_the_header(replica_engines):
+    writer = _client()
+    created = writer.post(
+        "/employees/",
+        json={"employee_id": "NEW", "full_name": "New", "email": "new@example.com", "department": "IT"},
+    )
+    until = created.headers[PRIMARY_HEADER]
+
+    spa = _client()  # Holds no cookie, like a cross-site XHR
+    spa.headers[PRIMARY_HEADER] = until
+    assert _served_by(spa) == {"PRIMARY", "NEW"}
+
+    spa.headers[PRIMARY_HEADER] = f"{time.time() + 3600:.3f}"  # Beyond the window: ignored
+    assert _served_by(spa) <= {"REPLICA_A", "REPLICA_B"}
+    spa.headers[PRIMARY_HEADER] = "soon"
+    assert _served_by(spa) <= {"REPLICA_A", "REPLICA_B"}
+
+
+def test_dead_replica_fails_over(replica_engines, tmp_path, monkeypatch):
+    dead_url = f"sqlite:///{tmp_path / 'missing' / 'replica.db'}"  # Directory does not exist: connect fails
+    dead = create_engine(dead_url, **engine_options(dead_url))
+    pool = ReplicaPool([dead, replica_engines[0]], retry_seconds=60)
+    monkeypatch.setattr(database, "read_replicas", pool)
+
+    client = _client()
+    assert all(_served_by(client) == {"REPLICA_A"} for _ in range(3))
+    assert pool.healthy_count() == 1
+
+    monkeypatch.setattr(database, "read_replicas", ReplicaPool([dead], retry_seconds=60))
+    assert _served_by(client) == {"PRIMARY"}
+
+
+def test_replica_reads_right_after_a_write_are_not_tagged(replica_engines):
+    client = _client()
+    assert "etag" in client.get("/employees/").headers
+
+    replicas.note_write()
+    assert "etag" not in client.get("/employees/").headers
+
+
+def test_read_retry_after_a_disconnect_moves_to_another_replica(replica_engines):
+    binds = []
+
+    def fn(db):
+        binds.append(db.bind)
+        if len(binds) == 1:
+            raise DBAPIError("SELECT 1", {}, Exception("server has gone away"), connection_invalidated=True)
+        return "ok"
+
+    first, second = replica_engines
+    with database.SessionLocal(bind=first, info={"read_only": True}) as db:
+        assert asyncio.run(database.run_db(db, fn)) == "ok"
+    assert binds == [first, second]
+    assert database.read_replicas.candidates() == [second]
+
+    binds.clear()
+    with database.SessionLocal(bind=second, info={"read_only": True}) as db:
+        assert asyncio.run(database.run_db(db, fn)) == "ok"
+    assert binds == [second, database.engine]  # No healthy replica left: the primary
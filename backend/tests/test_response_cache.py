@@ -0,0 +1,127 @@
+"""
+ResponseCache: LRU eviction, TTL expiry, the generation guard, and the
+namespaces each write path invalidates.
+"""
+import datetime as dt
+import time
+from types import SimpleNamespace
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.utils import cache
+from app.utils.cache import ResponseCache, response_cache
+
+EMPLOYEES_PAGE = {"limit": 100, "cursor": None}  # GET /employees/ with default paging
+
+
+def _set(store: ResponseCache, namespace: str, key: int, value: object = None) -> None:
+    store.set(namespace, {"key": key}, value if value is not None else key, store.generation(namespace))
+
+
+def test_least_recently_used_entry_is_evicted():
+    store = ResponseCache(max_entries=2, ttl_seconds=60)
+    _set(store, "ns", 1)
+    _set(store, "ns", 2)
+    assert store.get("ns", {"key": 1}) == 1  # 2 is now the least recently used
+    _set(store, "ns", 3)
+    assert store.get("ns", {"key": 2}) is None
+    assert (store.get("ns", {"key": 1}), store.get("ns", {"key": 3})) == (1, 3)
+    assert store.evictions == 1
+
+
+def test_entries_expire_after_the_ttl(monkeypatch):
+    store = ResponseCache(max_entries=10, ttl_seconds=30)
+    _set(store, "ns", 1)
+    now = time.monotonic()
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now + 29))
+    assert store.get("ns", {"key": 1}) == 1
+    monkeypatch.setattr(cache, "time", SimpleNamespace(monotonic=lambda: now + 31))
+    assert store.get("ns", {"key": 1}) is None
+    assert store.stats()["entries"] == 0  # Expired entries are dropped on lookup
+
+
+def test_set_started_before_an_invalidation_is_rejected():
+    store = ResponseCache(max_entries=10, ttl_seconds=60)
+    generation = store.generation("ns")  # A request starts computing...
+    store.invalidate("ns")               # ...a write commits meanwhile...
+    store.set("ns", {"key": 1}, "stale", generation)
+    assert store.get("ns", {"key": 1}) is None  # ...so its result is never stored
+    store.set("ns", {"key": 1}, "fresh", store.generation("ns"))
+    assert store.get("ns", {"key": 1}) == "fresh"
+
+
+def test_discard_also_guards_against_in_flight_sets():
+    store = ResponseCache(max_entries=10, ttl_seconds=60)
+    generation = store.generation("ns")
+    store.discard("ns", {"key": 1})
+    store.set("ns", {"key": 1}, "stale", generation)
+    assert store.get("ns", {"key": 1}) is None
+
+
+def test_invalidate_only_drops_the_given_namespaces():
+    store = ResponseCache(max_entries=10, ttl_seconds=60)
+    _set(store, "a", 1)
+    _set(store, "b", 1)
+    store.invalidate("a")
+    assert (store.get("a", {"key": 1}), store.get("b", {"key": 1})) == (None, 1)
+    assert store.invalidations == 1
+
+
+def test_disabled_cache_stores_nothing():
+    store = ResponseCache(max_entries=10, ttl_seconds=60, enabled=False)
+    _set(store, "ns", 1)
+    assert store.get("ns", {"key": 1}) is None
+    assert store.stats()["entries"] == 0
+
+
+@pytest.fixture
+def client(db):
+    response_cache.invalidate("employees", "dashboard")
+    client = TestClient(app)
+    client.post("/employees/", json={"employee_id": "EMP1", "full_name": "Employee 1",
+                                      "email": "e1@example.com", "department": "IT"})
+    client.get("/employees/")
+    client.get("/dashboard")
+    return client
+
+
+def _cached(namespace: str) -> bool:
+    params = EMPLOYEES_PAGE if namespace == "employees" else {"date": dt.date.today()}
+    return response_cache.get(namespace, params) is not None
+
+
+def test_absent_mark_keeps_employee_lists_cached(client):
+    assert _cached("employees") and _cached("dashboard")
+    client.post("/attendance/", json={"employee_id": "EMP1", "date": str(dt.date.today()), "status": "Absent"})
+    assert _cached("employees")  # Lists only show Present counts
+    assert not _cached("dashboard")
+
+
+def test_present_mark_drops_employee_lists(client):
+    client.post("/attendance/", json={"employee_id": "EMP1", "date": str(dt.date.today()), "status": "Present"})
+    assert not _cached("employees")
+    assert not _cached("dashboard")
+
+
+def test_cache_stats_reports_the_counters(client):
+    before = client.get("/cache/stats").json()
+    client.get("/employees/")                       # Hit
+    client.get("/employees/", params={"limit": 7})  # Miss, then stored
+    after = client.get("/cache/stats").json()
+    assert after["hits"] - before["hits"] == 1
+    assert after["misses"] - before["misses"] == 1
+    assert after["entries"] == before["entries"] + 1
+    assert after["max_entries"] == response_cache.max_entries
+    assert after["hit_ratio"] == round(after["hits"] / (after["hits"] + after["misses"]), 4)
+
+
+def test_cache_stats_counts_evictions(client, monkeypatch):
+    monkeypatch.setattr(response_cache, "max_entries", 2)
+    before = client.get("/cache/stats").json()
+    for limit in (3, 4, 5):
+        client.get("/employees/", params={"limit": limit})
+    after = client.get("/cache/stats").json()
+    assert after["entries"] == 2
+    assert after["evictions"] - before["evictions"] == before["entries"] + 3 - 2
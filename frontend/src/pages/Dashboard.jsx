@@ -1,6 +1,6 @@
 import { useEffect, useState } from 'react'
 import { Link } from 'react-router-dom'
-import { dashboardApi } from '../services/api'
+import { dashboardApi, applyDashboardEvent } from '../services/api'
 import { getTodayDate, formatDate } from '../utils/helpers'
 import Spinner from '../components/ui/Spinner'
 import Alert from '../components/ui/Alert'
@@ -34,11 +34,28 @@ export default function Dashboard() {
     const [error, setError] = useState(null)
     const today = formatDate(getTodayDate())
 
+    // Live updates: a snapshot on connect, then small deltas as attendance and employees change
     useEffect(() => {
-        dashboardApi.get()
-            .then((res) => setData(res.data))
-            .catch((err) => setError(err.message))
-            .finally(() => setLoading(false))
+        if (typeof EventSource === 'undefined') {
+            dashboardApi.get()
+                .then((res) => setData(res.data))
+                .catch((err) => setError(err.message))
+                .finally(() => setLoading(false))
+            return undefined
+        }
+        return dashboardApi.stream(
+            (type, payload, id) => {
+                setData((current) => applyDashboardEvent(current, type, payload, id))
+                if (type === 'snapshot') {
+                    setLoading(false)
+                    setError(null)
+                }
+            },
+            () => {
+                setError('Live updates stopped. Reload the page to reconnect.')
+                setLoading(false)
+            },
+        )
     }, [])
 
     const columns = [
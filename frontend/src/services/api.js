@@ -10,11 +10,30 @@ const api = axios.create({
         'Content-Type': 'application/json',
     },
     timeout: 60000,
+    // Send the backend's read-your-writes cookie, so reads right after a write hit the primary
+    withCredentials: true,
+})
+
+// ── Read-your-writes: echo the backend's X-Primary-Until ────────
+// The cookie is SameSite=Lax, so a frontend on another site never sends it;
+// repeat the deadline from the last write as a header until it passes.
+const PRIMARY_HEADER = 'x-primary-until'
+let primaryUntil = 0
+
+api.interceptors.request.use((config) => {
+    if (primaryUntil > Date.now() / 1000) {
+        config.headers[PRIMARY_HEADER] = primaryUntil.toFixed(3)
+    }
+    return config
 })
 
 // ── Response interceptor: normalize errors ──────────────────────
 api.interceptors.response.use(
-    (response) => response,
+    (response) => {
+        const until = parseFloat(response.headers[PRIMARY_HEADER])
+        if (until > primaryUntil) primaryUntil = until
+        return response
+    },
     (error) => {
         const message =
             error.response?.data?.detail ||
@@ -28,11 +47,32 @@ api.interceptors.response.use(
 export default api
 
 
+// Requested page size; the backend caps it at its MAX_PAGE_SIZE and next_cursor covers the rest
+const PAGE_SIZE = 500
+
+/**
+ * Follow `next_cursor` across every page of a paginated list endpoint and merge
+ * the pages into a single axios-shaped response, so callers can keep reading
+ * `response.data[listKey]` and `response.data.total` as before.
+ */
+async function getAllPages(url, listKey, params = {}) {
+    const first = await api.get(url, { params: { ...params, limit: PAGE_SIZE } })
+    const items = [...first.data[listKey]]
+    let cursor = first.data.next_cursor
+    while (cursor) {
+        const { data } = await api.get(url, { params: { ...params, limit: PAGE_SIZE, cursor } })
+        items.push(...data[listKey])
+        cursor = data.next_cursor
+    }
+    return { ...first, data: { ...first.data, [listKey]: items, next_cursor: null } }
+}
+
+
 // ─────────────────────── Employee API ───────────────────────────
 
 export const employeeApi = {
-    /** Get all employees */
-    getAll: () => api.get('/employees/'),
+    /** Get all employees (follows pagination cursors) */
+    getAll: () => getAllPages('/employees/', 'employees'),
 
     /** Create a new employee */
     create: (data) => api.post('/employees/', data),
@@ -45,16 +85,16 @@ export const employeeApi = {
 // ─────────────────────── Attendance API ─────────────────────────
 
 export const attendanceApi = {
-    /** Get all attendance records, optionally filtered by date */
+    /** Get all attendance records, optionally filtered by date (follows pagination cursors) */
     getAll: (date) => {
         const params = date ? { date } : {}
-        return api.get('/attendance/', { params })
+        return getAllPages('/attendance/', 'records', params)
     },
 
-    /** Get attendance for a specific employee */
+    /** Get attendance for a specific employee (follows pagination cursors) */
     getByEmployee: (employeeId, date) => {
         const params = date ? { date } : {}
-        return api.get(`/attendance/${employeeId}`, { params })
+        return getAllPages(`/attendance/${employeeId}`, 'records', params)
     },
 
     /** Mark attendance */
@@ -67,4 +107,59 @@ export const attendanceApi = {
 export const dashboardApi = {
     /** Get dashboard statistics */
     get: () => api.get('/dashboard'),
+
+    /**
+     * Subscribe to /dashboard/stream (server-sent events).
+     * `onEvent(type, data, id)` receives the `snapshot` first, then deltas; `id` is the event's SSE id.
+     * Returns a function that closes the stream. EventSource reconnects on its own
+     * (the server ends each stream after a few minutes); `onError` only fires once
+     * the browser has given up.
+     */
+    stream: (onEvent, onError) => {
+        const source = new EventSource(`${api.defaults.baseURL}/dashboard/stream`, { withCredentials: true })
+        for (const type of ['snapshot', 'attendance', 'employee_created', 'employee_deleted']) {
+            source.addEventListener(type, (e) => onEvent(type, JSON.parse(e.data), Number(e.lastEventId)))
+        }
+        source.onerror = () => {
+            if (source.readyState === EventSource.CLOSED && onError) onError()
+        }
+        return () => source.close()
+    },
+}
+
+
+/**
+ * Apply one /dashboard/stream event to the current dashboard state.
+ * Deltas are increments; a `snapshot` replaces the state outright and records
+ * its id, and deltas whose id is not above it are already counted in it.
+ */
+export function applyDashboardEvent(dashboard, type, data, id) {
+    if (type === 'snapshot') return { ...data, snapshot_id: id }
+    if (!dashboard || id <= dashboard.snapshot_id) return dashboard
+
+    let summary = dashboard.employees_summary
+    let totalEmployees = dashboard.total_employees
+    if (type === 'employee_created') {
+        summary = [data, ...summary]
+        totalEmployees += 1
+    } else if (type === 'employee_deleted') {
+        summary = summary.filter((row) => row.employee_id !== data.employee_id)
+        totalEmployees -= 1
+    }
+    if (data.employees) {
+        summary = summary.map((row) => {
+            const delta = data.employees[row.employee_id]
+            return delta
+                ? { ...row, total_present: row.total_present + delta.present, total_absent: row.total_absent + delta.absent }
+                : row
+        })
+    }
+    const today = data.today || { present: 0, absent: 0 }
+    return {
+        ...dashboard,
+        total_employees: totalEmployees,
+        total_present_today: dashboard.total_present_today + today.present,
+        total_absent_today: dashboard.total_absent_today + today.absent,
+        employees_summary: summary,
+    }
 }